@@ -1,19 +1,48 @@
 #!/usr/bin/env python3
 """
 Generate simulated student data for HICAS departments.
-Creates hicas_students_simulated.csv with 40 students per year:
+By default creates hicas_students_simulated.csv with 40 students per year:
 - UG: 3 years (1-3) => 120 students per UG department
 - PG: 2 years (1-2) => 80 students per PG department
 Names are sampled from a curated Indian names list.
+
+For load testing, --students N spreads N students (10k to 1M and beyond)
+evenly over the same department-years, and --activity adds faculty,
+internship applications, weekly logs and progress proofs synthesised the
+way load_csv_to_db does. --format copy writes PostgreSQL COPY files for
+every table plus a load.sql to run with psql.
+
+All sampling is vectorized with NumPy from one seeded Generator, so the
+same arguments always produce the same files. Tables are formatted and
+written in slices to keep memory flat at large sizes.
 """
 
+import argparse
+import base64
 import csv
-import random
-from pathlib import Path
+import hashlib
+import time
 from datetime import datetime
+from functools import reduce
+from pathlib import Path
 
-# Fixed seed for reproducibility
-random.seed(42)
+import numpy as np
+
+from internship.catalog import (APPLICATION_MODES, APPLICATION_STATUSES, COMPANIES_WITH_ROLES, DEPT_MAPPING,
+                                FEEDBACK_MESSAGES, PROGRAM_START, PROOF_TYPES)
+
+DEFAULT_SEED = 42
+STUDENTS_PER_YEAR = 40
+FACULTY_PER_DEPARTMENT = 8
+# Share of final-year students given an internship application (as in load_csv_to_db)
+APPLICATION_RATE = 0.5
+COLLEGE_CODE = "8230"
+# Rows formatted and written per slice
+WRITE_CHUNK_ROWS = 100_000
+# NULL marker in both the COPY text and CSV outputs (CSV would otherwise confuse NULL with '')
+NULL = '\\N'
+# Django 4.2's default, so the hashes are accepted as-is
+PBKDF2_ITERATIONS = 600000
 
 # Department source (mirrors scrape_hicas_faculty.py)
 UG_DEPARTMENTS = [
@@ -86,10 +115,13 @@ LAST_NAMES = [
     'Mishra','Chaudhary','Gowda','Kulkarni','Pillai','Mukherjee','Banerjee','Bhatt','Pandey','Shukla'
 ]
 
-def make_name():
-    first = random.choice(MALE_NAMES + FEMALE_NAMES)
-    last = random.choice(LAST_NAMES)
-    return f"{first} {last}"
+STUDENT_CSV_COLUMNS = ['Department', 'ProgramLevel', 'Year', 'BatchYear', 'RegisterNumber', 'Student Name', 'Email']
+
+
+def make_names(rng, count):
+    first = np.array(MALE_NAMES + FEMALE_NAMES)[rng.integers(len(MALE_NAMES) + len(FEMALE_NAMES), size=count)]
+    last = np.array(LAST_NAMES)[rng.integers(len(LAST_NAMES), size=count)]
+    return np.char.add(np.char.add(first, ' '), last)
 
 
 def build_department_codes():
@@ -99,68 +131,362 @@ def build_department_codes():
     return {dept: f"{base + idx}" for idx, dept in enumerate(all_depts)}
 
 
-def build_students():
-    rows = []
+def build_cohorts():
+    """(department, program level, year) for every intake, UG before PG."""
+    return ([(dept, 'UG', year) for dept in UG_DEPARTMENTS for year in (1, 2, 3)]
+            + [(dept, 'PG', year) for dept in PG_DEPARTMENTS for year in (1, 2)])
+
+
+def _ranges(counts):
+    """Position within each run for runs of the given lengths, e.g. [2, 3] -> [0, 1, 0, 1, 2]."""
+    return np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+
+def build_students(rng, total=None):
+    """Column arrays for ``total`` students spread evenly over all cohorts (40 per cohort if None)."""
+    cohorts = build_cohorts()
+    if total is None:
+        counts = np.full(len(cohorts), STUDENTS_PER_YEAR)
+    else:
+        counts = np.full(len(cohorts), total // len(cohorts))
+        counts[:total % len(cohorts)] += 1
+    cohort = np.repeat(np.arange(len(cohorts)), counts)
+    serial = _ranges(counts) + 1
+
     dept_codes = build_department_codes()
-    college_code = "8230"
+    departments = UG_DEPARTMENTS + PG_DEPARTMENTS
     current_year_two_digit = int(str(datetime.now().year)[-2:])
-    serial_tracker = {}
-
-    # UG: 3 years, 40 students per year
-    for dept in UG_DEPARTMENTS:
-        for year in (1, 2, 3):
-            serial_tracker[(dept, year)] = 0
-            for _ in range(40):
-                serial_tracker[(dept, year)] += 1
-                serial = serial_tracker[(dept, year)]
-                batch_year = (current_year_two_digit - year + 1) % 100  # e.g., Y1->26, Y2->25
-                reg = f"{college_code}{batch_year:02d}{dept_codes[dept]}{serial:02d}"
-                rows.append({
-                    'Department': dept,
-                    'ProgramLevel': 'UG',
-                    'Year': year,
-                    'BatchYear': f"{batch_year:02d}",
-                    'RegisterNumber': reg,
-                    'Student Name': make_name(),
-                    'Email': f"{reg}@hicas.ac.in",
-                })
-
-    # PG: 2 years, 40 students per year
-    for dept in PG_DEPARTMENTS:
-        for year in (1, 2):
-            serial_tracker[(dept, year)] = 0
-            for _ in range(40):
-                serial_tracker[(dept, year)] += 1
-                serial = serial_tracker[(dept, year)]
-                batch_year = (current_year_two_digit - year + 1) % 100  # e.g., Y1->26, Y2->25
-                reg = f"{college_code}{batch_year:02d}{dept_codes[dept]}{serial:02d}"
-                rows.append({
-                    'Department': dept,
-                    'ProgramLevel': 'PG',
-                    'Year': year,
-                    'BatchYear': f"{batch_year:02d}",
-                    'RegisterNumber': reg,
-                    'Student Name': make_name(),
-                    'Email': f"{reg}@hicas.ac.in",
-                })
-
-    return rows
-
-
-def main():
-    rows = build_students()
-    out_path = Path('hicas_students_simulated.csv')
-    with out_path.open('w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=[
-                'Department', 'ProgramLevel', 'Year', 'BatchYear',
-                'RegisterNumber', 'Student Name', 'Email'
-            ]
-        )
-        writer.writeheader()
-        writer.writerows(rows)
-    print(f"Created {out_path} with {len(rows)} simulated students.")
+    batch_years = np.array([f"{(current_year_two_digit - year + 1) % 100:02d}" for _, _, year in cohorts])
+    prefixes = np.array([f"{COLLEGE_CODE}{batch}{dept_codes[dept]}"
+                         for (dept, _, _), batch in zip(cohorts, batch_years)])
+    # Two-digit serials as before; wider only once a cohort outgrows 99 students
+    width = max(2, len(str(counts.max())))
+
+    return {
+        'department': np.array([departments.index(dept) for dept, _, _ in cohorts])[cohort],
+        'level': np.array([level for _, level, _ in cohorts])[cohort],
+        'year': np.array([year for _, _, year in cohorts])[cohort],
+        'batch_year': batch_years[cohort],
+        'register_number': np.char.add(prefixes[cohort], np.char.zfill(serial.astype(str), width)),
+        'name': make_names(rng, len(cohort)),
+    }
+
+
+def build_faculty(rng, per_department=FACULTY_PER_DEPARTMENT):
+    """``per_department`` faculty for every department, stored department by department."""
+    count = len(UG_DEPARTMENTS + PG_DEPARTMENTS) * per_department
+    return {
+        'department': np.repeat(np.arange(len(UG_DEPARTMENTS + PG_DEPARTMENTS)), per_department),
+        'name': np.char.add('Dr. ', make_names(rng, count)),
+    }
+
+
+def build_activity(rng, students, faculty_per_department=FACULTY_PER_DEPARTMENT, rate=APPLICATION_RATE):
+    """Applications, weekly logs and proofs as column arrays; indexes refer to the student/faculty arrays."""
+    applicants = np.flatnonzero((students['year'] >= 3) & (rng.random(len(students['year'])) < rate))
+    count = len(applicants)
+
+    role_counts = np.array([len(roles) for _, roles in COMPANIES_WITH_ROLES])
+    company = rng.integers(len(COMPANIES_WITH_ROLES), size=count)
+    role = (np.cumsum(role_counts) - role_counts)[company] + (rng.random(count) * role_counts[company]).astype(int)
+    start = np.datetime64(PROGRAM_START) + rng.integers(0, 57, size=count)
+    duration = rng.integers(60, 121, size=count)  # 60-120 days internship
+    applications = {
+        'student': applicants,
+        'faculty': students['department'][applicants] * faculty_per_department
+                   + rng.integers(faculty_per_department, size=count),
+        'company': company,
+        'role': role,
+        'mode': rng.integers(len(APPLICATION_MODES), size=count),
+        'status': np.array(APPLICATION_STATUSES)[rng.integers(len(APPLICATION_STATUSES), size=count)],
+        'start': start,
+        'end': start + duration,
+    }
+
+    approved = np.flatnonzero(applications['status'] == 'approved')
+    # 4 to 12 weeks depending on duration, most of them submitted
+    max_weeks = np.clip(duration[approved] // 7, 4, 12)
+    weeks_submitted = rng.integers(np.maximum(4, max_weeks - 4), max_weeks + 1)
+    log_app = np.repeat(approved, weeks_submitted)
+    week = _ranges(weeks_submitted) + 1
+    # Earlier weeks are more likely to be reviewed
+    reviewed = rng.random(len(week)) < (0.95 - week * 0.05)
+    submitted = applications['start'][log_app] + week * 7
+    logs = {
+        'application': log_app,
+        'week': week,
+        'reviewed': reviewed,
+        'submitted': submitted,
+        'review': submitted + rng.integers(1, 4, size=len(week)),
+        'hours': rng.integers(35, 46, size=len(week)),
+        'feedback': rng.integers(len(FEEDBACK_MESSAGES), size=len(week)),
+    }
+
+    proof_app = np.repeat(approved, rng.integers(2, 5, size=len(approved)))
+    proofs = {
+        'application': proof_app,
+        'type': rng.integers(len(PROOF_TYPES), size=len(proof_app)),
+        'verified': rng.random(len(proof_app)) < 2 / 3,
+        'verified_by': rng.random(len(proof_app)) > 0.3,
+    }
+    return applications, logs, proofs
+
+
+def django_password_hash(password, rng):
+    """pbkdf2_sha256 hash in Django's format, salted from ``rng`` so output stays reproducible."""
+    salt = ''.join(np.array(list('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'))[rng.integers(62, size=22)])
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), PBKDF2_ITERATIONS)
+    return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${salt}${base64.b64encode(digest).decode()}"
+
+
+def _text(values):
+    return np.asarray(values).astype(str)
+
+
+def _join(*parts):
+    return reduce(np.char.add, [_text(p) for p in parts])
+
+
+def _null_unless(mask, values):
+    return np.where(mask, _text(values), NULL)
+
+
+def _timestamps(days):
+    return np.char.add(np.datetime_as_string(days, unit='D'), ' 00:00:00+00')
+
+
+def build_tables(rng, students, faculty=None, activity=None, id_start=1):
+    """Map table -> (columns, row count, function(slice) -> list of str column arrays)."""
+    departments = np.array([DEPT_MAPPING.get(dept, 'CSE') for dept in UG_DEPARTMENTS + PG_DEPARTMENTS])
+    faculty_count = len(faculty['name']) if faculty is not None else 0
+    student_count = len(students['name'])
+    user_count = faculty_count + student_count
+    # Users and profiles share ids: faculty first, then students
+    student_ids = np.arange(student_count) + id_start + faculty_count
+    faculty_ids = np.arange(faculty_count) + id_start
+    passwords = {'faculty': django_password_hash('faculty123', rng), 'student': django_password_hash('student123', rng)}
+    joined = _timestamps(np.datetime64(PROGRAM_START))
+    id_width = max(5, len(str(user_count)))
+
+    last_people = {}
+
+    def people(sl):
+        """Per-person columns for rows ``sl`` of the faculty-then-students sequence."""
+        # auth_user and internship_userprofile are written slice by slice with the same slices
+        if last_people.get('slice') == (sl.start, sl.stop):
+            return last_people['columns']
+        index = np.arange(user_count)[sl]
+        is_faculty = index < faculty_count
+        student = np.clip(index - faculty_count, 0, max(student_count - 1, 0))
+        fac = np.clip(index, 0, max(faculty_count - 1, 0))
+        reg = students['register_number'][student]
+        username = np.where(is_faculty, _join('faculty', fac + 1), reg)
+        if faculty_count:
+            full_name = np.where(is_faculty, faculty['name'][fac], students['name'][student])
+            dept = np.where(is_faculty, faculty['department'][fac], students['department'][student])
+        else:
+            full_name, dept = students['name'][student], students['department'][student]
+        columns = {
+            'id': _text(index + id_start),
+            'username': username,
+            'password': np.where(is_faculty, passwords['faculty'], passwords['student']),
+            'email': np.where(is_faculty, _join(username, '@hicas.ac.in'), _join(reg, '@student.hicas.ac.in')),
+            'role': np.where(is_faculty, 'faculty', 'student'),
+            'employee_id': np.where(is_faculty, _join('FC', np.char.zfill(_text(fac + 1), id_width)),
+                                    _join('ST', np.char.zfill(_text(student + 1), id_width))),
+            'full_name': full_name,
+            'department': departments[dept],
+            'register_number': np.where(is_faculty, NULL, reg),
+            'year_of_study': np.where(is_faculty, NULL, _text(students['year'][student])),
+            'mobile_number': np.where(is_faculty, _join('98765', 10000 + fac + 1), _join('99999', 10000 + student + 1)),
+        }
+        last_people.update(slice=(sl.start, sl.stop), columns=columns)
+        return columns
+
+    def users(sl):
+        p = people(sl)
+        n = len(p['id'])
+        return [p['id'], p['password'], np.full(n, 'f'), p['username'], np.full(n, ''), np.full(n, ''), p['email'],
+                np.full(n, 'f'), np.full(n, 't'), np.full(n, joined)]
+
+    def profiles(sl):
+        p = people(sl)
+        return [p['id'], p['id'], p['employee_id'], p['full_name'], p['role'], p['register_number'],
+                p['department'], p['year_of_study'], p['email'], p['mobile_number']]
+
+    tables = {
+        'auth_user': (
+            ['id', 'password', 'is_superuser', 'username', 'first_name', 'last_name', 'email', 'is_staff',
+             'is_active', 'date_joined'],
+            user_count, users),
+        'internship_userprofile': (
+            ['id', 'user_id', 'employee_id', 'full_name', 'role', 'register_number', 'department', 'year_of_study',
+             'email_id', 'mobile_number'],
+            user_count, profiles),
+    }
+    if activity is None:
+        return tables
+
+    applications, logs, proofs = activity
+    company_names = np.array([name for name, _ in COMPANIES_WITH_ROLES])
+    role_names = np.array([role for _, roles in COMPANIES_WITH_ROLES for role in roles])
+    app_company = company_names[applications['company']]
+    app_faculty_ids = faculty_ids[applications['faculty']] if faculty_count else np.zeros(len(applications['faculty']), dtype=int)
+
+    def application_rows(sl):
+        status = applications['status'][sl]
+        n = len(status)
+        return [_text(np.arange(len(applications['student']))[sl] + id_start),
+                _text(student_ids[applications['student'][sl]]),
+                _null_unless(np.full(n, faculty_count > 0), app_faculty_ids[sl]),
+                app_company[sl], role_names[applications['role'][sl]],
+                np.array(APPLICATION_MODES)[applications['mode'][sl]],
+                np.datetime_as_string(applications['start'][sl], unit='D'),
+                np.datetime_as_string(applications['end'][sl], unit='D'),
+                status,
+                np.where(status != 'pending_faculty', 'Application reviewed', ''),
+                _null_unless(status == 'approved', np.datetime_as_string(applications['start'][sl], unit='D')),
+                _timestamps(applications['start'][sl])]
+
+    def log_rows(sl):
+        app = logs['application'][sl]
+        week = logs['week'][sl]
+        reviewed = logs['reviewed'][sl]
+        n = len(app)
+        return [_text(np.arange(len(logs['application']))[sl] + id_start),
+                _text(student_ids[applications['student'][app]]),
+                _text(app + id_start), _text(week),
+                _join('Week ', week, ': Completed assigned tasks including development, testing, and documentation '
+                      'work at ', app_company[app], '.'),
+                np.full(n, 'Technical skills, teamwork, problem solving, communication'),
+                _text(logs['hours'][sl]),
+                np.where(reviewed, 'reviewed', 'submitted'), np.where(reviewed, 'reviewed', 'pending'),
+                _timestamps(logs['submitted'][sl]),
+                np.where(reviewed, np.array(FEEDBACK_MESSAGES)[logs['feedback'][sl]], ''),
+                _null_unless(reviewed & (faculty_count > 0), app_faculty_ids[app]),
+                _null_unless(reviewed, _timestamps(logs['review'][sl])),
+                np.full(n, '0')]
+
+    def proof_rows(sl):
+        app = proofs['application'][sl]
+        n = len(app)
+        return [_text(np.arange(len(proofs['application']))[sl] + id_start),
+                _text(app + id_start), _text(student_ids[applications['student'][app]]),
+                np.array(PROOF_TYPES)[proofs['type'][sl]],
+                _join('Progress proof - ', app_company[app]),
+                np.full(n, 'Work evidence during internship'),
+                np.where(proofs['verified'][sl], 'verified', 'pending'),
+                _timestamps(applications['start'][app]),
+                _null_unless(proofs['verified_by'][sl] & (faculty_count > 0), app_faculty_ids[app])]
+
+    tables.update({
+        'internship_internshipapplication': (
+            ['application_id', 'student_id', 'assigned_faculty_id', 'company_name', 'internship_domain',
+             'internship_mode', 'start_date', 'end_date', 'application_status', 'faculty_remarks', 'approval_date',
+             'created_at'],
+            len(applications['student']), application_rows),
+        'internship_weeklylog': (
+            ['log_id', 'student_id', 'application_id', 'week_number', 'work_summary', 'skills_learned',
+             'hours_worked', 'log_status', 'review_status', 'submission_date', 'faculty_feedback', 'reviewed_by_id',
+             'review_date', 'missed_log_count'],
+            len(logs['application']), log_rows),
+        'internship_progressproof': (
+            ['proof_id', 'application_id', 'student_id', 'proof_type', 'title', 'description',
+             'verification_status', 'submission_date', 'verified_by_id'],
+            len(proofs['application']), proof_rows),
+    })
+    return tables
+
+
+def _slices(total):
+    for start in range(0, total, WRITE_CHUNK_ROWS):
+        yield slice(start, min(start + WRITE_CHUNK_ROWS, total))
+
+
+def write_table(path, columns, total, rows, fmt):
+    """Write one table as COPY text, or as CSV with a header row."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = None
+        if fmt == 'csv':
+            writer = csv.writer(f)
+            writer.writerow(columns)
+        for sl in _slices(total):
+            values = [column.tolist() for column in rows(sl)]
+            if writer:
+                writer.writerows(zip(*values))
+            else:
+                # Catalog text and generated names contain no tabs, newlines or backslashes to escape
+                f.writelines(f'{line}\n' for line in map('\t'.join, zip(*values)))
+
+
+def write_load_script(path, tables, fmt):
+    options = " WITH (FORMAT csv, HEADER true, NULL '\\N')" if fmt == 'csv' else ''
+    lines = [
+        '-- Load the generated tables into an empty SmartIntern database: psql -d <database> -f load.sql',
+        '-- Afterwards run "python manage.py normalize_dimensions" to link companies and domains.',
+        'BEGIN;',
+    ]
+    for table, (columns, _, _) in tables.items():
+        lines.append(f"\\copy {table} ({', '.join(columns)}) FROM '{(path.parent / f'{table}.{fmt}').resolve()}'{options}")
+    for table, (columns, _, _) in tables.items():
+        lines.append(f"SELECT setval(pg_get_serial_sequence('{table}', '{columns[0]}'), (SELECT MAX({columns[0]}) FROM {table}));")
+    lines.append('COMMIT;')
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def write_students_csv(path, students):
+    departments = np.array(UG_DEPARTMENTS + PG_DEPARTMENTS)
+    reg = students['register_number']
+    columns = [departments[students['department']], students['level'], _text(students['year']),
+               students['batch_year'], reg, students['name'], np.char.add(reg, '@hicas.ac.in')]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(STUDENT_CSV_COLUMNS)
+        for sl in _slices(len(reg)):
+            writer.writerows(zip(*(column[sl] for column in columns)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--students', type=int, default=None,
+                        help=f'Total students, spread evenly over all department-years (default: {STUDENTS_PER_YEAR} per year)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f'Random seed (default: {DEFAULT_SEED})')
+    parser.add_argument('--activity', action='store_true',
+                        help='Also generate faculty, internship applications, weekly logs and progress proofs')
+    parser.add_argument('--faculty-per-department', type=int, default=FACULTY_PER_DEPARTMENT,
+                        help=f'Simulated faculty per department with --activity (default: {FACULTY_PER_DEPARTMENT})')
+    parser.add_argument('--format', choices=['csv', 'copy'], default='csv',
+                        help='csv: hicas_students_simulated.csv (plus one CSV per table with --activity); '
+                             'copy: PostgreSQL COPY files for every table and a load.sql')
+    parser.add_argument('--output-dir', type=Path, default=Path('.'), help='Directory for the generated files')
+    parser.add_argument('--id-start', type=int, default=1, help='First primary key used in table files')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    rng = np.random.default_rng(args.seed)
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    students = build_students(rng, args.students)
+    if args.format == 'csv':
+        out_path = args.output_dir / 'hicas_students_simulated.csv'
+        write_students_csv(out_path, students)
+        print(f"Created {out_path} with {len(students['name'])} simulated students.")
+
+    if args.activity or args.format == 'copy':
+        faculty = build_faculty(rng, args.faculty_per_department) if args.activity else None
+        activity = build_activity(rng, students, args.faculty_per_department) if args.activity else None
+        tables = build_tables(rng, students, faculty, activity, args.id_start)
+        for table, (columns, total, rows) in tables.items():
+            path = args.output_dir / f'{table}.{args.format}'
+            write_table(path, columns, total, rows, args.format)
+            print(f"Created {path} with {total} rows.")
+        write_load_script(args.output_dir / 'load.sql', tables, args.format)
+        print(f"Created {args.output_dir / 'load.sql'}")
+
+    print(f"Done in {time.perf_counter() - start:.1f}s (seed {args.seed}).")
 
 
 if __name__ == '__main__':
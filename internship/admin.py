@@ -1,18 +1,76 @@
-from django.contrib import admin
-from .models import UserProfile, InternshipApplication, WeeklyLog, InternshipCompletion, ProgressProof
+from django.contrib import admin, messages
+from django.shortcuts import redirect
+from django.db.models import Count
+from .models import (UserProfile, InternshipApplication, WeeklyLog, InternshipCompletion, ProgressProof, ReportJob,
+                     Company, CompanyAlias, Domain, DomainAlias, RosterEntry)
+from .report_jobs import request_report
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ['employee_id', 'full_name', 'role', 'department', 'email_id']
-    list_filter = ['role', 'department']
+    list_filter = ['role', 'department', 'year_of_study']
     search_fields = ['full_name', 'employee_id', 'email_id']
+    actions = ['generate_transcripts']
+
+    @admin.action(description='Generate internship transcripts (ZIP) for selected students')
+    def generate_transcripts(self, request, queryset):
+        student_ids = list(queryset.filter(role='student').values_list('pk', flat=True))
+        if not student_ids:
+            self.message_user(request, 'No students selected.', messages.WARNING)
+            return None
+        job, _ = request_report(getattr(request.user, 'profile', None), 'transcripts', {'student_ids': student_ids})
+        self.message_user(request, f'Transcript job #{job.job_id} queued for {len(student_ids)} students.')
+        # Superusers may have no profile, so follow the job in the admin rather than on the report pages
+        return redirect('admin:internship_reportjob_change', job.pk)
 
 @admin.register(InternshipApplication)
 class InternshipApplicationAdmin(admin.ModelAdmin):
-    list_display = ['application_id', 'student', 'company_name', 'internship_domain', 'application_status', 'start_date']
-    list_filter = ['application_status', 'internship_domain', 'internship_mode']
+    list_display = ['application_id', 'student', 'company_name', 'company', 'internship_domain', 'application_status', 'start_date']
+    list_filter = ['application_status', 'domain', 'internship_mode']
+    list_select_related = ['student', 'company']
     search_fields = ['company_name', 'student__full_name']
 
+class CompanyAliasInline(admin.TabularInline):
+    model = CompanyAlias
+    fields = ['alias', 'alias_key']
+    readonly_fields = ['alias_key']
+    extra = 1
+
+@admin.register(Company)
+class CompanyAdmin(admin.ModelAdmin):
+    # New aliases apply to existing applications after `normalize_dimensions --all`
+    list_display = ['company_id', 'name', 'normalized_key', 'application_count']
+    search_fields = ['name', 'normalized_key', 'aliases__alias']
+    readonly_fields = ['normalized_key']
+    inlines = [CompanyAliasInline]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(application_count=Count('applications'))
+
+    @admin.display(ordering='application_count')
+    def application_count(self, obj):
+        return obj.application_count
+
+class DomainAliasInline(admin.TabularInline):
+    model = DomainAlias
+    fields = ['alias', 'alias_key']
+    readonly_fields = ['alias_key']
+    extra = 1
+
+@admin.register(Domain)
+class DomainAdmin(admin.ModelAdmin):
+    list_display = ['domain_id', 'name', 'normalized_key', 'application_count']
+    search_fields = ['name', 'normalized_key', 'aliases__alias']
+    readonly_fields = ['normalized_key']
+    inlines = [DomainAliasInline]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(application_count=Count('applications'))
+
+    @admin.display(ordering='application_count')
+    def application_count(self, obj):
+        return obj.application_count
+
 @admin.register(WeeklyLog)
 class WeeklyLogAdmin(admin.ModelAdmin):
     list_display = ['log_id', 'student', 'week_number', 'hours_worked', 'log_status', 'submission_date']
@@ -29,4 +87,20 @@ class InternshipCompletionAdmin(admin.ModelAdmin):
 class ProgressProofAdmin(admin.ModelAdmin):
     list_display = ['proof_id', 'student', 'application', 'proof_type', 'title', 'verification_status', 'submission_date']
     list_filter = ['verification_status', 'proof_type', 'submission_date']
-    search_fields = ['student__full_name', 'title', 'application__company_name']
\ No newline at end of file
+    search_fields = ['student__full_name', 'title', 'application__company_name']
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ['job_id', 'report_type', 'status', 'requested_by', 'worker', 'created_at', 'heartbeat_at',
+                    'finished_at', 'expires_at']
+    list_filter = ['status', 'report_type']
+    exclude = ['result_data']
+
+
+@admin.register(RosterEntry)
+class RosterEntryAdmin(admin.ModelAdmin):
+    list_display = ['entry_id', 'source', 'key', 'profile', 'synced_at']
+    list_filter = ['source']
+    search_fields = ['key', 'profile__full_name']
+    raw_id_fields = ['profile']
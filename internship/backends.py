@@ -0,0 +1,30 @@
+"""Authentication backend that loads each request's user together with its profile.
+
+Every page checks ``request.user.profile`` (``role_required``, the views,
+base.html), which costs a second query after ``AuthenticationMiddleware``
+has loaded the user. Joining the profile in ``get_user`` makes it one query
+per request; the profile stays cached on the user for the rest of the
+request, and as the user is reloaded on every request there is nothing to
+invalidate when a profile changes.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+
+
+class ProfileBackend(ModelBackend):
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user = super().authenticate(request, username=username, password=password, **kwargs)
+        if user is None and username is not None and password is not None:
+            # Stop here: the plain ModelBackend listed after this one would check the same password again
+            raise PermissionDenied
+        return user
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related('profile').get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
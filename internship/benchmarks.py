@@ -0,0 +1,102 @@
+"""Per-stage measurements for the loader benchmark.
+
+Loader commands announce the end of each stage with the ``stage_finished``
+signal (their ``lap``). ``StageRecorder`` listens while a command runs and
+closes a stage at every signal, recording wall time, the SQL statements
+issued (through a connection execute wrapper, so DEBUG isn't needed), the
+rows the stage left behind in the tracked tables and the peak Python heap
+seen by ``tracemalloc``. Row counts are taken between stages and excluded
+from the stage's time and query count.
+
+Statements that bypass the cursor wrapper, such as psycopg2's
+``copy_expert``, are not counted as queries; their rows still are.
+"""
+
+import time
+import tracemalloc
+
+from django.db import connection
+from django.dispatch import Signal
+
+# Sent by a loader command when one of its stages is done: stage=<name>
+stage_finished = Signal()
+
+
+class QueryCounter:
+    """Connection execute wrapper that counts statements and executemany batches"""
+
+    def __init__(self):
+        self.count = 0
+        self.paused = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if not self.paused:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+
+class StageRecorder:
+    """Measure the stages of one command run; ``counters`` maps a name to a queryset whose count is 'rows'"""
+
+    def __init__(self, counters):
+        self.counters = counters
+        self.stages = []
+
+    def _counts(self):
+        self.queries.paused = True
+        try:
+            return {name: queryset.count() for name, queryset in self.counters.items()}
+        finally:
+            self.queries.paused = False
+
+    def _start_stage(self):
+        self._counts_before = self._counts()
+        self._queries_before = self.queries.count
+        tracemalloc.reset_peak()
+        self._stage_start = time.perf_counter()
+
+    def split(self, stage, **kwargs):
+        """Close the running stage under the name ``stage`` and start the next one"""
+        seconds = time.perf_counter() - self._stage_start
+        _, peak = tracemalloc.get_traced_memory()
+        queries = self.queries.count - self._queries_before
+        counts = self._counts()
+        rows = sum(max(0, counts[name] - self._counts_before[name]) for name in counts)
+        self.stages.append({
+            'stage': stage,
+            'seconds': round(seconds, 4),
+            'queries': queries,
+            'rows': rows,
+            'rows_per_second': round(rows / seconds, 1) if seconds else None,
+            'peak_memory_mb': round(peak / 1024 / 1024, 2),
+        })
+        self._start_stage()
+
+    def __enter__(self):
+        self.queries = QueryCounter()
+        self._wrapper = connection.execute_wrapper(self.queries)
+        self._wrapper.__enter__()
+        tracemalloc.start()
+        self._start_stage()
+        stage_finished.connect(self.split)
+        return self
+
+    def __exit__(self, *exc_info):
+        stage_finished.disconnect(self.split)
+        # Whatever ran after the last announced stage (summaries, checkpoint cleanup, or the whole
+        # command if it announces none)
+        self.split('rest' if self.stages else 'total')
+        tracemalloc.stop()
+        self._wrapper.__exit__(*exc_info)
+
+    def summary(self):
+        """The run as a whole: sums of time, queries and rows, and the highest stage peak"""
+        seconds = sum(stage['seconds'] for stage in self.stages)
+        rows = sum(stage['rows'] for stage in self.stages)
+        return {
+            'seconds': round(seconds, 4),
+            'queries': sum(stage['queries'] for stage in self.stages),
+            'rows': rows,
+            'rows_per_second': round(rows / seconds, 1) if seconds else None,
+            'peak_memory_mb': max((stage['peak_memory_mb'] for stage in self.stages), default=0.0),
+        }
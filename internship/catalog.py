@@ -0,0 +1,142 @@
+"""Reference data shared by the loaders, the scraper and the synthetic dataset generator.
+
+Plain Python with no Django imports, so ``generate_simulated_students.py``
+and ``scrape_hicas_faculty.py`` can use it without setting Django up.
+"""
+
+import re
+from datetime import date
+
+# Registrar department name -> UserProfile.department code
+DEPT_MAPPING = {
+    'B.Com Accounting & Finance': 'BCOM_AF',
+    'B.Com CA': 'BCOM_CA',
+    'B.Com CS': 'BCOM_CS',
+    'B.Com Commerce': 'BCOM',
+    'B.Com IT': 'BCOM_IT',
+    'B.Com International Business': 'BCOM_IB',
+    'B.Com Professional Accounting': 'BCOM_PA',
+    'B.Sc AI & ML': 'BSC_AI',
+    'B.Sc Animation & Visual Effects': 'BSC_ANIM',
+    'B.Sc Biotechnology': 'BSC_BIO',
+    'B.Sc CS with Cognitive Systems': 'BSC_CS_COG',
+    'B.Sc CS with Cyber Security': 'BSC_CS_CYB',
+    'B.Sc Catering Science & Hotel Management': 'BSC_CATERING',
+    'B.Sc Computer Science': 'CSE',
+    'B.Sc Computer Technology': 'BSC_CT',
+    'B.Sc Costume Design & Fashion': 'BSC_FASHION',
+    'B.Sc Data Science & Analytics': 'BSC_DS',
+    'B.Sc Electronics and Communication Systems': 'ECE',
+    'B.Sc Food Processing Technology & Management': 'BSC_FOOD',
+    'B.Sc Information Technology': 'IT',
+    'B.Sc Mathematics': 'MATHEMATICS',
+    'B.Sc Microbiology': 'BSC_MICRO',
+    'B.Sc Physics': 'PHYSICS',
+    'B.Sc Visual Communication': 'BSC_VISCOM',
+    'BA English Literature': 'ENGLISH',
+    'BBA': 'BBA',
+    'BBA CA': 'BBA_CA',
+    'BBA Logistics': 'BBA_LOG',
+    'BCA - Bachelor of Computer Applications': 'BCA',
+    'M.Com CA': 'MCOM_CA',
+    'M.Com International Business': 'MCOM_IB',
+    'M.Sc Biotechnology': 'MSC_BIO',
+}
+
+COMPANIES_WITH_ROLES = [
+    # Top recruiters from HICAS 2024-2025
+    ('Zoho Corporation', ['Software Developer', 'Web Developer', 'Technical Support Engineer']),
+    ('Ramco Cements Ltd.', ['Management Trainee', 'Quality Control Analyst', 'Marketing Executive']),
+    ('Verzeo Edutech', ['Content Developer', 'Educational Consultant', 'Training Coordinator']),
+    ('Digital Intelligence Systems (DISYS)', ['Data Analyst', 'Business Intelligence Developer', 'Systems Engineer']),
+    ('QSPIDERS', ['Software Testing Engineer', 'Automation Tester', 'Quality Analyst']),
+    ('Accenture', ['Associate Software Engineer', 'Business Analyst', 'Application Developer']),
+    ('TCS (Tata Consultancy Services)', ['Assistant Systems Engineer', 'Digital Analyst', 'IT Consultant']),
+    ('Infosys Limited', ['Systems Engineer', 'Technology Analyst', 'Digital Specialist']),
+    ('Wipro', ['Project Engineer', 'Software Developer', 'Business Analyst']),
+    ('Capgemini', ['Analyst', 'Senior Analyst', 'Consultant']),
+    ('Cognizant', ['Programmer Analyst', 'Associate Projects', 'Process Executive']),
+    ('L&T Infotech', ['Software Engineer', 'Graduate Engineer Trainee', 'Systems Analyst']),
+    ('Hexaware Technologies', ['Software Developer', 'Quality Analyst', 'Technical Support']),
+    ('KGISL', ['Software Trainee', 'Junior Developer', 'Tech Support Executive']),
+
+    # Banking & Finance
+    ('HDFC Bank', ['Personal Banker', 'Relationship Manager', 'Sales Officer']),
+    ('ESAF Small Finance Bank', ['Relationship Officer', 'Branch Operations', 'Customer Service']),
+    ('ICICI Bank', ['Probationary Officer', 'Sales Executive', 'Credit Analyst']),
+    ('Bajaj Allianz Life Insurance', ['Insurance Advisor', 'Sales Manager', 'Claims Processor']),
+    ('SBI Cards', ['Sales Officer', 'Customer Service Executive', 'Collections Officer']),
+    ('Policy Bazaar', ['Insurance Advisor', 'Sales Consultant', 'Customer Relationship Manager']),
+
+    # Analytics & Consulting
+    ('Cognizoft Analytics', ['Data Analyst', 'Business Intelligence Analyst', 'Research Analyst']),
+    ('Neeyamo Enterprise Solutions', ['HR Analyst', 'Payroll Analyst', 'Operations Associate']),
+    ('Birlasoft', ['Associate Consultant', 'Software Engineer', 'Business Analyst']),
+    ('Value Momentum', ['Financial Analyst', 'Business Analyst', 'Risk Analyst']),
+
+    # Manufacturing & Industrial
+    ('Chettinadu Cement', ['Management Trainee', 'Quality Control Executive', 'Production Engineer']),
+    ('Wildcraft India', ['Retail Executive', 'Marketing Coordinator', 'Supply Chain Analyst']),
+    ('Sanmina', ['Production Trainee', 'Quality Engineer', 'Manufacturing Associate']),
+    ('Foxconn', ['Production Executive', 'Quality Control', 'Process Engineer']),
+    ('Pegatron', ['Manufacturing Engineer', 'Quality Assurance', 'Production Planner']),
+
+    # BPO & Customer Service
+    ('Sutherland', ['Customer Service Representative', 'Technical Support', 'Process Associate']),
+    ('Vee Technologies', ['Data Entry Operator', 'Process Associate', 'Quality Analyst']),
+    ('Patra India BPO Services', ['Process Associate', 'Quality Analyst', 'Team Lead']),
+    ('24.7 AI Company', ['Customer Support Associate', 'Technical Support Engineer', 'Process Trainer']),
+    ('Careernet Technologies', ['Recruitment Consultant', 'HR Executive', 'Talent Acquisition']),
+
+    # IT Services & Development
+    ('Mallow Technologies', ['Full Stack Developer', 'Backend Developer', 'DevOps Engineer']),
+    ('Codingmart Technologies', ['Software Developer', 'Mobile App Developer', 'UI/UX Developer']),
+    ('Tringapps Research Labs', ['Research Associate', 'Software Developer', 'Testing Engineer']),
+    ('Prolific Systems & Technologies', ['Software Engineer', 'Systems Administrator', 'Network Engineer']),
+    ('Kriya IT', ['Junior Developer', 'Technical Support', 'Systems Analyst']),
+    ('RND Soft', ['Software Developer', 'Web Developer', 'Quality Analyst']),
+    ('Chain-Sys India', ['Developer Trainee', 'Database Administrator', 'Support Engineer']),
+    ('Orion India Systems', ['Software Engineer', 'Application Developer', 'Technical Consultant']),
+
+    # Specialized Services
+    ('Zifo RnD Solutions', ['Research Associate', 'Laboratory Technician', 'Clinical Data Analyst']),
+    ('IDC Engineering India', ['Design Engineer', 'CAD Technician', 'Project Coordinator']),
+    ('Albatroz Solutions', ['Business Development Executive', 'Marketing Analyst', 'Sales Coordinator']),
+    ('Literact Fintech Solutions', ['Financial Analyst', 'Product Analyst', 'Operations Executive']),
+    ('EPI Source India', ['Clinical Data Management', 'Medical Coding', 'Quality Analyst']),
+
+    # Education & Training
+    ('Unschool Educational Consultant', ['Academic Counselor', 'Content Writer', 'Training Coordinator']),
+    ('Skill Forge', ['Trainer', 'Curriculum Developer', 'Training Coordinator']),
+    ('Focus Edumatics', ['Educational Consultant', 'Content Developer', 'Academic Coordinator']),
+    ('EdVedha', ['Subject Matter Expert', 'Content Developer', 'Academic Counselor']),
+    ('Shree Vari Educational Groups', ['Teacher', 'Academic Coordinator', 'Counselor']),
+
+    # Logistics & Operations
+    ('Gati - Kintetsu Express', ['Operations Executive', 'Supply Chain Coordinator', 'Logistics Analyst']),
+    ('Lakshmi Corporate Services', ['Operations Manager', 'Business Analyst', 'Client Relations']),
+]
+
+APPLICATION_MODES = ['online', 'offline', 'hybrid']
+APPLICATION_STATUSES = ['pending_faculty', 'pending_faculty', 'approved', 'approved', 'rejected_faculty']
+
+# Sample faculty feedback on reviewed weekly logs
+FEEDBACK_MESSAGES = [
+    'Good progress! Keep up the excellent work.',
+    'Nice effort. Focus more on documentation.',
+    'Excellent work this week. Well structured.',
+    'Satisfactory progress. Try to be more detailed next time.',
+    'Great job! Your technical skills are improving.',
+    'Well done. Keep learning new technologies.',
+    'Good work on the project. Continue with the momentum.',
+    'Impressive progress! Your dedication shows.',
+]
+PROOF_TYPES = ['work_sample', 'attendance', 'project_milestone', 'task_completion']
+
+# Internship programme starts; simulated start dates fall in the following 8 weeks
+PROGRAM_START = date(2025, 9, 1)
+
+
+def faculty_key(name, department):
+    """Identity of a faculty member across scrapes: "Dr.A.Name" and "Dr. A. Name" in one department are the same"""
+    return re.sub(r'[\s.]+', ' ', name).strip().lower(), department
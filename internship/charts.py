@@ -0,0 +1,159 @@
+"""Chart rendering for analytics pages.
+
+Three output modes are supported, selected by ``settings.ANALYTICS_CHART_MODE``:
+
+* ``png``  - matplotlib bar chart, base64 encoded for an ``<img>`` tag
+* ``svg``  - inline SVG markup built directly as text, no matplotlib needed
+* ``json`` - the raw series, drawn client-side by ``custom.js``
+
+PNG charts are drawn on a standalone ``matplotlib.figure.Figure`` attached to
+its own Agg canvas, so no pyplot global state is touched and rendering is safe
+from any number of threads at once. matplotlib is only imported the first time
+a PNG is actually requested.
+"""
+
+import base64
+import io
+import logging
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+BAR_COLOR = '#4CAF50'
+MAX_BARS = 10
+MAX_LABEL_LENGTH = 20
+CHART_MODES = ('png', 'svg', 'json')
+
+# SVG geometry (px)
+SVG_WIDTH = 640
+SVG_HEIGHT = 400
+SVG_MARGIN_LEFT = 50
+SVG_MARGIN_RIGHT = 20
+SVG_MARGIN_TOP = 40
+SVG_MARGIN_BOTTOM = 120
+
+
+def get_chart_mode():
+    mode = getattr(settings, 'ANALYTICS_CHART_MODE', 'png')
+    return mode if mode in CHART_MODES else 'png'
+
+
+def chart_series(data, label_field):
+    """Return (labels, counts) for the top bars of a values()/annotate() result."""
+    labels = []
+    counts = []
+    for item in list(data)[:MAX_BARS]:
+        if label_field not in item:
+            return [], []
+        labels.append(str(item[label_field])[:MAX_LABEL_LENGTH])
+        counts.append(int(item['count']))
+    return labels, counts
+
+
+def render_bar_chart_png(labels, counts, title, xlabel):
+    """Render a bar chart to PNG bytes using a private Figure/canvas pair."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    bars = ax.bar(range(len(labels)), counts, color=BAR_COLOR)
+
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel('Count')
+    ax.set_title(title)
+    ax.set_xticks(range(len(labels)))
+    ax.set_xticklabels(labels, rotation=45, ha='right')
+
+    # Add value labels on bars
+    for bar, val in zip(bars, counts):
+        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5,
+                str(val), ha='center', va='bottom', fontsize=9)
+
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def render_bar_chart_svg(labels, counts, title, xlabel):
+    """Render a bar chart as an inline SVG string."""
+    plot_width = SVG_WIDTH - SVG_MARGIN_LEFT - SVG_MARGIN_RIGHT
+    plot_height = SVG_HEIGHT - SVG_MARGIN_TOP - SVG_MARGIN_BOTTOM
+    baseline = SVG_MARGIN_TOP + plot_height
+    peak = max(counts) or 1
+    slot = plot_width / len(counts)
+    bar_width = slot * 0.8
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {SVG_WIDTH} {SVG_HEIGHT}" '
+        f'class="img-fluid" role="img" font-family="sans-serif" font-size="11">',
+        f'<title>{escape(title)}</title>',
+        f'<text x="{SVG_WIDTH / 2:.1f}" y="22" text-anchor="middle" font-size="15">{escape(title)}</text>',
+        f'<line x1="{SVG_MARGIN_LEFT}" y1="{baseline}" x2="{SVG_WIDTH - SVG_MARGIN_RIGHT}" '
+        f'y2="{baseline}" stroke="#333"/>',
+        f'<line x1="{SVG_MARGIN_LEFT}" y1="{SVG_MARGIN_TOP}" x2="{SVG_MARGIN_LEFT}" '
+        f'y2="{baseline}" stroke="#333"/>',
+        f'<text x="14" y="{SVG_MARGIN_TOP + plot_height / 2:.1f}" text-anchor="middle" '
+        f'transform="rotate(-90 14 {SVG_MARGIN_TOP + plot_height / 2:.1f})">Count</text>',
+    ]
+
+    for i, (label, count) in enumerate(zip(labels, counts)):
+        height = count / peak * plot_height
+        x = SVG_MARGIN_LEFT + i * slot + (slot - bar_width) / 2
+        y = baseline - height
+        centre = x + bar_width / 2
+        parts.append(
+            f'<rect x="{x:.1f}" y="{y:.1f}" width="{bar_width:.1f}" height="{height:.1f}" fill="{BAR_COLOR}"/>'
+        )
+        parts.append(f'<text x="{centre:.1f}" y="{y - 4:.1f}" text-anchor="middle">{count}</text>')
+        parts.append(
+            f'<text x="{centre:.1f}" y="{baseline + 12}" text-anchor="end" '
+            f'transform="rotate(-45 {centre:.1f} {baseline + 12})">{escape(label)}</text>'
+        )
+
+    parts.append(
+        f'<text x="{SVG_MARGIN_LEFT + plot_width / 2:.1f}" y="{SVG_HEIGHT - 6}" '
+        f'text-anchor="middle">{escape(xlabel)}</text>'
+    )
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+def build_chart(data, label_field, title, mode=None):
+    """Build a chart in the configured mode.
+
+    Returns None when there is nothing to draw, otherwise a dict with the
+    ``mode`` and its ``content``: base64 PNG text, SVG markup, or a series dict.
+    """
+    if not data:
+        return None
+
+    mode = mode or get_chart_mode()
+    try:
+        labels, counts = chart_series(data, label_field)
+        if not labels:
+            return None
+
+        xlabel = label_field.replace('_', ' ').title()
+        if mode == 'svg':
+            content = render_bar_chart_svg(labels, counts, title, xlabel)
+        elif mode == 'json':
+            content = {'title': title, 'xlabel': xlabel, 'labels': labels, 'counts': counts}
+        else:
+            image_png = render_bar_chart_png(labels, counts, title, xlabel)
+            content = base64.b64encode(image_png).decode('utf-8')
+        return {'mode': mode, 'content': content}
+    except Exception:
+        logger.exception('Chart generation failed')
+        return None
+
+
+def generate_bar_chart(data, label_field, title):
+    """Return a base64-encoded PNG bar chart, or None when there is nothing to draw."""
+    chart = build_chart(data, label_field, title, mode='png')
+    return chart['content'] if chart else None
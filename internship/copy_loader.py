@@ -0,0 +1,97 @@
+"""PostgreSQL COPY fast path for bulk loads.
+
+Model instances are encoded into COPY's text format as they are read and
+streamed through psycopg2's ``copy_expert`` into a temporary staging table.
+A single ``INSERT ... SELECT`` then merges the staging table into the real
+table, optionally skipping rows that hit a unique constraint. Callers on
+other database backends should fall back to ``bulk_create``.
+"""
+
+import datetime
+import json
+
+from django.db import connections, transaction
+
+
+def supports_copy(using='default'):
+    return connections[using].vendor == 'postgresql'
+
+
+def _encode(value):
+    """One value in COPY text format."""
+    if value is None:
+        return '\\N'
+    value = getattr(value, 'adapted', value)  # psycopg2 Binary/Json adapters
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        # bytea hex input; the backslash itself must be escaped for COPY
+        return '\\\\x' + bytes(value).hex()
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    text = str(value)
+    return text.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+class RowStream:
+    """Read-only file object producing COPY text lines from an iterable of rows."""
+
+    def __init__(self, rows):
+        self._lines = ('\t'.join(map(_encode, row)) + '\n' for row in rows)
+        self._buffer = bytearray()
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line.encode('utf-8')
+        if size < 0:
+            size = len(self._buffer)
+        chunk = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return chunk
+
+    def readline(self, size=-1):
+        return self.read(size)
+
+
+def assign_pks(model, objs, using='default'):
+    """Reserve primary keys from the table's sequence so children can reference rows before they are copied."""
+    if not objs:
+        return
+    meta = model._meta
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)',
+            [meta.db_table, meta.pk.column, len(objs)],
+        )
+        for obj, (pk,) in zip(objs, cursor.fetchall()):
+            obj.pk = pk
+
+
+def copy_objects(model, objs, ignore_conflicts=False, include_pk=False, using='default'):
+    """COPY ``objs`` into a staging table and merge them into the model's table.
+
+    Field defaults and ``auto_now_add`` are applied as ``bulk_create`` would.
+    The primary key is left to the database unless ``include_pk`` is set
+    (see ``assign_pks``). Returns the number of rows inserted.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    fields = [f for f in model._meta.concrete_fields if include_pk or not f.primary_key]
+    columns = ', '.join(quote(f.column) for f in fields)
+    table = quote(model._meta.db_table)
+    staging = quote(f'staging_{model._meta.db_table}')
+    rows = ([f.get_db_prep_save(f.pre_save(obj, True), connection) for f in fields] for obj in objs)
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TEMP TABLE {staging} AS SELECT {columns} FROM {table} WITH NO DATA')
+        cursor.copy_expert(f'COPY {staging} ({columns}) FROM STDIN', RowStream(rows))
+        conflict = ' ON CONFLICT DO NOTHING' if ignore_conflicts else ''
+        cursor.execute(f'INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging}{conflict}')
+        inserted = cursor.rowcount
+        cursor.execute(f'DROP TABLE {staging}')
+    return inserted
@@ -0,0 +1,196 @@
+"""In-memory columnar cache of internship applications for analytics roll-ups.
+
+Every application is one row in a set of parallel NumPy arrays. Each
+dimension (canonical domain and company, department, status, start month) is
+stored as an integer code into a per-dimension label list, so grouping and filtering become
+``np.bincount`` calls and boolean masks instead of SQL GROUP BYs.
+
+The cube is built lazily from the database on first use. After that,
+``post_save``/``post_delete`` signals keep it current within this process. A
+rebuild after ``ANALYTICS_CUBE_TTL_SECONDS`` picks up changes made by other
+processes or by bulk ``update()`` calls, which do not fire signals.
+"""
+
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+DIMENSIONS = ('internship_domain', 'company_name', 'department', 'application_status', 'month')
+INITIAL_CAPACITY = 1024
+# Largest group-by space counted with a dense np.bincount
+DENSE_CELL_LIMIT = 1 << 20
+
+
+def month_code(value):
+    return value.year * 12 + value.month - 1
+
+
+def month_label(code):
+    return f'{code // 12:04d}-{code % 12 + 1:02d}'
+
+
+class ApplicationCube:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.built_at = None
+        self._reset(INITIAL_CAPACITY)
+
+    def _reset(self, capacity):
+        self.size = 0
+        self.rows = {}  # application_id -> row index
+        self.labels = {dim: [] for dim in DIMENSIONS}
+        self.codes = {dim: {} for dim in DIMENSIONS}
+        self.columns = {dim: np.zeros(capacity, dtype=np.int32) for dim in DIMENSIONS}
+        self.start = np.zeros(capacity, dtype=np.int32)  # start_date as a proleptic ordinal
+        self.live = np.zeros(capacity, dtype=bool)
+
+    # Building and maintenance
+
+    def build(self):
+        """Load every application from the database, replacing the current contents."""
+        from .models import Company, Domain, InternshipApplication
+
+        # Canonical names come from the small dimension tables rather than a join per row
+        company_names = dict(Company.objects.values_list('pk', 'name'))
+        domain_names = dict(Domain.objects.values_list('pk', 'name'))
+        rows = list(InternshipApplication.objects.values_list(
+            'application_id', 'domain_id', 'company_id', 'student__department',
+            'application_status', 'start_date', 'internship_domain', 'company_name',
+        ).order_by().iterator(chunk_size=5000))
+
+        with self._lock:
+            self._reset(max(INITIAL_CAPACITY, len(rows)))
+            if rows:
+                ids, domain_ids, company_ids, departments, statuses, starts, raw_domains, raw_companies = zip(*rows)
+                # Rows not yet backfilled fall back to their free-text name
+                domains = [domain_names.get(pk, raw) for pk, raw in zip(domain_ids, raw_domains)]
+                companies = [company_names.get(pk, raw) for pk, raw in zip(company_ids, raw_companies)]
+                for dim, values in zip(DIMENSIONS[:4], (domains, companies, departments, statuses)):
+                    labels, inverse = np.unique(np.array(values, dtype=object), return_inverse=True)
+                    self._load_dimension(dim, labels.tolist(), inverse)
+                ordinals = np.fromiter((d.toordinal() for d in starts), dtype=np.int32, count=len(rows))
+                months = np.fromiter((month_code(d) for d in starts), dtype=np.int32, count=len(rows))
+                labels, inverse = np.unique(months, return_inverse=True)
+                self._load_dimension('month', labels.tolist(), inverse)
+                self.start[:len(rows)] = ordinals
+                self.live[:len(rows)] = True
+                self.rows = {pk: i for i, pk in enumerate(ids)}
+                self.size = len(rows)
+            self.built_at = time.monotonic()
+
+    def _load_dimension(self, dim, labels, inverse):
+        self.labels[dim] = labels
+        self.codes[dim] = {label: code for code, label in enumerate(labels)}
+        self.columns[dim][:len(inverse)] = inverse
+
+    def _code(self, dim, label):
+        codes = self.codes[dim]
+        if label not in codes:
+            codes[label] = len(self.labels[dim])
+            self.labels[dim].append(label)
+        return codes[label]
+
+    def _grow(self):
+        capacity = len(self.live) * 2
+        for dim in DIMENSIONS:
+            self.columns[dim] = np.resize(self.columns[dim], capacity)
+        self.start = np.resize(self.start, capacity)
+        self.live = np.concatenate([self.live, np.zeros(capacity - len(self.live), dtype=bool)])
+
+    def upsert(self, application_id, domain, company, department, status, start_date):
+        with self._lock:
+            if self.built_at is None:
+                return
+            row = self.rows.get(application_id)
+            if row is None:
+                if self.size == len(self.live):
+                    self._grow()
+                row = self.size
+                self.size += 1
+                self.rows[application_id] = row
+            values = (domain, company, department, status, month_code(start_date))
+            for dim, value in zip(DIMENSIONS, values):
+                self.columns[dim][row] = self._code(dim, value)
+            self.start[row] = start_date.toordinal()
+            self.live[row] = True
+
+    def remove(self, application_id):
+        with self._lock:
+            row = self.rows.pop(application_id, None)
+            if row is not None:
+                self.live[row] = False
+
+    def ensure_fresh(self):
+        ttl = getattr(settings, 'ANALYTICS_CUBE_TTL_SECONDS', 300)
+        if self.built_at is None or time.monotonic() - self.built_at > ttl:
+            self.build()
+
+    # Queries
+
+    def _mask(self, department=None, status=None, date_from=None, date_to=None, **filters):
+        n = self.size
+        mask = self.live[:n].copy()
+        filters.update(department=department, application_status=status)
+        for dim, value in filters.items():
+            if value is None or value == '':
+                continue
+            code = self.codes[dim].get(value)
+            if code is None:
+                return np.zeros(n, dtype=bool)
+            mask &= self.columns[dim][:n] == code
+        if date_from:
+            mask &= self.start[:n] >= date_from.toordinal()
+        if date_to:
+            mask &= self.start[:n] <= date_to.toordinal()
+        return mask
+
+    def count(self, **filters):
+        self.ensure_fresh()
+        with self._lock:
+            return int(np.count_nonzero(self._mask(**filters)))
+
+    def rollup(self, *by, limit=None, **filters):
+        """Count applications grouped by one or more dimensions.
+
+        Filters are ``department``, ``status``, ``date_from``/``date_to``
+        (dates, inclusive, on ``start_date``) or any dimension name. Returns
+        a list of dicts keyed by the dimension names plus ``count``, ordered
+        by count descending, shaped like a ``values().annotate()`` result.
+        """
+        self.ensure_fresh()
+        with self._lock:
+            mask = self._mask(**filters)
+            sizes = [len(self.labels[dim]) for dim in by]
+            if not all(sizes):
+                return []
+            flat = np.ravel_multi_index(
+                [self.columns[dim][:self.size][mask].astype(np.int64) for dim in by], sizes
+            )
+            if np.prod(sizes, dtype=np.int64) <= DENSE_CELL_LIMIT:
+                counts = np.bincount(flat, minlength=int(np.prod(sizes)))
+                cells = np.flatnonzero(counts)
+                counts = counts[cells]
+            else:
+                # Sparse cross-tabs (e.g. company x month) would need a huge dense array
+                cells, counts = np.unique(flat, return_counts=True)
+            # Stable sort keeps ties in label order
+            order = np.argsort(-counts, kind='stable')[:limit]
+            cells, counts = cells[order], counts[order]
+            keys = np.unravel_index(cells, sizes)
+            labels = [self.labels[dim] for dim in by]
+
+        result = []
+        for i, count in enumerate(counts.tolist()):
+            item = {}
+            for dim, dim_labels, codes in zip(by, labels, keys):
+                label = dim_labels[codes[i]]
+                item[dim] = month_label(label) if dim == 'month' else label
+            item['count'] = count
+            result.append(item)
+        return result
+
+
+cube = ApplicationCube()
+
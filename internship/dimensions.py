@@ -0,0 +1,91 @@
+"""Resolution of free-text company and domain names to their dimension rows."""
+
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+
+from .models import (COMPANY_SUFFIXES, Company, CompanyAlias, Domain, DomainAlias, InternshipApplication,
+                     normalize_key)
+
+# field on InternshipApplication -> (raw text field, dimension model, alias model, alias FK, key suffixes)
+DIMENSIONS = {
+    'company': ('company_name', Company, CompanyAlias, 'company', COMPANY_SUFFIXES),
+    'domain': ('internship_domain', Domain, DomainAlias, 'domain', ()),
+}
+
+
+def resolve(dimension, name):
+    """Return the dimension row for ``name``, creating it when the key is new."""
+    _, model, alias_model, alias_fk, suffixes = DIMENSIONS[dimension]
+    key = normalize_key(name, suffixes)
+    alias = alias_model.objects.select_related(alias_fk).filter(alias_key=key).first()
+    if alias:
+        return getattr(alias, alias_fk)
+    try:
+        with transaction.atomic():
+            obj, _ = model.objects.get_or_create(normalized_key=key, defaults={'name': name.strip()})
+    except IntegrityError:
+        # Created concurrently by another request
+        obj = model.objects.get(normalized_key=key)
+    return obj
+
+
+def key_lookup(dimension):
+    """normalized key -> dimension pk, aliases included."""
+    _, model, alias_model, alias_fk, _ = DIMENSIONS[dimension]
+    lookup = dict(model.objects.values_list('normalized_key', 'pk'))
+    lookup.update(alias_model.objects.values_list('alias_key', f'{alias_fk}_id'))
+    return lookup
+
+
+def add_alias(dimension, alias, canonical):
+    """Map ``alias`` onto the dimension row for ``canonical``, creating it if needed."""
+    _, _, alias_model, alias_fk, suffixes = DIMENSIONS[dimension]
+    target = resolve(dimension, canonical)
+    alias_row = alias_model.objects.filter(alias_key=normalize_key(alias, suffixes)).first()
+    alias_row = alias_row or alias_model()
+    alias_row.alias = alias
+    setattr(alias_row, alias_fk, target)
+    alias_row.save()
+    return alias_row
+
+
+def backfill(dimension, only_missing=True, batch_size=200):
+    """Point applications at their dimension rows.
+
+    Distinct raw names are normalized once in Python. Missing dimension rows
+    are bulk-created, using the most common spelling of each key as its name.
+    Each distinct name then gets a single UPDATE, committed every
+    ``batch_size`` names. Returns (dimension rows created, applications updated).
+    """
+    raw_field, model, _, _, suffixes = DIMENSIONS[dimension]
+    applications = InternshipApplication.objects.all()
+    if only_missing:
+        applications = applications.filter(**{f'{dimension}__isnull': True})
+
+    spellings = Counter(dict(
+        applications.values_list(raw_field).annotate(n=Count('pk')).order_by()
+    ))
+    lookup = key_lookup(dimension)
+
+    new_names = {}
+    for name, _ in spellings.most_common():
+        key = normalize_key(name, suffixes)
+        if key not in lookup and key not in new_names:
+            new_names[key] = name.strip()
+    model.objects.bulk_create([model(name=name, normalized_key=key) for key, name in new_names.items()],
+                              ignore_conflicts=True)
+    if new_names:
+        lookup = key_lookup(dimension)
+
+    updated = 0
+    names = list(spellings)
+    for start in range(0, len(names), batch_size):
+        with transaction.atomic():
+            for name in names[start:start + batch_size]:
+                updated += applications.filter(**{raw_field: name}).update(
+                    **{f'{dimension}_id': lookup[normalize_key(name, suffixes)]}
+                )
+    return len(new_names), updated
+
@@ -0,0 +1,267 @@
+"""Detailed data exports built from streaming querysets.
+
+Rows are pulled from ``.iterator()`` in chunks and written out one at a time,
+so memory use stays flat no matter how many rows are exported. On PostgreSQL
+``.iterator()`` reads through a server-side cursor, so the first row is sent
+before the rest of the result set has been fetched.
+"""
+
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+from .models import UserProfile, InternshipApplication, WeeklyLog, InternshipCompletion, ProgressProof
+
+ITERATOR_CHUNK_SIZE = 2000
+
+# (row key, column header) for the per-application detail export
+APPLICATION_DETAIL_COLUMNS = [
+    ('application_id', 'Application ID'),
+    ('register_number', 'Register Number'),
+    ('student_name', 'Student'),
+    ('department', 'Department'),
+    ('faculty_name', 'Assigned Faculty'),
+    ('company_name', 'Company'),
+    ('internship_domain', 'Domain'),
+    ('application_status', 'Status'),
+    ('start_date', 'Start Date'),
+    ('end_date', 'End Date'),
+    ('weeks_submitted', 'Weeks Submitted'),
+    ('weeks_reviewed', 'Weeks Reviewed'),
+    ('proofs_total', 'Proofs'),
+    ('proofs_verified', 'Proofs Verified'),
+    ('completion_score', 'Completion Score'),
+]
+
+
+def count_per_application(model, **filters):
+    """Correlated COUNT(*) subquery keyed on the outer application."""
+    counts = model.objects.filter(application=OuterRef('pk'), **filters).order_by().values(
+        'application'
+    ).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def application_detail_queryset(queryset=None):
+    """Annotate applications with every column of the detail export as a values() queryset.
+
+    Counts come from correlated subqueries rather than joins, so one row per
+    application is returned without multiplying logs by proofs.
+    """
+    if queryset is None:
+        queryset = InternshipApplication.objects.all()
+    return queryset.annotate(
+        weeks_submitted=count_per_application(WeeklyLog),
+        weeks_reviewed=count_per_application(WeeklyLog, review_status='reviewed'),
+        proofs_total=count_per_application(ProgressProof),
+        proofs_verified=count_per_application(ProgressProof, verification_status='verified'),
+    ).values(
+        'application_id',
+        'company_name',
+        'internship_domain',
+        'application_status',
+        'start_date',
+        'end_date',
+        'weeks_submitted',
+        'weeks_reviewed',
+        'proofs_total',
+        'proofs_verified',
+        register_number=Coalesce('student__register_number', Value('')),
+        student_name=F('student__full_name'),
+        department=F('student__department'),
+        faculty_name=Coalesce('assigned_faculty__full_name', Value('')),
+        completion_score=F('completion__completion_score'),
+    ).order_by('student__department', 'student__full_name', 'application_id')
+
+
+def iter_application_rows(queryset=None, chunk_size=ITERATOR_CHUNK_SIZE):
+    """Yield one dict per application, ordered by department."""
+    yield from application_detail_queryset(queryset).iterator(chunk_size=chunk_size)
+
+
+def _header_row(sheet, headers):
+    bold = Font(bold=True)
+    cells = []
+    for header in headers:
+        cell = WriteOnlyCell(sheet, value=header)
+        cell.font = bold
+        cells.append(cell)
+    return cells
+
+
+def write_detail_workbook(output, rows, summaries=()):
+    """Write an .xlsx to ``output`` using openpyxl's write-only mode.
+
+    ``summaries`` is a sequence of (sheet title, headers, rows) written first.
+    ``rows`` must be ordered by department; each department gets its own sheet,
+    started as soon as the department changes so only one row is held at a time.
+    Returns the number of detail rows written.
+    """
+    workbook = Workbook(write_only=True)
+    department_names = dict(UserProfile.DEPARTMENT_CHOICES)
+    status_names = dict(InternshipApplication.STATUS_CHOICES)
+    keys = [key for key, _ in APPLICATION_DETAIL_COLUMNS]
+    headers = [header for _, header in APPLICATION_DETAIL_COLUMNS]
+    department_col = keys.index('department')
+    status_col = keys.index('application_status')
+
+    for title, summary_headers, summary_rows in summaries:
+        sheet = workbook.create_sheet(title)
+        sheet.append(_header_row(sheet, summary_headers))
+        for row in summary_rows:
+            sheet.append(row)
+
+    sheet = None
+    current_department = None
+    written = 0
+    for row in rows:
+        department = row['department'] or 'Unassigned'
+        if sheet is None or department != current_department:
+            current_department = department
+            # Department codes are short and free of characters Excel forbids in sheet names
+            sheet = workbook.create_sheet(department[:31])
+            sheet.append(_header_row(sheet, headers))
+        values = [row[key] for key in keys]
+        values[department_col] = department_names.get(row['department'], row['department'])
+        values[status_col] = status_names.get(row['application_status'], row['application_status'])
+        sheet.append(values)
+        written += 1
+
+    if not workbook.worksheets:
+        workbook.create_sheet('Applications').append(headers)
+    workbook.save(output)
+    return written
+
+
+# Raw data exports: column name -> ORM path, plus the fields used for filtering.
+# Proof exports carry metadata only, never the stored file bytes.
+EXPORT_DATASETS = {
+    'applications': {
+        'model': InternshipApplication,
+        'columns': {
+            'application_id': 'application_id',
+            'register_number': 'student__register_number',
+            'student_name': 'student__full_name',
+            'department': 'student__department',
+            'faculty_name': 'assigned_faculty__full_name',
+            'company_name': 'company_name',
+            'internship_domain': 'internship_domain',
+            'internship_mode': 'internship_mode',
+            'application_status': 'application_status',
+            'start_date': 'start_date',
+            'end_date': 'end_date',
+            'approval_date': 'approval_date',
+            'created_at': 'created_at',
+        },
+        'status_field': 'application_status',
+        'date_field': 'start_date',
+    },
+    'weekly-logs': {
+        'model': WeeklyLog,
+        'columns': {
+            'log_id': 'log_id',
+            'application_id': 'application_id',
+            'register_number': 'student__register_number',
+            'student_name': 'student__full_name',
+            'department': 'student__department',
+            'week_number': 'week_number',
+            'description': 'description',
+            'submission_date': 'submission_date',
+            'review_status': 'review_status',
+            'reviewed_by_name': 'reviewed_by__full_name',
+            'review_date': 'review_date',
+            'hours_worked': 'hours_worked',
+        },
+        'status_field': 'review_status',
+        'date_field': 'submission_date',
+    },
+    'proofs': {
+        'model': ProgressProof,
+        'columns': {
+            'proof_id': 'proof_id',
+            'application_id': 'application_id',
+            'register_number': 'student__register_number',
+            'student_name': 'student__full_name',
+            'department': 'student__department',
+            'proof_type': 'proof_type',
+            'title': 'title',
+            'proof_file_name': 'proof_file_name',
+            'proof_file_type': 'proof_file_type',
+            'submission_date': 'submission_date',
+            'verification_status': 'verification_status',
+            'verified_by_name': 'verified_by__full_name',
+            'verification_date': 'verification_date',
+        },
+        'status_field': 'verification_status',
+        'date_field': 'submission_date',
+    },
+    'completions': {
+        'model': InternshipCompletion,
+        'columns': {
+            'completion_id': 'completion_id',
+            'application_id': 'application_id',
+            'register_number': 'student__register_number',
+            'student_name': 'student__full_name',
+            'department': 'student__department',
+            'total_duration': 'total_duration',
+            'completion_status': 'completion_status',
+            'faculty_verification_status': 'faculty_verification_status',
+            'completion_score': 'completion_score',
+            'verification_date': 'verification_date',
+            'created_at': 'created_at',
+        },
+        'status_field': 'faculty_verification_status',
+        'date_field': 'created_at',
+    },
+}
+
+
+def export_queryset(dataset, columns, department=None, status=None, date_from=None, date_to=None):
+    """Build the values() queryset for a raw data export.
+
+    ``columns`` must already be validated against ``EXPORT_DATASETS[dataset]``.
+    """
+    spec = EXPORT_DATASETS[dataset]
+    model = spec['model']
+    queryset = model.objects.all()
+
+    if department:
+        queryset = queryset.filter(student__department=department)
+    if status:
+        queryset = queryset.filter(**{spec['status_field']: status})
+    date_lookup = spec['date_field']
+    if model._meta.get_field(date_lookup).get_internal_type() == 'DateTimeField':
+        date_lookup += '__date'
+    if date_from:
+        queryset = queryset.filter(**{f'{date_lookup}__gte': date_from})
+    if date_to:
+        queryset = queryset.filter(**{f'{date_lookup}__lte': date_to})
+
+    plain = [name for name in columns if spec['columns'][name] == name]
+    renamed = {name: F(spec['columns'][name]) for name in columns if spec['columns'][name] != name}
+    return queryset.values(*plain, **renamed).order_by('pk')
+
+
+class Echo:
+    """File-like object whose write() hands the written value straight back."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows, columns, chunk_size=ITERATOR_CHUNK_SIZE):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield writer.writerow([row[name] for name in columns])
+
+
+def stream_ndjson(rows, columns, chunk_size=ITERATOR_CHUNK_SIZE):
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield json.dumps({name: row[name] for name in columns}, cls=DjangoJSONEncoder) + '\n'
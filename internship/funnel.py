@@ -0,0 +1,109 @@
+"""Cohort funnel: applied -> approved -> weeks submitted -> weeks reviewed -> completion submitted -> verified.
+
+Every stage for every cohort comes from one grouped query over
+InternshipApplication, using conditional COUNTs and EXISTS subqueries so no
+join multiplies rows. Results are cached; saving or deleting an application,
+weekly log or completion bumps a version number that is part of every cache
+key. No CACHES are configured, so the cache is Django's per-process
+LocMemCache and the bump only reaches the process that made the change:
+other server processes keep serving their funnel for up to
+``FUNNEL_CACHE_SECONDS``. A shared cache backend would invalidate them all.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from .exports import count_per_application
+from .models import UserProfile, InternshipApplication, WeeklyLog
+
+# (key, label); each stage counts applications that reached it
+FUNNEL_STAGES = [
+    ('applied', 'Applied'),
+    ('approved', 'Approved'),
+    ('weeks_submitted', 'Weeks Submitted'),
+    ('weeks_reviewed', 'Weeks Reviewed'),
+    ('completion_submitted', 'Completion Submitted'),
+    ('verified', 'Verified'),
+]
+# Cohort name -> grouping expression
+COHORTS = {
+    'department': F('student__department'),
+    'intake': TruncMonth('start_date'),
+}
+VERSION_KEY = 'funnel:version'
+
+
+def _logs(**filters):
+    return WeeklyLog.objects.filter(application=OuterRef('pk'), **filters)
+
+
+def funnel_queryset(by='department', department=None, date_from=None, date_to=None):
+    applications = InternshipApplication.objects.all()
+    if department:
+        applications = applications.filter(student__department=department)
+    if date_from:
+        applications = applications.filter(start_date__gte=date_from)
+    if date_to:
+        applications = applications.filter(start_date__lte=date_to)
+
+    return applications.values(cohort=COHORTS[by]).annotate(
+        applied=Count('pk'),
+        approved=Count('pk', filter=Q(application_status='approved')),
+        weeks_submitted=Count('pk', filter=Q(Exists(_logs()))),
+        weeks_reviewed=Count('pk', filter=Q(Exists(_logs(review_status='reviewed')))),
+        completion_submitted=Count('completion'),
+        verified=Count('completion', filter=Q(completion__faculty_verification_status='verified')),
+        total_weeks_submitted=Sum(count_per_application(WeeklyLog)),
+        total_weeks_reviewed=Sum(count_per_application(WeeklyLog, review_status='reviewed')),
+    ).order_by('cohort')
+
+
+def _with_rates(row):
+    applied = row['applied'] or 0
+    row['stages'] = [
+        {'key': key, 'label': label, 'count': row[key],
+         'percent': round(row[key] / applied * 100, 1) if applied else 0.0}
+        for key, label in FUNNEL_STAGES
+    ]
+    return row
+
+
+def compute_funnel(by='department', department=None, date_from=None, date_to=None):
+    department_names = dict(UserProfile.DEPARTMENT_CHOICES)
+    rows = []
+    total = {key: 0 for key, _ in FUNNEL_STAGES}
+    total.update(total_weeks_submitted=0, total_weeks_reviewed=0)
+    for row in funnel_queryset(by, department, date_from, date_to):
+        cohort = row.pop('cohort')
+        if by == 'intake':
+            row['cohort'] = cohort.strftime('%Y-%m') if cohort else 'Unknown'
+        else:
+            row['cohort'] = department_names.get(cohort, cohort)
+        row['total_weeks_submitted'] = row['total_weeks_submitted'] or 0
+        row['total_weeks_reviewed'] = row['total_weeks_reviewed'] or 0
+        for key in total:
+            total[key] += row[key]
+        rows.append(_with_rates(row))
+    total['cohort'] = 'All'
+    return {'by': by, 'stages': FUNNEL_STAGES, 'rows': rows, 'total': _with_rates(total)}
+
+
+def cohort_funnel(by='department', department=None, date_from=None, date_to=None):
+    """Cached ``compute_funnel``."""
+    version = cache.get_or_set(VERSION_KEY, 1, None)
+    key = f'funnel:{version}:{by}:{department or ""}:{date_from or ""}:{date_to or ""}'
+    result = cache.get(key)
+    if result is None:
+        result = compute_funnel(by, department, date_from, date_to)
+        cache.set(key, result, getattr(settings, 'FUNNEL_CACHE_SECONDS', 600))
+    return result
+
+
+def invalidate_funnel():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # No version stored yet, so nothing cached under it either
+        pass
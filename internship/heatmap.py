@@ -0,0 +1,134 @@
+"""Department x internship-week heatmap of weekly-log submissions.
+
+Counts come from one grouped query over (department, week_number,
+review_status), scattered into a dense NumPy matrix with ``np.add.at`` and
+rendered as inline SVG or a matplotlib PNG. Rendered output is cached for
+``HEATMAP_CACHE_SECONDS``.
+"""
+
+import io
+from xml.sax.saxutils import escape
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import UserProfile, WeeklyLog
+
+REVIEW_STATUSES = [code for code, _ in WeeklyLog.REVIEW_STATUS_CHOICES]
+HEATMAP_FORMATS = ('svg', 'png')
+
+# SVG geometry (px)
+CELL_SIZE = 26
+LABEL_WIDTH = 90
+HEADER_HEIGHT = 40
+LOW_COLOR = (241, 248, 233)
+HIGH_COLOR = (27, 94, 32)
+
+
+def submission_matrix():
+    """Return (department codes, week numbers, counts) with counts shaped (departments, weeks, statuses)."""
+    rows = list(WeeklyLog.objects.values_list('student__department', 'week_number', 'review_status').annotate(
+        n=Count('pk')
+    ).order_by())
+    if not rows:
+        return [], [], np.zeros((0, 0, len(REVIEW_STATUSES)), dtype=np.int64)
+
+    departments, weeks, statuses, counts = zip(*rows)
+    department_codes, department_index = np.unique(np.array(departments, dtype=object), return_inverse=True)
+    weeks = np.array(weeks, dtype=np.int64)
+    first_week = min(weeks.min(), 1)
+    week_numbers = np.arange(first_week, weeks.max() + 1)
+    status_index = np.array([REVIEW_STATUSES.index(s) if s in REVIEW_STATUSES else 0 for s in statuses])
+
+    matrix = np.zeros((len(department_codes), len(week_numbers), len(REVIEW_STATUSES)), dtype=np.int64)
+    np.add.at(matrix, (department_index, weeks - first_week, status_index), counts)
+    return department_codes.tolist(), week_numbers.tolist(), matrix
+
+
+def _cell_color(fraction):
+    rgb = [round(low + (high - low) * fraction) for low, high in zip(LOW_COLOR, HIGH_COLOR)]
+    return '#{:02x}{:02x}{:02x}'.format(*rgb)
+
+
+def render_heatmap_svg(departments, weeks, totals, reviewed):
+    department_names = dict(UserProfile.DEPARTMENT_CHOICES)
+    width = LABEL_WIDTH + CELL_SIZE * len(weeks) + 10
+    height = HEADER_HEIGHT + CELL_SIZE * len(departments) + 10
+    peak = totals.max() if totals.size else 0
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" class="img-fluid" '
+        f'role="img" font-family="sans-serif" font-size="10">',
+        '<title>Weekly log submissions by department and week</title>',
+    ]
+    for j, week in enumerate(weeks):
+        x = LABEL_WIDTH + j * CELL_SIZE + CELL_SIZE / 2
+        parts.append(f'<text x="{x:.1f}" y="{HEADER_HEIGHT - 8}" text-anchor="middle">W{week}</text>')
+    for i, code in enumerate(departments):
+        y = HEADER_HEIGHT + i * CELL_SIZE
+        parts.append(
+            f'<text x="{LABEL_WIDTH - 6}" y="{y + CELL_SIZE / 2 + 3:.1f}" text-anchor="end">'
+            f'<title>{escape(department_names.get(code, code))}</title>{escape(code)}</text>'
+        )
+        for j, week in enumerate(weeks):
+            count = int(totals[i, j])
+            fill = _cell_color(count / peak) if peak else _cell_color(0)
+            x = LABEL_WIDTH + j * CELL_SIZE
+            parts.append(
+                f'<rect x="{x}" y="{y}" width="{CELL_SIZE - 1}" height="{CELL_SIZE - 1}" fill="{fill}">'
+                f'<title>{escape(code)} week {week}: {count} submitted, {int(reviewed[i, j])} reviewed</title></rect>'
+            )
+            if count:
+                text_fill = '#fff' if count / peak > 0.5 else '#333'
+                parts.append(
+                    f'<text x="{x + CELL_SIZE / 2:.1f}" y="{y + CELL_SIZE / 2 + 3:.1f}" text-anchor="middle" '
+                    f'fill="{text_fill}" pointer-events="none">{count}</text>'
+                )
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+def render_heatmap_png(departments, weeks, totals):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(max(6, len(weeks) * 0.45 + 2), max(3, len(departments) * 0.4 + 1.5)))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    image = ax.imshow(totals, cmap='Greens', aspect='auto')
+    ax.set_xticks(range(len(weeks)))
+    ax.set_xticklabels([f'W{week}' for week in weeks], fontsize=8)
+    ax.set_yticks(range(len(departments)))
+    ax.set_yticklabels(departments, fontsize=8)
+    ax.set_xlabel('Internship Week')
+    ax.set_title('Weekly Log Submissions')
+    fig.colorbar(image, ax=ax, label='Submissions')
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=100)
+    return buffer.getvalue()
+
+
+def compute_heatmap(fmt='svg', status=None):
+    departments, weeks, matrix = submission_matrix()
+    reviewed = matrix[:, :, REVIEW_STATUSES.index('reviewed')]
+    totals = matrix[:, :, REVIEW_STATUSES.index(status)] if status else matrix.sum(axis=2)
+    if fmt == 'png':
+        content = render_heatmap_png(departments, weeks, totals) if departments else None
+    else:
+        content = render_heatmap_svg(departments, weeks, totals, reviewed) if departments else None
+    return {
+        'content': content,
+        'departments': len(departments),
+        'weeks': len(weeks),
+        'total': int(totals.sum()),
+    }
+
+
+def submission_heatmap(fmt='svg', status=None):
+    """Cached ``compute_heatmap``; ``status`` limits the counts to one review status."""
+    key = f'heatmap:{fmt}:{status or "all"}'
+    return cache.get_or_set(key, lambda: compute_heatmap(fmt, status),
+                            getattr(settings, 'HEATMAP_CACHE_SECONDS', 300))
@@ -0,0 +1,135 @@
+"""Chunked, resumable CSV ingestion for the loader management commands.
+
+Rows are streamed from the CSV in fixed-size chunks and each chunk is handed
+to a callback inside its own transaction. After every committed chunk a JSON
+checkpoint records the byte offset just past it, the chunk number and the
+rows done, so a run that dies halfway can be continued with ``--resume``
+instead of starting over. A chunk that committed just before a crash, but
+whose checkpoint wasn't written, is replayed; callbacks should therefore
+insert with ``ignore_conflicts`` or otherwise tolerate seeing a chunk twice.
+"""
+
+import csv
+import json
+import os
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def default_checkpoint_path(name):
+    return os.path.join(settings.INGEST_CHECKPOINT_DIR, f'{name}.json')
+
+
+class Checkpoint:
+    """Per-stage progress of one loader run, persisted as JSON"""
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.state = {}
+        if resume and os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                self.state = json.load(file)
+
+    def __bool__(self):
+        return bool(self.state)
+
+    def get(self, stage):
+        return self.state.get(stage)
+
+    def save(self, stage, **values):
+        self.state[stage] = values
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        # Write then rename so a crash never leaves a half-written checkpoint
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.state, file)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        self.state = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _lines(file):
+    for line in iter(file.readline, b''):
+        yield line.decode('utf-8')
+
+
+def read_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, offset=0):
+    """Yield (rows, end offset) for each chunk of the CSV, starting at byte ``offset`` (0 = first data row).
+
+    The file is read in binary with ``readline`` so ``tell()`` stays usable;
+    csv pulls lines one at a time, so the offset after a chunk is exactly the
+    end of its last record even when quoted fields span lines.
+    """
+    with open(path, 'rb') as file:
+        fieldnames = next(csv.reader([file.readline().decode('utf-8-sig')]))
+        if offset:
+            file.seek(offset)
+        chunk = []
+        for row in csv.DictReader(_lines(file), fieldnames=fieldnames):
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield chunk, file.tell()
+                chunk = []
+        if chunk:
+            yield chunk, file.tell()
+
+
+def _duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f'{minutes}m{seconds:02d}s' if minutes else f'{seconds}s'
+
+
+class ChunkedCSVIngest:
+    """Feed one CSV through ``process_chunk(rows, first_row)`` chunk by chunk, checkpointing as it goes"""
+
+    def __init__(self, path, stage, checkpoint, chunk_size=DEFAULT_CHUNK_SIZE, report=print):
+        self.path = path
+        self.stage = stage
+        self.checkpoint = checkpoint
+        self.chunk_size = chunk_size
+        self.report = report
+
+    def run(self, process_chunk):
+        """Process the remaining chunks; returns the number of rows handled in this run"""
+        stat = os.stat(self.path)
+        source = {'size': stat.st_size, 'mtime': stat.st_mtime}
+        state = self.checkpoint.get(self.stage)
+        if state and {key: state.get(key) for key in source} != source:
+            self.report(f'  {self.stage}: CSV changed since the checkpoint, starting this stage over')
+            state = None
+        if state and state.get('done'):
+            self.report(f'  {self.stage}: already loaded ({state["rows"]} rows), skipping')
+            return 0
+
+        offset = state['offset'] if state else 0
+        chunk_number = state['chunk'] if state else 0
+        rows_done = state['rows'] if state else 0
+        if offset:
+            self.report(f'  {self.stage}: resuming at chunk {chunk_number + 1} (row {rows_done + 1})')
+
+        start = time.perf_counter()
+        start_offset = offset
+        rows_this_run = 0
+        for rows, offset in read_chunks(self.path, self.chunk_size, offset):
+            with transaction.atomic():
+                process_chunk(rows, rows_done)
+            chunk_number += 1
+            rows_done += len(rows)
+            rows_this_run += len(rows)
+            self.checkpoint.save(self.stage, offset=offset, chunk=chunk_number, rows=rows_done, **source)
+
+            elapsed = time.perf_counter() - start
+            rate = rows_this_run / elapsed if elapsed else 0.0
+            # Bytes are a better progress measure than rows: the row count isn't known up front
+            eta = elapsed / (offset - start_offset) * (source['size'] - offset)
+            self.report(f'  {self.stage}: chunk {chunk_number}, {rows_done} rows, {rate:.0f} rows/s, ETA {_duration(eta)}')
+
+        self.checkpoint.save(self.stage, offset=offset, chunk=chunk_number, rows=rows_done, done=True, **source)
+        return rows_this_run
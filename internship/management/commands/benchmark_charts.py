@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from concurrent.futures import ThreadPoolExecutor
+import json
+import subprocess
+import sys
+import time
+
+from internship.charts import CHART_MODES, render_bar_chart_png
+
+# Runs in a fresh interpreter per mode so import cost and RSS are measured cleanly
+MODE_PROBE = '''
+import json, resource, sys, time
+mode, runs = sys.argv[1], int(sys.argv[2])
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+from internship.charts import build_chart
+data = [{'company_name': f'Company {n}', 'count': 50 - n * 3} for n in range(10)]
+chart = build_chart(data, 'company_name', 'Top 10 Companies', mode=mode)
+first = time.perf_counter() - start
+start = time.perf_counter()
+for _ in range(runs):
+    chart = build_chart(data, 'company_name', 'Top 10 Companies', mode=mode)
+steady = (time.perf_counter() - start) / runs
+content = chart['content']
+payload = json.dumps(content) if isinstance(content, dict) else content
+print(json.dumps({
+    'first_s': first,
+    'render_ms': steady * 1000,
+    'payload_bytes': len(payload.encode('utf-8')),
+    'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before,
+}))
+'''
+
+
+class Command(BaseCommand):
+    help = 'Benchmark analytics chart rendering: output modes and serial vs threaded PNG throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--charts', type=int, default=100, help='Number of charts to render per run')
+        parser.add_argument('--threads', type=int, default=8, help='Worker threads for the threaded run')
+        parser.add_argument('--skip-threads', action='store_true', help='Only compare output modes')
+
+    def handle(self, *args, **options):
+        self.compare_modes(options['charts'])
+        if not options['skip_threads']:
+            self.compare_threads(options['charts'], options['threads'])
+
+    def compare_modes(self, runs):
+        self.stdout.write(f'Output modes ({runs} renders each, fresh process per mode)')
+        self.stdout.write(f'  {"mode":<6}{"first render":>14}{"per render":>13}{"payload":>12}{"added RSS":>12}')
+        for mode in CHART_MODES:
+            result = subprocess.run(
+                [sys.executable, '-c', MODE_PROBE, mode, str(runs)],
+                cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+            )
+            stats = json.loads(result.stdout.strip().splitlines()[-1])
+            self.stdout.write(
+                f'  {mode:<6}{stats["first_s"] * 1000:>11.0f} ms{stats["render_ms"]:>10.2f} ms'
+                f'{stats["payload_bytes"] / 1024:>9.1f} KB{stats["rss_kb"] / 1024:>9.1f} MB'
+            )
+
+    def compare_threads(self, total, threads):
+        labels = [f'Company {n}' for n in range(10)]
+
+        def render(i):
+            counts = [(i * 7 + n * 3) % 50 + 1 for n in range(10)]
+            return render_bar_chart_png(labels, counts, f'Chart {i}', 'Company Name')
+
+        # Warm up font cache so it doesn't skew the first run
+        render(0)
+
+        start = time.perf_counter()
+        for i in range(total):
+            render(i)
+        serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(render, range(total)))
+        threaded = time.perf_counter() - start
+
+        self.stdout.write(f'\nPNG rendering, {total} charts per run')
+        self.stdout.write(f'  Serial:     {serial:.2f}s ({total / serial:.1f} charts/s)')
+        self.stdout.write(f'  {threads} threads:  {threaded:.2f}s ({total / threaded:.1f} charts/s)')
+        self.stdout.write(self.style.SUCCESS(f'✓ Speedup: {serial / threaded:.2f}x'))
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+from datetime import date, timedelta
+from decimal import Decimal
+import os
+import tempfile
+import time
+import tracemalloc
+
+from internship.exports import write_detail_workbook
+from internship.models import UserProfile
+
+
+def synthetic_rows(count):
+    """Yield detail-export rows in department order without touching the database."""
+    departments = sorted(code for code, _ in UserProfile.DEPARTMENT_CHOICES)
+    per_department = max(1, count // len(departments))
+    for i in range(count):
+        department = departments[min(i // per_department, len(departments) - 1)]
+        start = date(2025, 9, 1) + timedelta(days=i % 56)
+        yield {
+            'application_id': i + 1,
+            'register_number': f'8230{i:08d}',
+            'student_name': f'Student {i}',
+            'department': department,
+            'faculty_name': f'Dr.Faculty {i % 400}',
+            'company_name': f'Company {i % 55}',
+            'internship_domain': f'Role {i % 120}',
+            'application_status': 'approved',
+            'start_date': start,
+            'end_date': start + timedelta(days=90),
+            'weeks_submitted': i % 12,
+            'weeks_reviewed': i % 9,
+            'proofs_total': i % 5,
+            'proofs_verified': i % 3,
+            'completion_score': Decimal('72.50'),
+        }
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the write-only Excel detail export at several row counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='1000,10000,100000',
+            help='Comma-separated row counts to benchmark (default: 1000,10000,100000)',
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        self.stdout.write(f'{"rows":>10}{"time":>10}{"rows/s":>12}{"peak mem":>12}{"file size":>12}')
+
+        for size in sizes:
+            with tempfile.TemporaryFile() as output:
+                tracemalloc.start()
+                start = time.perf_counter()
+                written = write_detail_workbook(output, synthetic_rows(size))
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                file_size = output.seek(0, os.SEEK_END)
+
+            self.stdout.write(
+                f'{written:>10}{elapsed:>9.2f}s{written / elapsed:>12.0f}'
+                f'{peak / 1024 / 1024:>10.1f}MB{file_size / 1024 / 1024:>10.1f}MB'
+            )
+
+        self.stdout.write(self.style.SUCCESS('✓ Peak memory should stay flat as row count grows'))
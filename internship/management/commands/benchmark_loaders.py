@@ -0,0 +1,152 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import CharField, Value
+from django.db.models.functions import Cast, Concat
+from django.test.utils import override_settings
+from datetime import datetime
+from io import StringIO
+import json
+import os
+import platform
+import shutil
+import tempfile
+
+import numpy as np
+
+from internship.benchmarks import StageRecorder
+from internship.models import UserProfile, InternshipApplication, WeeklyLog, ProgressProof, InternshipCompletion
+
+COMMANDS = ['load_csv_to_db', 'migrate_files_to_db', 'load_sample_data', 'load_hicas_data']
+# Size of the placeholder offer letters written for migrate_files_to_db
+OFFER_LETTER_BYTES = 64 * 1024
+
+
+def row_counters():
+    """Tables whose growth counts as rows loaded; migrated files count as rows too"""
+    return {
+        'users': User.objects.all(),
+        'profiles': UserProfile.objects.all(),
+        'applications': InternshipApplication.objects.all(),
+        'weekly_logs': WeeklyLog.objects.all(),
+        'proofs': ProgressProof.objects.all(),
+        'completions': InternshipCompletion.objects.all(),
+        'migrated_files': InternshipApplication.objects.filter(offer_letter_data__isnull=False),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the data loading commands on generated datasets in a throwaway database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='1000,10000',
+            help='Comma-separated student counts to generate and load (default: 1000,10000)',
+        )
+        parser.add_argument(
+            '--commands', default=','.join(COMMANDS),
+            help=f'Comma-separated commands to run (default: {",".join(COMMANDS)})',
+        )
+        parser.add_argument(
+            '--output', default='loader_benchmark.json',
+            help='Where to write the JSON report (default: loader_benchmark.json)',
+        )
+        parser.add_argument('--seed', type=int, default=42, help='Seed for the generated students (default: 42)')
+        parser.add_argument(
+            '--copy', action='store_true',
+            help='Pass --copy to load_csv_to_db (COPY statements are not included in its query count)',
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        commands = options['commands'].split(',')
+        unknown = set(commands) - set(COMMANDS)
+        if unknown:
+            raise CommandError(f'Unknown command(s): {", ".join(sorted(unknown))}')
+        if 'migrate_files_to_db' in commands and 'load_csv_to_db' not in commands:
+            raise CommandError('migrate_files_to_db needs the applications created by load_csv_to_db')
+
+        work_dir = tempfile.mkdtemp(prefix='loader-benchmark-')
+        old_name = connection.settings_dict['NAME']
+        # Same throwaway database the test runner would use, so real data is never touched
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        self.stdout.write(f'Benchmarking in throwaway database {connection.settings_dict["NAME"]}')
+        results = []
+        try:
+            for size in sizes:
+                data_dir = self.generate_dataset(os.path.join(work_dir, str(size)), size, options['seed'])
+                for name in commands:
+                    if name == 'load_hicas_data' and size != sizes[0]:
+                        continue  # Built-in dataset, the same at every size
+                    results.append(self.run(name, size, data_dir, work_dir, options))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        report = {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'seed': options['seed'],
+            'results': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'✓ Wrote {options["output"]}'))
+
+    def generate_dataset(self, data_dir, size, seed):
+        """Students CSV for ``size`` students next to a copy of the real faculty CSV"""
+        import generate_simulated_students as generator
+
+        os.makedirs(data_dir)
+        students = generator.build_students(np.random.default_rng(seed), size)
+        generator.write_students_csv(os.path.join(data_dir, 'hicas_students_simulated.csv'), students)
+        shutil.copy(os.path.join(settings.BASE_DIR, 'hicas_faculty_data.csv'), data_dir)
+        return data_dir
+
+    def seed_offer_letters(self, media_root):
+        """Point every application at an offer letter on disk that isn't in the database yet"""
+        os.makedirs(os.path.join(media_root, 'offer_letters'), exist_ok=True)
+        content = os.urandom(OFFER_LETTER_BYTES)
+        for application_id in InternshipApplication.objects.values_list('application_id', flat=True):
+            with open(os.path.join(media_root, 'offer_letters', f'{application_id}.pdf'), 'wb') as f:
+                f.write(content)
+        # update() skips the pre_save signal that would read the files in straight away
+        InternshipApplication.objects.update(
+            offer_letter_file=Concat(Value('offer_letters/'), Cast('application_id', CharField()), Value('.pdf')),
+            offer_letter_data=None,
+        )
+
+    def run(self, name, size, data_dir, work_dir, options):
+        media_root = os.path.join(work_dir, 'media')
+        if name == 'migrate_files_to_db':
+            # Runs on what load_csv_to_db just loaded
+            self.seed_offer_letters(media_root)
+            arguments = {}
+        else:
+            call_command('flush', interactive=False, verbosity=0)
+            arguments = {} if name == 'load_hicas_data' else {'data_dir': data_dir}
+            if name == 'load_csv_to_db' and options['copy']:
+                arguments['copy'] = True
+
+        self.stdout.write(f'{name} ({size if name != "load_hicas_data" else "built-in"} students)...')
+        with override_settings(MEDIA_ROOT=media_root), StageRecorder(row_counters()) as recorder:
+            call_command(name, stdout=StringIO(), stderr=StringIO(), **arguments)
+        total = recorder.summary()
+
+        # Commands that announce no stages have just the one, which is the total
+        for stage in recorder.stages if len(recorder.stages) > 1 else []:
+            self.stdout.write(
+                f'  {stage["stage"]:<40}{stage["seconds"]:>9.2f}s{stage["queries"]:>9} queries'
+                f'{stage["rows"]:>10} rows{stage["peak_memory_mb"]:>9.1f}MB'
+            )
+        self.stdout.write(f'  {"total":<40}{total["seconds"]:>9.2f}s{total["queries"]:>9} queries{total["rows"]:>10} rows')
+        return {
+            'command': name,
+            'students': None if name == 'load_hicas_data' else size,
+            'stages': recorder.stages,
+            'total': total,
+        }
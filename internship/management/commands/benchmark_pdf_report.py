@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+import os
+import tempfile
+import time
+import tracemalloc
+
+from internship.management.commands.benchmark_excel_export import synthetic_rows
+from internship.reports import build_full_report
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the institutional PDF report at several student row counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='1000,10000,50000',
+            help='Comma-separated student row counts to benchmark (default: 1000,10000,50000)',
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        self.stdout.write(f'{"rows":>10}{"time":>10}{"rows/s":>10}{"peak mem":>12}{"file size":>12}')
+
+        for size in sizes:
+            with tempfile.TemporaryFile() as output:
+                tracemalloc.start()
+                start = time.perf_counter()
+                build_full_report(output, rows=synthetic_rows(size))
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                file_size = output.seek(0, os.SEEK_END)
+
+            self.stdout.write(
+                f'{size:>10}{elapsed:>9.1f}s{size / elapsed:>10.0f}'
+                f'{peak / 1024 / 1024:>10.1f}MB{file_size / 1024 / 1024:>10.1f}MB'
+            )
+
+        self.stdout.write(self.style.SUCCESS('✓ Time should grow linearly; memory only grows with the finished pages reportlab holds until save'))
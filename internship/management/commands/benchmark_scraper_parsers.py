@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+import os
+import time
+import tracemalloc
+
+import scrape_hicas_faculty as scraper
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the scraper\'s department page parser backends on saved pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'pages', nargs='*',
+            help='Saved department pages to parse (default: sample_page.html)',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=50,
+            help='Times each page is parsed per backend (default: 50)',
+        )
+
+    def handle(self, *args, **options):
+        paths = options['pages'] or [os.path.join(settings.BASE_DIR, 'sample_page.html')]
+        pages = []
+        for path in paths:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    pages.append(f.read())
+            except FileNotFoundError:
+                raise CommandError(f'Page not found: {path}')
+        total_kb = sum(len(page.encode('utf-8')) for page in pages) / 1024
+        self.stdout.write(f'{len(pages)} page(s), {total_kb:.0f} KB, parsed {options["repeat"]} times per backend')
+        self.stdout.write(f'{"backend":>10}{"per page":>12}{"pages/s":>10}{"peak mem":>12}{"faculty":>9}')
+
+        results = {}
+        for name in scraper.HEADING_PARSERS:
+            start = time.perf_counter()
+            for _ in range(options['repeat']):
+                for page in pages:
+                    scraper.parse_department_page(page, '', '', name)
+            elapsed = time.perf_counter() - start
+            # Memory separately: tracemalloc would slow the timed loop down
+            tracemalloc.start()
+            records = [scraper.parse_department_page(page, '', '', name) for page in pages]
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            parses = options['repeat'] * len(pages)
+            results[name] = records
+            self.stdout.write(
+                f'{name:>10}{elapsed / parses * 1000:>10.2f}ms{parses / elapsed:>10.0f}'
+                f'{peak / 1024 / 1024:>10.2f}MB{sum(map(len, records)):>9}'
+            )
+
+        if any(records != results[scraper.DEFAULT_PARSER] for records in results.values()):
+            raise CommandError('Backends disagree on the faculty found')
+        self.stdout.write(self.style.SUCCESS('✓ All backends found the same faculty'))
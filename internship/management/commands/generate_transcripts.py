@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+import os
+import time
+
+from internship.models import UserProfile
+from internship.transcripts import DirectorySink, ZipSink, generate_transcripts, student_filter
+
+
+class Command(BaseCommand):
+    help = 'Generate a PDF internship transcript per student, rendered in parallel worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Destination .zip file, or a directory for one PDF per student')
+        parser.add_argument('--department', help='Only students from this department code (e.g. CSE)')
+        parser.add_argument('--year', type=int, help='Only students in this year of study')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Rendering processes (default: CPU count)')
+        parser.add_argument('--resume', action='store_true', help='Skip students whose transcript already exists in the output')
+
+    def handle(self, *args, **options):
+        department = options['department']
+        if department and department not in dict(UserProfile.DEPARTMENT_CHOICES):
+            raise CommandError(f'Unknown department code: {department}')
+
+        output = options['output']
+        if output.endswith('.zip'):
+            sink = ZipSink(output, resume=options['resume'])
+        else:
+            sink = DirectorySink(output)
+
+        students = student_filter(department, options['year'])
+        total = students.count()
+        self.stdout.write(f'Generating transcripts for {total} students with {options["workers"]} workers...')
+        start = time.perf_counter()
+
+        def progress(written, pages):
+            if written % 100 == 0:
+                elapsed = time.perf_counter() - start
+                self.stdout.write(f'  {written} transcripts, {pages / elapsed:.1f} pages/s')
+
+        try:
+            written, pages = generate_transcripts(
+                students, sink, workers=options['workers'], resume=options['resume'], progress=progress
+            )
+        finally:
+            sink.close()
+
+        elapsed = time.perf_counter() - start
+        skipped = total - written
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Wrote {written} transcripts ({pages} pages) to {output} in {elapsed:.1f}s'
+        ))
+        if written:
+            self.stdout.write(f'  {pages / elapsed:.1f} pages/s, {written / elapsed:.1f} transcripts/s')
+        if skipped:
+            self.stdout.write(f'  Skipped {skipped} existing transcripts')
@@ -1,22 +1,144 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth.models import User
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from internship.benchmarks import stage_finished
+from internship.ingest import DEFAULT_CHUNK_SIZE, ChunkedCSVIngest, Checkpoint, default_checkpoint_path
 from internship.models import UserProfile, InternshipApplication
+from internship.catalog import DEPT_MAPPING
 from datetime import datetime, timedelta
 import random
-import csv
 import os
 
 class Command(BaseCommand):
     help = 'Load sample data into the database from CSV files'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue an interrupted load from its last committed chunk instead of clearing the database',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'CSV rows committed per transaction (default: {DEFAULT_CHUNK_SIZE})',
+        )
+        parser.add_argument(
+            '--data-dir',
+            default=None,
+            help='Directory holding hicas_faculty_data.csv and hicas_students_simulated.csv (default: project root)',
+        )
+
     def handle(self, *args, **kwargs):
         self.stdout.write('Loading data from CSV files...')
         
-        # Clear existing data
-        User.objects.all().delete()
+        resume = kwargs.get('resume')
+        checkpoint = Checkpoint(default_checkpoint_path('load_sample_data'), resume=resume)
+        if resume and not checkpoint:
+            raise CommandError('No interrupted load to resume')
+        chunk_size = kwargs['chunk_size']
         
         # Get the project root directory
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        base_dir = kwargs.get('data_dir') or os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        
+        if resume:
+            self.stdout.write('Resuming previous load...')
+        else:
+            self.create_admin()
+            stage_finished.send(sender=self.__class__, stage='Admin')
+        
+        # Load faculty from CSV
+        faculty_csv = os.path.join(base_dir, 'hicas_faculty_data.csv')
+        
+        def load_faculty(rows, first_row):
+            for faculty_count, row in enumerate(rows, start=first_row + 1):
+                # Create username from name
+                username = f"faculty{faculty_count}"
+                
+                user, _ = User.objects.get_or_create(username=username, defaults={
+                    'email': f"{username}@hicas.ac.in",
+                    'password': make_password('faculty123'),
+                })
+                UserProfile.objects.get_or_create(user=user, defaults=dict(
+                    employee_id=f"FC{faculty_count:05d}",
+                    full_name=row['Faculty Name'],
+                    role='faculty',
+                    department=DEPT_MAPPING.get(row['Department'], 'CSE'),
+                    email_id=f"{username}@hicas.ac.in",
+                    mobile_number=f"98765{random.randint(10000, 99999)}"
+                ))
+        
+        try:
+            ChunkedCSVIngest(faculty_csv, 'faculty', checkpoint, chunk_size, self.stdout.write).run(load_faculty)
+        except FileNotFoundError:
+            self.stdout.write(self.style.ERROR(f'Faculty CSV file not found at {faculty_csv}'))
+            return
+        faculty_profiles = list(UserProfile.objects.filter(role='faculty'))
+        faculty_count = len(faculty_profiles)
+        self.stdout.write(self.style.SUCCESS(f'Created {faculty_count} faculty members from CSV'))
+        stage_finished.send(sender=self.__class__, stage='Faculty')
+        
+        # Load students from CSV
+        students_csv = os.path.join(base_dir, 'hicas_students_simulated.csv')
+        
+        def load_students(rows, first_row):
+            for student_count, row in enumerate(rows, start=first_row + 1):
+                email = row['Email']
+                
+                # Create username from register number
+                username = f"student{student_count}"
+                
+                user, _ = User.objects.get_or_create(username=username, defaults={
+                    'email': email,
+                    'password': make_password('student123'),
+                })
+                UserProfile.objects.get_or_create(user=user, defaults=dict(
+                    employee_id=f"ST{student_count:05d}",
+                    full_name=row['Student Name'],
+                    role='student',
+                    department=DEPT_MAPPING.get(row['Department'], 'CSE'),
+                    register_number=row['RegisterNumber'],
+                    year_of_study=int(row['Year']),
+                    email_id=email,
+                    mobile_number=f"98765{random.randint(10000, 99999)}"
+                ))
+        
+        try:
+            ChunkedCSVIngest(students_csv, 'students', checkpoint, chunk_size, self.stdout.write).run(load_students)
+        except FileNotFoundError:
+            self.stdout.write(self.style.ERROR(f'Students CSV file not found at {students_csv}'))
+            return
+        student_profiles = list(UserProfile.objects.filter(role='student'))
+        student_count = len(student_profiles)
+        self.stdout.write(self.style.SUCCESS(f'Created {student_count} students from CSV'))
+        stage_finished.send(sender=self.__class__, stage='Students')
+        
+        if checkpoint.get('applications'):
+            self.stdout.write('Sample internship applications already created, skipping')
+            applications = list(InternshipApplication.objects.all())
+        else:
+            with transaction.atomic():
+                applications = self.create_applications(faculty_profiles, student_profiles)
+            checkpoint.save('applications', done=True)
+        stage_finished.send(sender=self.__class__, stage='Applications')
+        checkpoint.clear()
+        
+        self.stdout.write(self.style.SUCCESS('\n=== Data loading completed successfully! ==='))
+        self.stdout.write(f'\n📊 Summary:')
+        self.stdout.write(f'  - 1 Admin')
+        self.stdout.write(f'  - {faculty_count} Faculty members')
+        self.stdout.write(f'  - {student_count} Students')
+        self.stdout.write(f'  - {len(applications)} Internship applications')
+        self.stdout.write(f'\n🔑 Login credentials:')
+        self.stdout.write(f'  Admin: admin / admin123')
+        self.stdout.write(f'  Faculty: faculty1 to faculty{faculty_count} / faculty123')
+        self.stdout.write(f'  Students: student1 to student{student_count} / student123')
+
+    def create_admin(self):
+        # Clear existing data
+        User.objects.all().delete()
         
         # Create only ONE admin
         admin_user = User.objects.create_user(
@@ -37,128 +159,8 @@ class Command(BaseCommand):
         )
         
         self.stdout.write(self.style.SUCCESS('Created 1 admin: admin/admin123'))
-        
-        # Department mapping from CSV to model choices
-        dept_mapping = {
-            'B.Com Accounting & Finance': 'BCOM_AF',
-            'B.Com CA': 'BCOM_CA',
-            'B.Com CS': 'BCOM_CS',
-            'B.Com Commerce': 'BCOM',
-            'B.Com IT': 'BCOM_IT',
-            'B.Com International Business': 'BCOM_IB',
-            'B.Com Professional Accounting': 'BCOM_PA',
-            'B.Sc AI & ML': 'BSC_AI',
-            'B.Sc Animation & Visual Effects': 'BSC_ANIM',
-            'B.Sc Biotechnology': 'BSC_BIO',
-            'B.Sc CS with Cognitive Systems': 'BSC_CS_COG',
-            'B.Sc CS with Cyber Security': 'BSC_CS_CYB',
-            'B.Sc Catering Science & Hotel Management': 'BSC_CATERING',
-            'B.Sc Computer Science': 'CSE',
-            'B.Sc Computer Technology': 'BSC_CT',
-            'B.Sc Costume Design & Fashion': 'BSC_FASHION',
-            'B.Sc Data Science & Analytics': 'BSC_DS',
-            'B.Sc Electronics and Communication Systems': 'ECE',
-            'B.Sc Food Processing Technology & Management': 'BSC_FOOD',
-            'B.Sc Information Technology': 'IT',
-            'B.Sc Mathematics': 'MATHEMATICS',
-            'B.Sc Microbiology': 'BSC_MICRO',
-            'B.Sc Physics': 'PHYSICS',
-            'B.Sc Visual Communication': 'BSC_VISCOM',
-            'BA English Literature': 'ENGLISH',
-            'BBA': 'BBA',
-            'BBA CA': 'BBA_CA',
-            'BBA Logistics': 'BBA_LOG',
-            'BCA - Bachelor of Computer Applications': 'BCA',
-            'M.Com CA': 'MCOM_CA',
-            'M.Com International Business': 'MCOM_IB',
-            'M.Sc Biotechnology': 'MSC_BIO',
-        }
-        
-        # Load faculty from CSV
-        faculty_csv = os.path.join(base_dir, 'hicas_faculty_data.csv')
-        faculty_profiles = []
-        faculty_count = 0
-        
-        try:
-            with open(faculty_csv, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    faculty_count += 1
-                    dept_name = row['Department']
-                    faculty_name = row['Faculty Name']
-                    
-                    # Get department code
-                    dept_code = dept_mapping.get(dept_name, 'CSE')
-                    
-                    # Create username from name
-                    username = f"faculty{faculty_count}"
-                    
-                    user = User.objects.create_user(
-                        username=username,
-                        password='faculty123',
-                        email=f"{username}@hicas.ac.in"
-                    )
-                    profile = UserProfile.objects.create(
-                        user=user,
-                        employee_id=f"FC{faculty_count:05d}",
-                        full_name=faculty_name,
-                        role='faculty',
-                        department=dept_code,
-                        email_id=f"{username}@hicas.ac.in",
-                        mobile_number=f"98765{random.randint(10000, 99999)}"
-                    )
-                    faculty_profiles.append(profile)
-            
-            self.stdout.write(self.style.SUCCESS(f'Created {faculty_count} faculty members from CSV'))
-        except FileNotFoundError:
-            self.stdout.write(self.style.ERROR(f'Faculty CSV file not found at {faculty_csv}'))
-            return
-        
-        # Load students from CSV
-        students_csv = os.path.join(base_dir, 'hicas_students_simulated.csv')
-        student_profiles = []
-        student_count = 0
-        
-        try:
-            with open(students_csv, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    student_count += 1
-                    dept_name = row['Department']
-                    student_name = row['Student Name']
-                    register_number = row['RegisterNumber']
-                    email = row['Email']
-                    year = int(row['Year'])
-                    
-                    # Get department code
-                    dept_code = dept_mapping.get(dept_name, 'CSE')
-                    
-                    # Create username from register number
-                    username = f"student{student_count}"
-                    
-                    user = User.objects.create_user(
-                        username=username,
-                        password='student123',
-                        email=email
-                    )
-                    profile = UserProfile.objects.create(
-                        user=user,
-                        employee_id=f"ST{student_count:05d}",
-                        full_name=student_name,
-                        role='student',
-                        department=dept_code,
-                        register_number=register_number,
-                        year_of_study=year,
-                        email_id=email,
-                        mobile_number=f"98765{random.randint(10000, 99999)}"
-                    )
-                    student_profiles.append(profile)
-            
-            self.stdout.write(self.style.SUCCESS(f'Created {student_count} students from CSV'))
-        except FileNotFoundError:
-            self.stdout.write(self.style.ERROR(f'Students CSV file not found at {students_csv}'))
-            return
-        
+
+    def create_applications(self, faculty_profiles, student_profiles):
         # Create sample internship applications for some students (10% of students)
         self.stdout.write('Creating sample internship applications...')
         
@@ -214,14 +216,4 @@ class Command(BaseCommand):
             applications.append(app)
         
         self.stdout.write(self.style.SUCCESS(f'Created {len(applications)} internship applications'))
-        
-        self.stdout.write(self.style.SUCCESS('\n=== Data loading completed successfully! ==='))
-        self.stdout.write(f'\n📊 Summary:')
-        self.stdout.write(f'  - 1 Admin')
-        self.stdout.write(f'  - {faculty_count} Faculty members')
-        self.stdout.write(f'  - {student_count} Students')
-        self.stdout.write(f'  - {len(applications)} Internship applications')
-        self.stdout.write(f'\n🔑 Login credentials:')
-        self.stdout.write(f'  Admin: admin / admin123')
-        self.stdout.write(f'  Faculty: faculty1 to faculty{faculty_count} / faculty123')
-        self.stdout.write(f'  Students: student1 to student{student_count} / student123')
+        return applications
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from internship.dimensions import DIMENSIONS, add_alias, backfill
+
+
+class Command(BaseCommand):
+    help = 'Link applications to canonical Company and Domain rows, merging spelling variants'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company-alias', action='append', default=[], metavar='VARIANT=CANONICAL',
+                            help='Map a company spelling onto a canonical company (repeatable)')
+        parser.add_argument('--domain-alias', action='append', default=[], metavar='VARIANT=CANONICAL',
+                            help='Map a domain spelling onto a canonical domain (repeatable)')
+        parser.add_argument('--all', action='store_true',
+                            help='Re-resolve every application, not just unlinked ones (use after adding aliases)')
+        parser.add_argument('--batch-size', type=int, default=200, help='Distinct names per transaction')
+
+    def handle(self, *args, **options):
+        for dimension, option in (('company', 'company_alias'), ('domain', 'domain_alias')):
+            for pair in options[option]:
+                variant, sep, canonical = pair.partition('=')
+                if not sep or not variant.strip() or not canonical.strip():
+                    raise CommandError(f'Alias must look like VARIANT=CANONICAL: {pair}')
+                alias = add_alias(dimension, variant.strip(), canonical.strip())
+                self.stdout.write(f'  Alias: {alias}')
+
+        only_missing = not options['all'] and not options['company_alias'] and not options['domain_alias']
+        for dimension in DIMENSIONS:
+            created, updated = backfill(dimension, only_missing=only_missing, batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ {dimension.title()}: {created} new rows, {updated} applications linked'
+            ))
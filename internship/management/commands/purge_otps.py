@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from internship.otp import get_otp_store
+
+
+class Command(BaseCommand):
+    help = 'Delete used and expired password-reset OTPs in batches (run it from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows deleted per statement (default: 1000)')
+
+    def handle(self, *args, **options):
+        if getattr(settings, 'OTP_STORE', 'db') == 'cache':
+            self.stdout.write('OTPs are kept in the cache and expire by themselves, nothing to purge')
+            return
+        deleted = get_otp_store().purge(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'✓ Purged {deleted} used or expired OTP(s)'))
@@ -0,0 +1,77 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from internship.report_jobs import claim_next_job, run_job, requeue_stale_jobs, purge_expired_jobs
+
+
+class Command(BaseCommand):
+    help = 'Process queued report jobs (run several copies, or use --workers, for parallelism)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1, help='Number of worker processes to start')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Drain the queue and exit instead of polling forever')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        if workers > 1:
+            self.spawn_workers(workers, options)
+            return
+
+        worker_name = f'{socket.gethostname()}:{os.getpid()}'
+        self.stdout.write(f'Report worker {worker_name} started')
+        processed = 0
+
+        while True:
+            requeued = requeue_stale_jobs()
+            if requeued:
+                self.stdout.write(self.style.WARNING(f'⚠ Re-queued {requeued} stale job(s)'))
+            purged = purge_expired_jobs()
+            if purged:
+                self.stdout.write(f'Purged {purged} expired job(s)')
+
+            job = claim_next_job(worker_name)
+            if job is None:
+                if options['once']:
+                    break
+                close_old_connections()
+                time.sleep(options['poll_interval'])
+                continue
+
+            start = time.perf_counter()
+            finished = run_job(job)
+            elapsed = time.perf_counter() - start
+            processed += 1
+            if finished is None:
+                self.stdout.write(self.style.WARNING(
+                    f'⚠ Job #{job.job_id} ({job.report_type}) was re-queued while running, result discarded'
+                ))
+            elif job.status == 'done':
+                self.stdout.write(self.style.SUCCESS(
+                    f'✓ Job #{job.job_id} ({job.report_type}) done in {elapsed:.1f}s, {len(job.result_data)} bytes'
+                ))
+            else:
+                self.stdout.write(self.style.ERROR(f'✗ Job #{job.job_id} ({job.report_type}) failed: {job.error}'))
+
+        self.stdout.write(self.style.SUCCESS(f'Worker {worker_name} exiting after {processed} job(s)'))
+
+    def spawn_workers(self, workers, options):
+        """Run each worker in its own process; they coordinate through SKIP LOCKED."""
+        command = [sys.executable, sys.argv[0], 'run_report_worker',
+                   '--poll-interval', str(options['poll_interval'])]
+        if options['once']:
+            command.append('--once')
+
+        self.stdout.write(f'Starting {workers} report workers...')
+        processes = [subprocess.Popen(command) for _ in range(workers)]
+        try:
+            for process in processes:
+                process.wait()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internship', '0008_reportjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reportjob',
+            name='report_type',
+            field=models.CharField(choices=[('pdf', 'PDF Report'), ('excel', 'Excel Report'), ('full_pdf', 'Institutional PDF Report')], max_length=20),
+        ),
+    ]
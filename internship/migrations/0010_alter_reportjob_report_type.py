@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internship', '0009_alter_reportjob_report_type'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reportjob',
+            name='report_type',
+            field=models.CharField(choices=[('pdf', 'PDF Report'), ('excel', 'Excel Report'), ('full_pdf', 'Institutional PDF Report'), ('transcripts', 'Student Transcripts (ZIP)')], max_length=20),
+        ),
+    ]
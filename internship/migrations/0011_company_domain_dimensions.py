@@ -0,0 +1,71 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internship', '0010_alter_reportjob_report_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Company',
+            fields=[
+                ('company_id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=200)),
+                ('normalized_key', models.CharField(max_length=200, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'companies',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Domain',
+            fields=[
+                ('domain_id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('normalized_key', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DomainAlias',
+            fields=[
+                ('alias_id', models.AutoField(primary_key=True, serialize=False)),
+                ('alias', models.CharField(max_length=100)),
+                ('alias_key', models.CharField(max_length=100, unique=True)),
+                ('domain', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='internship.domain')),
+            ],
+            options={
+                'verbose_name_plural': 'domain aliases',
+            },
+        ),
+        migrations.CreateModel(
+            name='CompanyAlias',
+            fields=[
+                ('alias_id', models.AutoField(primary_key=True, serialize=False)),
+                ('alias', models.CharField(max_length=200)),
+                ('alias_key', models.CharField(max_length=200, unique=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='internship.company')),
+            ],
+            options={
+                'verbose_name_plural': 'company aliases',
+            },
+        ),
+        migrations.AddField(
+            model_name='internshipapplication',
+            name='company',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='applications', to='internship.company'),
+        ),
+        migrations.AddField(
+            model_name='internshipapplication',
+            name='domain',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='applications', to='internship.domain'),
+        ),
+    ]
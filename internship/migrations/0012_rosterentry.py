@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internship', '0011_company_domain_dimensions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RosterEntry',
+            fields=[
+                ('entry_id', models.AutoField(primary_key=True, serialize=False)),
+                ('source', models.CharField(choices=[('faculty', 'Faculty CSV'), ('student', 'Student CSV')], max_length=20)),
+                ('key', models.CharField(max_length=150)),
+                ('row_hash', models.CharField(max_length=64)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='roster_entries', to='internship.userprofile')),
+            ],
+            options={
+                'verbose_name_plural': 'roster entries',
+                'unique_together': {('source', 'key')},
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:02
+
+import re
+
+from django.db import migrations
+
+
+def rekey_faculty_entries(apps, schema_editor):
+    # Faculty roster entries were keyed by username; key them by department and
+    # normalized name (internship.roster.roster_key) so the next sync matches them
+    RosterEntry = apps.get_model('internship', 'RosterEntry')
+    entries = list(RosterEntry.objects.filter(source='faculty').select_related('profile'))
+    for entry in entries:
+        name = re.sub(r'[\s.]+', ' ', entry.profile.full_name).strip().lower()
+        entry.key = f'{entry.profile.department}/{name}'
+    RosterEntry.objects.bulk_update(entries, ['key'], batch_size=1000)
+
+
+def restore_username_keys(apps, schema_editor):
+    RosterEntry = apps.get_model('internship', 'RosterEntry')
+    entries = list(RosterEntry.objects.filter(source='faculty').select_related('profile__user'))
+    for entry in entries:
+        entry.key = entry.profile.user.username
+    RosterEntry.objects.bulk_update(entries, ['key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internship', '0014_reportjob_heartbeat_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(rekey_faculty_entries, restore_username_keys),
+    ]
@@ -1,7 +1,26 @@
+import re
+
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import FileExtensionValidator
 
+_PARENTHESES = re.compile(r'\(.*?\)')
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+COMPANY_SUFFIXES = {'pvt', 'private', 'ltd', 'limited', 'inc', 'llp', 'llc', 'corp', 'corporation'}
+
+
+def normalize_key(name, suffixes=()):
+    """Lookup key for a free-text name: case, punctuation, bracketed notes and trailing suffixes removed.
+
+    "TCS (Tata Consultancy Services)", "tcs" and "TCS Pvt. Ltd." all map to "tcs".
+    """
+    text = _PARENTHESES.sub(' ', name.casefold()).replace('&', ' and ')
+    words = _NON_ALNUM.sub(' ', text).split()
+    while len(words) > 1 and words[-1] in suffixes:
+        words.pop()
+    return ' '.join(words) or ' '.join(_NON_ALNUM.sub(' ', name.casefold()).split())
+
+
 class UserProfile(models.Model):
     ROLE_CHOICES = [
         ('student', 'Student'),
@@ -78,6 +97,76 @@ class UserProfile(models.Model):
         return f"{self.full_name} ({self.role})"
 
 
+class Company(models.Model):
+    """Canonical company; applications link here from their free-text company_name"""
+    company_id = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=200)
+    normalized_key = models.CharField(max_length=200, unique=True)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name_plural = 'companies'
+
+    def save(self, *args, **kwargs):
+        self.normalized_key = normalize_key(self.name, COMPANY_SUFFIXES)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.name
+
+
+class CompanyAlias(models.Model):
+    """Spelling that normalization alone can't map, e.g. "Tata Consultancy Services" -> TCS"""
+    alias_id = models.AutoField(primary_key=True)
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='aliases')
+    alias = models.CharField(max_length=200)
+    alias_key = models.CharField(max_length=200, unique=True)
+
+    class Meta:
+        verbose_name_plural = 'company aliases'
+
+    def save(self, *args, **kwargs):
+        self.alias_key = normalize_key(self.alias, COMPANY_SUFFIXES)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.alias} -> {self.company.name}"
+
+
+class Domain(models.Model):
+    """Canonical internship domain"""
+    domain_id = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=100)
+    normalized_key = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def save(self, *args, **kwargs):
+        self.normalized_key = normalize_key(self.name)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.name
+
+
+class DomainAlias(models.Model):
+    alias_id = models.AutoField(primary_key=True)
+    domain = models.ForeignKey(Domain, on_delete=models.CASCADE, related_name='aliases')
+    alias = models.CharField(max_length=100)
+    alias_key = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        verbose_name_plural = 'domain aliases'
+
+    def save(self, *args, **kwargs):
+        self.alias_key = normalize_key(self.alias)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.alias} -> {self.domain.name}"
+
+
 class InternshipApplication(models.Model):
     STATUS_CHOICES = [
         ('pending_company', 'Pending - Awaiting Company Offer Letter'),
@@ -98,6 +187,9 @@ class InternshipApplication(models.Model):
     assigned_faculty = models.ForeignKey(UserProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name='assigned_applications', limit_choices_to={'role': 'faculty'})
     company_name = models.CharField(max_length=200)
     internship_domain = models.CharField(max_length=100)
+    # Resolved from company_name / internship_domain on save; backfilled by normalize_dimensions
+    company = models.ForeignKey(Company, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='applications')
+    domain = models.ForeignKey(Domain, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='applications')
     internship_mode = models.CharField(max_length=20, choices=MODE_CHOICES)
     start_date = models.DateField()
     end_date = models.DateField()
@@ -263,6 +355,30 @@ class ProgressProof(models.Model):
         return f"{self.title} - {self.student.full_name}"
 
 
+class RosterEntry(models.Model):
+    """Last synced state of one registrar CSV row; see internship.roster"""
+    SOURCE_CHOICES = [
+        ('faculty', 'Faculty CSV'),
+        ('student', 'Student CSV'),
+    ]
+
+    entry_id = models.AutoField(primary_key=True)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    # Register number for students, roster_key (department/normalized name) for faculty
+    key = models.CharField(max_length=150)
+    # sha256 of the canonical record, compared on the next sync
+    row_hash = models.CharField(max_length=64)
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='roster_entries')
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['source', 'key']
+        verbose_name_plural = 'roster entries'
+
+    def __str__(self):
+        return f"{self.source}:{self.key}"
+
+
 class PasswordResetOTP(models.Model):
     """Model to store OTP for password reset"""
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -271,9 +387,69 @@ class PasswordResetOTP(models.Model):
     expires_at = models.DateTimeField()
     is_used = models.BooleanField(default=False)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'otp']),
+            # purge_otps deletes by expiry
+            models.Index(fields=['expires_at']),
+        ]
+    
     def is_valid(self):
         from django.utils import timezone
         return not self.is_used and timezone.now() < self.expires_at
     
     def __str__(self):
-        return f"OTP for {self.user.username}"
\ No newline at end of file
+        return f"OTP for {self.user.username}"
+
+
+class ReportJob(models.Model):
+    """Report generated in the background by the run_report_worker command"""
+    REPORT_TYPE_CHOICES = [
+        ('pdf', 'PDF Report'),
+        ('excel', 'Excel Report'),
+        ('full_pdf', 'Institutional PDF Report'),
+        ('transcripts', 'Student Transcripts (ZIP)'),
+    ]
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    job_id = models.AutoField(primary_key=True)
+    requested_by = models.ForeignKey(UserProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name='report_jobs')
+    report_type = models.CharField(max_length=20, choices=REPORT_TYPE_CHOICES)
+    params = models.JSONField(default=dict, blank=True)
+    # sha256 of report_type + params, used to hand identical requests the same job
+    dedup_key = models.CharField(max_length=64, db_index=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    worker = models.CharField(max_length=100, blank=True)
+    error = models.TextField(blank=True)
+    result_data = models.BinaryField(blank=True, null=True, editable=False)
+    result_name = models.CharField(max_length=255, blank=True)
+    result_type = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    # Touched by the worker while it builds the report; a stale heartbeat means the worker died
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    expires_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+        constraints = [
+            # At most one in-flight job per distinct report request
+            models.UniqueConstraint(
+                fields=['dedup_key'],
+                condition=models.Q(status__in=['queued', 'running']),
+                name='unique_active_report_job',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_report_type_display()} #{self.job_id} ({self.status})"
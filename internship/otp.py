@@ -0,0 +1,81 @@
+"""Storage for password-reset OTPs, selected by ``settings.OTP_STORE``:
+
+* ``db``    - PasswordResetOTP rows, looked up through a (user, otp) index.
+  Used and expired rows are deleted in batches by ``purge_otps``.
+* ``cache`` - one cache entry per user whose timeout is the OTP lifetime,
+  so nothing ever needs purging. Needs a cache shared by every server
+  process (not the per-process default LocMemCache).
+
+Issuing an OTP replaces any earlier one for the same user. ``use`` consumes
+the OTP atomically: of two requests racing with the same code only one gets
+VALID (a conditional UPDATE for the database, ``cache.delete`` reporting
+whether it removed the key for the cache).
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+from .models import PasswordResetOTP
+
+VALID = 'valid'
+INVALID = 'invalid'
+EXPIRED = 'expired'
+
+
+def otp_ttl():
+    return getattr(settings, 'OTP_TTL_SECONDS', 300)
+
+
+class DatabaseOTPStore:
+    def issue(self, user, otp):
+        PasswordResetOTP.objects.filter(user=user).delete()
+        PasswordResetOTP.objects.create(user=user, otp=otp, expires_at=timezone.now() + timedelta(seconds=otp_ttl()))
+
+    def use(self, user, otp):
+        pending = PasswordResetOTP.objects.filter(user=user, otp=otp, is_used=False)
+        if pending.filter(expires_at__gt=timezone.now()).update(is_used=True):
+            return VALID
+        return EXPIRED if pending.exists() else INVALID
+
+    def purge(self, batch_size=1000):
+        """Delete used and expired OTPs, ``batch_size`` rows per statement; returns the number deleted"""
+        stale = PasswordResetOTP.objects.filter(Q(expires_at__lte=timezone.now()) | Q(is_used=True))
+        deleted = 0
+        while True:
+            ids = list(stale.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return deleted
+            deleted += PasswordResetOTP.objects.filter(pk__in=ids).delete()[0]
+
+
+class CacheOTPStore:
+    def key(self, user):
+        return f'password-reset-otp:{user.pk}'
+
+    def issue(self, user, otp):
+        cache.set(self.key(user), otp, otp_ttl())
+
+    def use(self, user, otp):
+        stored = cache.get(self.key(user))
+        # Expired entries are gone from the cache, so they can't be told apart from wrong codes
+        if stored is None or not constant_time_compare(stored, otp):
+            return INVALID
+        return VALID if cache.delete(self.key(user)) else INVALID
+
+    def purge(self, batch_size=1000):
+        return 0  # entries expire by themselves
+
+
+OTP_STORES = {
+    'db': DatabaseOTPStore,
+    'cache': CacheOTPStore,
+}
+
+
+def get_otp_store():
+    return OTP_STORES.get(getattr(settings, 'OTP_STORE', 'db'), DatabaseOTPStore)()
@@ -0,0 +1,75 @@
+"""Per-user initial passwords for bulk account provisioning.
+
+Hashing is deliberately slow (PBKDF2 with hundreds of thousands of
+iterations), so thousands of accounts take minutes on one core. Passwords
+are hashed in chunks across a ``ProcessPoolExecutor`` instead; each worker
+sets Django up once and returns hashes in input order. The plain passwords
+only ever leave the process through ``write_credentials``.
+"""
+
+import csv
+import os
+import secrets
+import string
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# No look-alike characters (0/O, 1/l/I) in passwords people have to type
+PASSWORD_ALPHABET = ''.join(c for c in string.ascii_letters + string.digits if c not in '0O1lI')
+PASSWORD_LENGTH = 10
+
+
+def generate_password(length=PASSWORD_LENGTH):
+    return ''.join(secrets.choice(PASSWORD_ALPHABET) for _ in range(length))
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def _hash_chunk(passwords):
+    from django.contrib.auth.hashers import make_password
+    return [make_password(password) for password in passwords]
+
+
+def hash_passwords(passwords, workers=None, chunk_size=None):
+    """Hash ``passwords`` across ``workers`` processes.
+
+    Returns (hashes in input order, stats dict with count, workers, seconds,
+    per_second and per_core).
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    if not chunk_size:
+        # A few chunks per worker keeps them busy without much pickling overhead
+        chunk_size = max(1, len(passwords) // (workers * 4))
+    chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+
+    start = time.perf_counter()
+    if workers == 1 or len(chunks) <= 1:
+        workers = 1
+        hashes = [hashed for chunk in chunks for hashed in _hash_chunk(chunk)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            hashes = [hashed for result in executor.map(_hash_chunk, chunks) for hashed in result]
+    seconds = time.perf_counter() - start
+
+    per_second = len(passwords) / seconds if seconds else 0.0
+    return hashes, {
+        'count': len(passwords),
+        'workers': workers,
+        'seconds': seconds,
+        'per_second': per_second,
+        'per_core': per_second / workers,
+    }
+
+
+def write_credentials(path, credentials, append=False):
+    """Write (username, role, password) rows to a CSV readable only by its owner"""
+    header = not (append and os.path.exists(path))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | (os.O_APPEND if append else os.O_TRUNC), 0o600)
+    with os.fdopen(fd, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        if header:
+            writer.writerow(['username', 'role', 'password'])
+        writer.writerows(credentials)
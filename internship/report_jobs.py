@@ -0,0 +1,156 @@
+"""Database-backed queue for reports that are too slow to build inside a request.
+
+Jobs are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` so any number of
+``run_report_worker`` processes can poll the same table without handing the
+same job to two workers. While a report is being built the worker touches
+the job's ``heartbeat_at`` every ``REPORT_JOB_HEARTBEAT_SECONDS``; jobs whose
+heartbeat is older than ``REPORT_JOB_STALE_MINUTES`` are re-queued. A worker
+only stores its result while it still owns the job, so a worker that was
+presumed dead can't overwrite the result of the one that took over.
+"""
+
+import hashlib
+import io
+import json
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ReportJob
+from .reports import REPORT_TYPES
+
+
+def make_dedup_key(report_type, params):
+    payload = json.dumps({'type': report_type, 'params': params}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def find_report_job(dedup_key):
+    """The in-flight job for ``dedup_key``, else its latest unexpired result, else None."""
+    return ReportJob.objects.filter(dedup_key=dedup_key).filter(
+        status__in=['queued', 'running']
+    ).first() or ReportJob.objects.filter(
+        dedup_key=dedup_key, status='done', expires_at__gt=timezone.now()
+    ).order_by('-finished_at').first()
+
+
+def request_report(profile, report_type, params=None):
+    """Return (job, created) for a report, reusing an identical in-flight or unexpired job."""
+    params = params or {}
+    dedup_key = make_dedup_key(report_type, params)
+
+    def create():
+        with transaction.atomic():
+            return ReportJob.objects.create(
+                requested_by=profile,
+                report_type=report_type,
+                params=params,
+                dedup_key=dedup_key,
+            )
+
+    existing = find_report_job(dedup_key)
+    if existing:
+        return existing, False
+    try:
+        return create(), True
+    except IntegrityError:
+        # Another request queued the same report between our lookup and insert. It may have
+        # finished (or failed) since, so look again and queue a new job if nothing is left.
+        existing = find_report_job(dedup_key)
+        if existing:
+            return existing, False
+        return create(), True
+
+
+def claim_next_job(worker_name):
+    """Atomically move the oldest queued job to running and return it, or None."""
+    with transaction.atomic():
+        job = ReportJob.objects.select_for_update(skip_locked=True).filter(
+            status='queued'
+        ).order_by('created_at').first()
+        if job is None:
+            return None
+        job.status = 'running'
+        job.worker = worker_name
+        job.started_at = job.heartbeat_at = timezone.now()
+        # Conditional update keeps the claim exclusive on backends without row locks
+        claimed = ReportJob.objects.filter(pk=job.pk, status='queued').update(
+            status=job.status, worker=job.worker, started_at=job.started_at, heartbeat_at=job.heartbeat_at
+        )
+    return job if claimed else None
+
+
+def owned(job):
+    """Queryset of ``job`` as long as it is still running under the worker that claimed it."""
+    return ReportJob.objects.filter(pk=job.pk, worker=job.worker, status='running')
+
+
+@contextmanager
+def heartbeat(job):
+    """Touch the job's heartbeat from a background thread until the block exits."""
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(settings.REPORT_JOB_HEARTBEAT_SECONDS):
+                owned(job).update(heartbeat_at=timezone.now())
+        finally:
+            connection.close()  # the thread's own connection
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_job(job):
+    """Build the report for a claimed job and store the result on it.
+
+    Returns the job, or None if it was re-queued while running and the
+    result was discarded.
+    """
+    builder, filename, content_type = REPORT_TYPES[job.report_type]
+    ttl = timedelta(hours=settings.REPORT_JOB_RESULT_TTL_HOURS)
+    with heartbeat(job):
+        try:
+            output = io.BytesIO()
+            builder(output, **job.params)
+            job.result_data = output.getvalue()
+            job.result_name = filename
+            job.result_type = content_type
+            job.status = 'done'
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+    job.finished_at = timezone.now()
+    job.expires_at = job.finished_at + ttl
+    fields = ['result_data', 'result_name', 'result_type', 'status', 'error', 'finished_at', 'expires_at']
+    if not owned(job).update(**{field: getattr(job, field) for field in fields}):
+        return None
+    return job
+
+
+def requeue_stale_jobs():
+    """Put running jobs whose worker has gone quiet back on the queue."""
+    cutoff = timezone.now() - timedelta(minutes=settings.REPORT_JOB_STALE_MINUTES)
+    # Jobs claimed before heartbeats existed have only started_at
+    quiet = Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff)
+    return ReportJob.objects.filter(quiet, status='running').update(
+        status='queued', worker='', started_at=None, heartbeat_at=None
+    )
+
+
+def purge_expired_jobs():
+    """Delete finished jobs (and their stored results) past their expiry."""
+    deleted, _ = ReportJob.objects.filter(
+        status__in=['done', 'failed'], expires_at__lt=timezone.now()
+    ).delete()
+    return deleted
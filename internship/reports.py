@@ -0,0 +1,277 @@
+"""Report document builders shared by the download views and the report worker.
+
+Each builder writes a finished document to a binary file-like ``output``.
+"""
+
+import io
+from xml.sax.saxutils import escape
+
+from django.db.models import Count, Q
+from django.utils import timezone
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import (SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer,
+                                PageBreak, Image)
+
+from .charts import chart_series, render_bar_chart_png
+from .cube import cube
+from .exports import iter_application_rows, write_detail_workbook
+from .models import UserProfile, InternshipApplication, WeeklyLog, InternshipCompletion
+from .transcripts import build_transcripts_zip
+
+# Student rows per LongTable. Splitting one huge table across pages is
+# quadratic in reportlab, so the student section is emitted as a run of
+# fixed-size tables that each repeat the header row.
+STUDENT_TABLE_CHUNK = 200
+# Flowables buffered ahead of the layout engine
+FLOWABLE_BUFFER = 20
+
+HEADER_TABLE_STYLE = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+]
+
+
+def build_pdf_report(output, department=None):
+    """Domain-wise summary PDF, for every department or just ``department``."""
+    doc = SimpleDocTemplate(output, pagesize=A4)
+    elements = []
+    styles = getSampleStyleSheet()
+
+    # Title
+    elements.append(Paragraph("SmartIntern Analytics Report", styles['Title']))
+    elements.append(Spacer(1, 20))
+
+    # Domain-wise data
+    domain_data = cube.rollup('internship_domain', department=department)
+
+    domain_table_data = [['Domain', 'Count']]
+    for item in domain_data:
+        domain_table_data.append([item['internship_domain'], str(item['count'])])
+
+    domain_table = Table(domain_table_data)
+    domain_table.setStyle(TableStyle(HEADER_TABLE_STYLE))
+
+    elements.append(Paragraph("Domain-wise Internships", styles['Heading2']))
+    elements.append(domain_table)
+
+    doc.build(elements)
+
+
+def build_excel_report(output, department=None):
+    """Domain/company summaries followed by one detail sheet per department (or just ``department``)."""
+    summaries = [
+        ('Domain Wise', ['internship_domain', 'count'],
+         ([item['internship_domain'], item['count']]
+          for item in cube.rollup('internship_domain', department=department))),
+        ('Company Wise', ['company_name', 'count'],
+         ([item['company_name'], item['count']] for item in cube.rollup('company_name', department=department))),
+    ]
+    queryset = InternshipApplication.objects.all()
+    if department:
+        queryset = queryset.filter(student__department=department)
+    write_detail_workbook(output, iter_application_rows(queryset), summaries)
+
+
+class LazyFlowables(list):
+    """Flowable list that is filled from a generator as reportlab consumes it.
+
+    ``BaseDocTemplate.build`` only ever looks at the front of the list (via
+    ``len``, ``[i]``, ``del [0]`` and slice inserts for split flowables), so
+    topping the buffer up inside ``__len__`` keeps just a handful of pending
+    flowables in memory however long the document is.
+    """
+
+    def __init__(self, source, buffer_size=FLOWABLE_BUFFER):
+        super().__init__()
+        self._source = iter(source)
+        self._buffer_size = buffer_size
+
+    def __len__(self):
+        while self._source is not None and super().__len__() < self._buffer_size:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+        return super().__len__()
+
+
+def _styled_table(rows, col_widths=None, long=False, font_size=None):
+    table_class = LongTable if long else Table
+    table = table_class(rows, colWidths=col_widths, repeatRows=1)
+    style = list(HEADER_TABLE_STYLE)
+    if font_size:
+        style.append(('FONTSIZE', (0, 0), (-1, -1), font_size))
+        style.append(('BOTTOMPADDING', (0, 0), (-1, 0), 4))
+    table.setStyle(TableStyle(style))
+    return table
+
+
+def _chart_image(data, label_field, title):
+    labels, counts = chart_series(data, label_field)
+    if not labels:
+        return None
+    png = render_bar_chart_png(labels, counts, title, label_field.replace('_', ' ').title())
+    return Image(io.BytesIO(png), width=18 * cm, height=10.8 * cm)
+
+
+def department_summary_rows(department=None):
+    """One row per department: students, applications, approvals, weekly logs, completions."""
+    department_names = dict(UserProfile.DEPARTMENT_CHOICES)
+    students = UserProfile.objects.filter(role='student')
+    applications = InternshipApplication.objects.all()
+    logs = WeeklyLog.objects.all()
+    completions = InternshipCompletion.objects.filter(completion_status=True)
+    if department:
+        students = students.filter(department=department)
+        applications = applications.filter(student__department=department)
+        logs = logs.filter(student__department=department)
+        completions = completions.filter(student__department=department)
+
+    student_counts = dict(students.values_list('department').annotate(n=Count('pk')).order_by())
+    app_counts = {
+        row['student__department']: row
+        for row in applications.values('student__department').annotate(
+            total=Count('pk'),
+            approved=Count('pk', filter=Q(application_status='approved')),
+        ).order_by()
+    }
+    log_counts = dict(logs.values_list('student__department').annotate(n=Count('pk')).order_by())
+    completion_counts = dict(completions.values_list('student__department').annotate(n=Count('pk')).order_by())
+
+    rows = []
+    for code in sorted(set(student_counts) | set(app_counts)):
+        apps = app_counts.get(code, {})
+        rows.append([
+            department_names.get(code, code),
+            student_counts.get(code, 0),
+            apps.get('total', 0),
+            apps.get('approved', 0),
+            log_counts.get(code, 0),
+            completion_counts.get(code, 0),
+        ])
+    return rows
+
+
+def faculty_load_rows(department=None):
+    faculty = UserProfile.objects.filter(role='faculty')
+    if department:
+        faculty = faculty.filter(department=department)
+    faculty = faculty.annotate(
+        assigned=Count('assigned_applications', distinct=True),
+        approved=Count('assigned_applications', filter=Q(assigned_applications__application_status='approved'),
+                       distinct=True),
+        reviewed=Count('reviewed_logs', distinct=True),
+    ).order_by('-assigned', 'full_name')
+    for member in faculty.iterator():
+        yield [member.full_name, member.department, member.assigned, member.approved, member.reviewed]
+
+
+def _full_report_flowables(rows, department=None):
+    styles = getSampleStyleSheet()
+    small = styles['Normal'].clone('Small', fontSize=7, leading=8)
+    department_names = dict(UserProfile.DEPARTMENT_CHOICES)
+    status_names = dict(InternshipApplication.STATUS_CHOICES)
+
+    yield Paragraph("SmartIntern Institutional Internship Report", styles['Title'])
+    scope = department_names.get(department, department) if department else 'All departments'
+    yield Paragraph(f"{scope} &middot; generated {timezone.localtime():%d %b %Y %H:%M}", styles['Normal'])
+    yield Spacer(1, 12)
+
+    # Charts
+    for label_field, title in (('internship_domain', 'Domain-wise Internships'),
+                               ('company_name', 'Top 10 Companies')):
+        data = cube.rollup(label_field, limit=10, department=department)
+        image = _chart_image(data, label_field, title)
+        if image:
+            yield image
+            yield Spacer(1, 12)
+
+    # Department summaries
+    yield PageBreak()
+    yield Paragraph("Department Summary", styles['Heading2'])
+    summary = [['Department', 'Students', 'Applications', 'Approved', 'Weekly Logs', 'Completions']]
+    summary.extend(department_summary_rows(department))
+    yield _styled_table(summary, long=True, font_size=8)
+
+    # Faculty load, chunked like the student tables
+    yield PageBreak()
+    yield Paragraph("Faculty Load", styles['Heading2'])
+    header = ['Faculty', 'Department', 'Assigned', 'Approved', 'Logs Reviewed']
+    chunk = [header]
+    for row in faculty_load_rows(department):
+        chunk.append(row)
+        if len(chunk) > STUDENT_TABLE_CHUNK:
+            yield _styled_table(chunk, long=True, font_size=8)
+            chunk = [header]
+    if len(chunk) > 1:
+        yield _styled_table(chunk, long=True, font_size=8)
+
+    # Per-student status, one section per department
+    header = ['Register No.', 'Student', 'Faculty', 'Company', 'Status', 'Weeks', 'Reviewed', 'Proofs', 'Score']
+    widths = [2.6 * cm, 4.4 * cm, 4.2 * cm, 5 * cm, 4.4 * cm, 1.4 * cm, 1.6 * cm, 1.4 * cm, 1.4 * cm]
+    current_department = None
+    chunk = []
+    for row in rows:
+        if row['department'] != current_department:
+            if len(chunk) > 1:
+                yield _styled_table(chunk, widths, long=True, font_size=7)
+            current_department = row['department']
+            yield PageBreak()
+            yield Paragraph(
+                f"Student Status &mdash; {department_names.get(current_department, current_department)}",
+                styles['Heading2'],
+            )
+            chunk = [header]
+        chunk.append([
+            row['register_number'],
+            Paragraph(escape(row['student_name']), small),
+            Paragraph(escape(row['faculty_name']), small),
+            Paragraph(escape(row['company_name']), small),
+            status_names.get(row['application_status'], row['application_status']),
+            row['weeks_submitted'],
+            row['weeks_reviewed'],
+            row['proofs_total'],
+            '' if row['completion_score'] is None else f"{row['completion_score']:.1f}",
+        ])
+        if len(chunk) > STUDENT_TABLE_CHUNK:
+            yield _styled_table(chunk, widths, long=True, font_size=7)
+            chunk = [header]
+    if len(chunk) > 1:
+        yield _styled_table(chunk, widths, long=True, font_size=7)
+
+
+def build_full_report(output, department=None, rows=None):
+    """Multi-section institutional PDF: charts, department and faculty summaries, per-student tables.
+
+    ``rows`` defaults to the detail-export rows for ``department``; flowables
+    are generated on demand so memory does not grow with the number of rows.
+    """
+    if rows is None:
+        queryset = InternshipApplication.objects.all()
+        if department:
+            queryset = queryset.filter(student__department=department)
+        rows = iter_application_rows(queryset)
+
+    doc = SimpleDocTemplate(
+        output, pagesize=landscape(A4), title='SmartIntern Institutional Report',
+        leftMargin=1.5 * cm, rightMargin=1.5 * cm, topMargin=1.5 * cm, bottomMargin=1.5 * cm,
+    )
+    doc.build(LazyFlowables(_full_report_flowables(rows, department)))
+
+
+# report_type -> (builder, download filename, content type)
+REPORT_TYPES = {
+    'pdf': (build_pdf_report, 'internship_report.pdf', 'application/pdf'),
+    'full_pdf': (build_full_report, 'institutional_report.pdf', 'application/pdf'),
+    'transcripts': (build_transcripts_zip, 'transcripts.zip', 'application/zip'),
+    'excel': (build_excel_report, 'internship_report.xlsx',
+              'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
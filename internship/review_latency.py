@@ -0,0 +1,117 @@
+"""Review-latency SLA metrics for weekly logs and progress proofs.
+
+Each item type is fetched once as (faculty, department, submitted, reviewed)
+tuples. Latencies and backlog ages are then worked out with NumPy and split
+into per-faculty and per-department groups with a single sort, so the cost is
+one query per item type however many faculty there are.
+
+An item is charged to whoever reviewed it or, while still pending, to the
+faculty member assigned to the application.
+"""
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import UserProfile, WeeklyLog, ProgressProof
+
+PERCENTILES = (50, 90, 99)
+CACHE_KEY = 'review_latency'
+
+# kind -> (label, model, submitted field, reviewed field, reviewer FK)
+REVIEW_ITEMS = {
+    'logs': ('Weekly Logs', WeeklyLog, 'submission_date', 'review_date', 'reviewed_by'),
+    'proofs': ('Progress Proofs', ProgressProof, 'submission_date', 'verification_date', 'verified_by'),
+}
+
+
+def _fetch(kind):
+    """Return (faculty ids, department codes, submitted, reviewed) arrays; times are epoch seconds, NaN if unset."""
+    _, model, submitted_field, reviewed_field, reviewer = REVIEW_ITEMS[kind]
+    rows = list(model.objects.values_list(
+        Coalesce(f'{reviewer}_id', 'application__assigned_faculty_id'),
+        'student__department',
+        submitted_field,
+        reviewed_field,
+    ).order_by().iterator(chunk_size=5000))
+    if not rows:
+        empty = np.array([])
+        return empty.astype(np.int64), empty.astype(object), empty, empty
+
+    faculty, departments, submitted, reviewed = zip(*rows)
+    faculty = np.array([pk if pk is not None else -1 for pk in faculty], dtype=np.int64)
+    submitted = np.array([dt.timestamp() if dt else np.nan for dt in submitted])
+    reviewed = np.array([dt.timestamp() if dt else np.nan for dt in reviewed])
+    return faculty, np.array(departments, dtype=object), submitted, reviewed
+
+
+def _summary(latency, age):
+    """Stats for one group; ``latency`` and ``age`` are hours, NaN where not applicable."""
+    done = latency[~np.isnan(latency)]
+    pending = age[~np.isnan(age)]
+    summary = {'reviewed': int(done.size), 'pending': int(pending.size)}
+    values = np.percentile(done, PERCENTILES) if done.size else [None] * len(PERCENTILES)
+    for p, value in zip(PERCENTILES, values):
+        summary[f'p{p}'] = None if value is None else round(float(value), 1)
+    summary['backlog_median'] = round(float(np.median(pending)), 1) if pending.size else None
+    summary['backlog_oldest'] = round(float(pending.max()), 1) if pending.size else None
+    return summary
+
+
+def _grouped(keys, latency, age):
+    """Yield (key, summary) per distinct key, splitting one stable sort into runs."""
+    if not keys.size:
+        return
+    labels, codes = np.unique(keys, return_inverse=True)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    for label, chunk in zip(labels, np.split(order, bounds)):
+        yield label, _summary(latency[chunk], age[chunk])
+
+
+def _worst_first(rows):
+    # Slowest p90 first; groups with nothing reviewed yet sort by their oldest backlog
+    return sorted(rows, key=lambda r: (r['p90'] if r['p90'] is not None else -1, r['backlog_oldest'] or 0),
+                  reverse=True)
+
+
+def compute_review_latency(now=None):
+    now = (now or timezone.now()).timestamp()
+    department_names = dict(UserProfile.DEPARTMENT_CHOICES)
+    faculty_names = {
+        pk: (name, department)
+        for pk, name, department in UserProfile.objects.filter(role='faculty').values_list('pk', 'full_name', 'department')
+    }
+
+    result = {}
+    for kind, (label, *_) in REVIEW_ITEMS.items():
+        faculty, departments, submitted, reviewed = _fetch(kind)
+        latency = (reviewed - submitted) / 3600
+        age = np.where(np.isnan(reviewed), (now - submitted) / 3600, np.nan)
+
+        faculty_rows = []
+        for pk, summary in _grouped(faculty, latency, age):
+            name, department = faculty_names.get(int(pk), ('Unassigned', ''))
+            summary.update(name=name, department=department_names.get(department, department))
+            faculty_rows.append(summary)
+        department_rows = []
+        for code, summary in _grouped(departments, latency, age):
+            summary.update(name=department_names.get(code, code))
+            department_rows.append(summary)
+
+        overall = _summary(latency, age)
+        overall['name'] = 'All'
+        result[kind] = {
+            'label': label,
+            'faculty': _worst_first(faculty_rows),
+            'departments': _worst_first(department_rows),
+            'overall': overall,
+        }
+    return result
+
+
+def review_latency():
+    """Cached ``compute_review_latency``."""
+    return cache.get_or_set(CACHE_KEY, compute_review_latency, getattr(settings, 'REVIEW_LATENCY_CACHE_SECONDS', 900))
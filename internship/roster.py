@@ -0,0 +1,308 @@
+"""Incremental sync of the registrar's faculty and student CSVs.
+
+Each CSV row is reduced to a canonical record and hashed. RosterEntry keeps
+that hash next to the profile the row produced, so a sync only writes rows
+that are new or whose hash changed, and deactivates (never deletes) people
+who have dropped out of the file. Existing users are prefetched once and all
+writes go through ``bulk_create``/``bulk_update``.
+
+Students are keyed by register number. Faculty are keyed by ``roster_key``
+(department and normalized name), never by username: usernames are numbered
+in file order when names collide, so keying on them would swap two people
+with the same name as soon as a row moved. A faculty member keeps the
+username they were first given; only new faculty get a fresh one.
+
+Only users the sync has recorded an entry for are ever deactivated; accounts
+created by hand or by ``load_csv_to_db`` are adopted on their first sync.
+
+The scraper's ``--delta`` output (faculty added, removed or changed since
+its previous run) can be applied with ``apply_faculty_delta`` instead of a
+full faculty sync. Delta rows are matched to existing faculty the same way.
+"""
+
+import csv
+import hashlib
+import json
+import re
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from .catalog import DEPT_MAPPING, faculty_key
+from .models import UserProfile, RosterEntry
+from .provisioning import generate_password, hash_passwords
+
+BATCH_SIZE = 1000
+
+# Prefixes to remove from faculty names (handles formats like "Dr.A.Name" or "Dr. Name")
+NAME_PREFIXES = ['dr', 'ms', 'mr', 'mrs', 'prof']
+
+# source -> (role, employee_id prefix, mobile prefix, default password)
+ROSTER_SOURCES = {
+    'faculty': ('faculty', 'FC', '98765', 'faculty123'),
+    'student': ('student', 'ST', '99999', 'student123'),
+}
+
+USER_FIELDS = ['email']
+PROFILE_FIELDS = ['full_name', 'department', 'register_number', 'year_of_study', 'email_id']
+
+
+def faculty_username(faculty_name, used_usernames):
+    """first_last username for a faculty name, numbered if already in ``used_usernames`` (which is updated)"""
+    # First, remove common prefixes (Dr., Ms., Mr., etc.) at the start
+    clean_name = faculty_name.strip()
+    for prefix in NAME_PREFIXES:
+        clean_name = re.sub(rf'^{prefix}\.?\s*', '', clean_name, flags=re.IGNORECASE)
+
+    # "A.Maheswari" -> ['A', 'Maheswari']; single letter initials are dropped
+    parts = re.split(r'[\.\s]+', clean_name)
+    name_parts = [p for p in parts if len(p) > 1]
+    if len(name_parts) >= 2:
+        base_username = f'{name_parts[0]}_{name_parts[-1]}'.lower()
+    elif len(name_parts) == 1:
+        base_username = name_parts[0].lower()
+    else:
+        # Fallback: use all parts if no multi-char names found
+        base_username = '_'.join(parts).lower()
+    base_username = re.sub(r'[^a-z0-9_]', '', base_username)
+
+    username = base_username
+    counter = 1
+    while username in used_usernames:
+        username = f'{base_username}{counter}'
+        counter += 1
+    used_usernames.add(username)
+    return username
+
+
+def roster_key(faculty_name, department):
+    """RosterEntry key of a faculty member: department code and normalized name"""
+    name, department = faculty_key(faculty_name, department)
+    return f'{department}/{name}'
+
+
+def faculty_record(username, row):
+    return {
+        'username': username,
+        'email': f'{username}@hicas.ac.in',
+        'full_name': row['Faculty Name'],
+        'department': DEPT_MAPPING.get(row['Department'], 'CSE'),
+        'register_number': None,
+        'year_of_study': None,
+        'email_id': f'{username}@hicas.ac.in',
+    }
+
+
+def faculty_usernames_by_key():
+    """roster_key -> username of every existing faculty member, and the set of all usernames in use"""
+    existing = {
+        roster_key(profile.full_name, profile.department): profile.user.username
+        for profile in UserProfile.objects.filter(role='faculty').select_related('user')
+    }
+    return existing, set(User.objects.values_list('username', flat=True))
+
+
+def faculty_records(path):
+    """Yield (roster_key, record) for each row of the faculty CSV.
+
+    Faculty already in the database keep their username; new ones get the
+    next free first_last username.
+    """
+    existing, used_usernames = faculty_usernames_by_key()
+    with open(path, 'r', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            key = roster_key(row['Faculty Name'], DEPT_MAPPING.get(row['Department'], 'CSE'))
+            if key not in existing:
+                existing[key] = faculty_username(row['Faculty Name'], used_usernames)
+            yield key, faculty_record(existing[key], row)
+
+
+def student_records(path):
+    """Yield (register number, record) for each row of the student CSV"""
+    with open(path, 'r', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            reg_no = row['RegisterNumber']
+            yield reg_no, {
+                'username': reg_no,
+                'email': f'{reg_no}@student.hicas.ac.in',
+                'full_name': row['Student Name'],
+                'department': DEPT_MAPPING.get(row['Department'], 'CSE'),
+                'register_number': reg_no,
+                'year_of_study': int(row['Year']),
+                'email_id': f'{reg_no}@student.hicas.ac.in',
+            }
+
+
+def record_hash(record):
+    return hashlib.sha256(json.dumps(record, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _apply(obj, fields, record):
+    """Copy ``fields`` from record onto obj; returns True if anything changed"""
+    changed = False
+    for field in fields:
+        if getattr(obj, field) != record[field]:
+            setattr(obj, field, record[field])
+            changed = True
+    return changed
+
+
+def _next_number(prefix):
+    numbers = [
+        int(employee_id[len(prefix):])
+        for employee_id in UserProfile.objects.filter(employee_id__startswith=prefix).values_list('employee_id', flat=True)
+        if employee_id[len(prefix):].isdigit()
+    ]
+    return max(numbers, default=0) + 1
+
+
+def sync_roster(source, records, password=None, deactivate_missing=True, credentials=None, hash_workers=None):
+    """Bring users and profiles in line with ``records`` ((key, record) pairs).
+
+    A key with a RosterEntry updates that entry's profile; otherwise the
+    record's ``username`` is adopted if it exists, or created. Returns counts
+    of inserted, updated, unchanged, deactivated and skipped rows; rows are
+    skipped when their username belongs to a profile with a different role.
+    With ``deactivate_missing=False`` only the given records are touched, for
+    applying a partial roster.
+
+    New accounts share ``password`` (or the source's default) unless a
+    ``credentials`` list is given: then each gets its own random password,
+    hashed across ``hash_workers`` processes, and (username, role, password)
+    is appended to the list.
+    """
+    role, prefix, mobile_prefix, default_password = ROSTER_SOURCES[source]
+    records = dict(records)
+    hashes = {key: record_hash(record) for key, record in records.items()}
+    counts = dict.fromkeys(['inserted', 'updated', 'unchanged', 'deactivated', 'skipped'], 0)
+
+    with transaction.atomic():
+        entries = {entry.key: entry for entry in RosterEntry.objects.filter(source=source).select_related('profile__user')}
+        pending = []
+        for key in records:
+            entry = entries.get(key)
+            if entry and entry.row_hash == hashes[key] and entry.profile.user.is_active:
+                counts['unchanged'] += 1
+            else:
+                pending.append(key)
+        users = User.objects.select_related('profile').in_bulk(
+            [records[key]['username'] for key in pending if key not in entries], field_name='username'
+        )
+
+        users_to_update, profiles_to_update, new_keys = [], [], []
+        touched = {}  # key -> profile whose entry needs writing
+        for key in pending:
+            record = records[key]
+            if key in entries:
+                profile = entries[key].profile
+                user = profile.user
+            else:
+                user = users.get(record['username'])
+                profile = getattr(user, 'profile', None) if user else None
+            if profile is None:
+                new_keys.append(key)
+                continue
+            if profile.role != role:
+                counts['skipped'] += 1
+                continue
+
+            user_changed = _apply(user, USER_FIELDS, record)
+            if not user.is_active:
+                user.is_active = True
+                user_changed = True
+            if user_changed:
+                users_to_update.append(user)
+            profile_changed = _apply(profile, PROFILE_FIELDS, record)
+            if profile_changed:
+                profiles_to_update.append(profile)
+            counts['updated' if user_changed or profile_changed else 'unchanged'] += 1
+            touched[key] = profile
+
+        User.objects.bulk_update(users_to_update, USER_FIELDS + ['is_active'], batch_size=BATCH_SIZE)
+        UserProfile.objects.bulk_update(profiles_to_update, PROFILE_FIELDS, batch_size=BATCH_SIZE)
+
+        if new_keys:
+            usernames = {records[key]['username']: key for key in new_keys}
+            created = [username for username in usernames if username not in users]
+            if credentials is None:
+                password_hashes = dict.fromkeys(created, make_password(password or default_password))
+            else:
+                passwords = [generate_password() for _ in created]
+                password_hashes = dict(zip(created, hash_passwords(passwords, workers=hash_workers)[0]))
+                credentials.extend((username, role, new_password) for username, new_password in zip(created, passwords))
+            User.objects.bulk_create(
+                [User(username=username, password=password_hashes[username], email=records[usernames[username]]['email'])
+                 for username in created],
+                batch_size=BATCH_SIZE,
+            )
+            new_users = User.objects.in_bulk(list(usernames), field_name='username')
+            number = _next_number(prefix)
+            new_profiles = []
+            for offset, key in enumerate(new_keys):
+                profile = UserProfile(
+                    user=new_users[records[key]['username']],
+                    employee_id=f'{prefix}{number + offset:05d}',
+                    role=role,
+                    mobile_number=f'{mobile_prefix}{10000 + number + offset}',
+                )
+                _apply(profile, PROFILE_FIELDS, records[key])
+                new_profiles.append(profile)
+            UserProfile.objects.bulk_create(new_profiles, batch_size=BATCH_SIZE)
+            for profile in UserProfile.objects.filter(user__username__in=list(usernames)).select_related('user'):
+                touched[usernames[profile.user.username]] = profile
+            counts['inserted'] = len(new_keys)
+
+        now = timezone.now()
+        entries_to_create, entries_to_update = [], []
+        for key, profile in touched.items():
+            entry = entries.get(key)
+            if entry is None:
+                entries_to_create.append(RosterEntry(source=source, key=key, row_hash=hashes[key], profile=profile))
+            else:
+                entry.row_hash, entry.profile, entry.synced_at = hashes[key], profile, now
+                entries_to_update.append(entry)
+        RosterEntry.objects.bulk_create(entries_to_create, batch_size=BATCH_SIZE)
+        RosterEntry.objects.bulk_update(entries_to_update, ['row_hash', 'profile', 'synced_at'], batch_size=BATCH_SIZE)
+
+        stale = [entry for key, entry in entries.items() if key not in records] if deactivate_missing else []
+        if stale:
+            counts['deactivated'] = User.objects.filter(
+                pk__in=[entry.profile.user_id for entry in stale], is_active=True
+            ).update(is_active=False)
+            RosterEntry.objects.filter(pk__in=[entry.pk for entry in stale]).delete()
+
+    return counts
+
+
+def apply_faculty_delta(path, password=None, credentials=None, hash_workers=None):
+    """Apply a scraper delta CSV (Change column plus the faculty CSV columns); returns sync_roster's counts.
+
+    Added and changed rows are upserted under the username of the faculty
+    member with the same name and department, or a new one; removed rows
+    deactivate that faculty member.
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        rows = list(csv.DictReader(file))
+    existing, used_usernames = faculty_usernames_by_key()
+
+    upserts, removed = [], []
+    for row in rows:
+        key = roster_key(row['Faculty Name'], DEPT_MAPPING.get(row['Department'], 'CSE'))
+        if row['Change'] == 'removed':
+            if key in existing:
+                removed.append(key)
+        else:
+            if key not in existing:
+                existing[key] = faculty_username(row['Faculty Name'], used_usernames)
+            upserts.append((key, faculty_record(existing[key], row)))
+
+    with transaction.atomic():
+        counts = sync_roster('faculty', upserts, password, deactivate_missing=False, credentials=credentials,
+                             hash_workers=hash_workers)
+        counts['deactivated'] = User.objects.filter(
+            username__in=[existing[key] for key in removed], profile__role='faculty', is_active=True
+        ).update(is_active=False)
+        RosterEntry.objects.filter(source='faculty', key__in=removed).delete()
+    return counts
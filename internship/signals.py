@@ -1,6 +1,30 @@
-from django.db.models.signals import pre_save
+from django.db import transaction
+from django.db.models.signals import post_init, pre_save, post_save, post_delete
 from django.dispatch import receiver
-from .models import InternshipApplication, InternshipCompletion, ProgressProof
+from .cube import cube
+from .dimensions import DIMENSIONS, resolve
+from .funnel import invalidate_funnel
+from .models import InternshipApplication, InternshipCompletion, ProgressProof, WeeklyLog
+
+
+@receiver(post_init, sender=InternshipApplication)
+def remember_dimension_names(sender, instance, **kwargs):
+    """Keep the company and domain names the row was loaded with (None if deferred)"""
+    instance._dimension_names = {
+        raw_field: instance.__dict__.get(raw_field) for raw_field, *_ in DIMENSIONS.values()
+    }
+
+
+@receiver(pre_save, sender=InternshipApplication)
+def assign_application_dimensions(sender, instance, update_fields=None, **kwargs):
+    """Link the application to its canonical Company and Domain rows when it has none or its names changed"""
+    for dimension, (raw_field, *_) in DIMENSIONS.items():
+        if update_fields is not None and raw_field not in update_fields:
+            continue
+        name = getattr(instance, raw_field)
+        if getattr(instance, f'{dimension}_id') is None or name != instance._dimension_names[raw_field]:
+            setattr(instance, dimension, resolve(dimension, name))
+            instance._dimension_names[raw_field] = name
 
 
 @receiver(pre_save, sender=InternshipApplication)
@@ -44,3 +68,32 @@ def save_proof_files_to_db(sender, instance, **kwargs):
             }
             instance.proof_file_type = content_types.get(ext, 'application/octet-stream')
         instance.proof_file.seek(0)
+
+
+@receiver(post_save, sender=InternshipApplication)
+def update_analytics_cube(sender, instance, **kwargs):
+    """Apply the saved application to the in-memory analytics cube once committed"""
+    # Rows bulk-created or not yet backfilled can be saved with update_fields while unlinked;
+    # fall back to their raw names as cube.build does
+    domain = instance.domain.name if instance.domain_id else instance.internship_domain
+    company = instance.company.name if instance.company_id else instance.company_name
+    row = (instance.application_id, domain, company,
+           instance.student.department, instance.application_status, instance.start_date)
+    transaction.on_commit(lambda: cube.upsert(*row))
+
+
+@receiver(post_delete, sender=InternshipApplication)
+def remove_from_analytics_cube(sender, instance, **kwargs):
+    application_id = instance.application_id
+    transaction.on_commit(lambda: cube.remove(application_id))
+
+
+@receiver(post_save, sender=InternshipApplication)
+@receiver(post_delete, sender=InternshipApplication)
+@receiver(post_save, sender=WeeklyLog)
+@receiver(post_delete, sender=WeeklyLog)
+@receiver(post_save, sender=InternshipCompletion)
+@receiver(post_delete, sender=InternshipCompletion)
+def invalidate_funnel_cache(sender, **kwargs):
+    """Funnel stage counts change whenever any of these rows do"""
+    transaction.on_commit(invalidate_funnel)
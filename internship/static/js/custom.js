@@ -307,3 +307,55 @@ function exportTableToCSV(tableId, filename = 'export.csv') {
 }
 
 console.log('SmartIntern Custom JS Loaded ✓');
+
+// Client-side bar charts (ANALYTICS_CHART_MODE = 'json')
+function renderBarChart(container, series) {
+    const ns = 'http://www.w3.org/2000/svg';
+    const width = 640, height = 400;
+    const left = 50, right = 20, top = 40, bottom = 120;
+    const plotWidth = width - left - right;
+    const plotHeight = height - top - bottom;
+    const baseline = top + plotHeight;
+    const peak = Math.max(1, ...series.counts);
+    const slot = plotWidth / series.counts.length;
+    const barWidth = slot * 0.8;
+
+    const svg = document.createElementNS(ns, 'svg');
+    svg.setAttribute('viewBox', `0 0 ${width} ${height}`);
+    svg.setAttribute('class', 'img-fluid');
+    svg.setAttribute('font-family', 'sans-serif');
+    svg.setAttribute('font-size', '11');
+
+    const add = (tag, attrs, text) => {
+        const el = document.createElementNS(ns, tag);
+        Object.entries(attrs).forEach(([key, value]) => el.setAttribute(key, value));
+        if (text !== undefined) el.textContent = text;
+        svg.appendChild(el);
+        return el;
+    };
+
+    add('text', {x: width / 2, y: 22, 'text-anchor': 'middle', 'font-size': 15}, series.title);
+    add('line', {x1: left, y1: baseline, x2: width - right, y2: baseline, stroke: '#333'});
+    add('line', {x1: left, y1: top, x2: left, y2: baseline, stroke: '#333'});
+
+    series.counts.forEach((count, i) => {
+        const barHeight = count / peak * plotHeight;
+        const x = left + i * slot + (slot - barWidth) / 2;
+        const y = baseline - barHeight;
+        const centre = x + barWidth / 2;
+        add('rect', {x: x, y: y, width: barWidth, height: barHeight, fill: '#4CAF50'});
+        add('text', {x: centre, y: y - 4, 'text-anchor': 'middle'}, count);
+        add('text', {x: centre, y: baseline + 12, 'text-anchor': 'end',
+                     transform: `rotate(-45 ${centre} ${baseline + 12})`}, series.labels[i]);
+    });
+
+    add('text', {x: left + plotWidth / 2, y: height - 6, 'text-anchor': 'middle'}, series.xlabel);
+    container.appendChild(svg);
+}
+
+document.querySelectorAll('.js-bar-chart').forEach(container => {
+    const source = document.getElementById(container.dataset.series);
+    if (source) {
+        renderBarChart(container, JSON.parse(source.textContent));
+    }
+});
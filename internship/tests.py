@@ -1,3 +1,1140 @@
-from django.test import TestCase
+import csv
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO, StringIO
+from unittest.mock import patch
 
-# Create your tests here.
+import numpy as np
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, authenticate
+from django.contrib.auth.hashers import check_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from openpyxl import load_workbook
+from reportlab import rl_config
+
+import generate_simulated_students as generator
+import scrape_hicas_faculty as scraper
+
+from . import report_jobs
+from .backends import ProfileBackend
+from .benchmarks import StageRecorder, stage_finished
+from .charts import build_chart, generate_bar_chart, render_bar_chart_png
+from .copy_loader import RowStream
+from .cube import cube
+from .dimensions import add_alias, backfill, resolve
+from .exports import APPLICATION_DETAIL_COLUMNS, iter_application_rows, write_detail_workbook
+from .funnel import cohort_funnel
+from .heatmap import compute_heatmap, submission_matrix
+from .otp import EXPIRED, INVALID, VALID, CacheOTPStore, DatabaseOTPStore
+from .ingest import ChunkedCSVIngest, Checkpoint
+from .provisioning import generate_password, hash_passwords
+from .reports import build_full_report
+from .report_jobs import claim_next_job, purge_expired_jobs, request_report, requeue_stale_jobs, run_job
+from .review_latency import compute_review_latency
+from .transcripts import ZipSink, generate_transcripts, student_filter
+from .roster import apply_faculty_delta, faculty_records, sync_roster
+from .models import (COMPANY_SUFFIXES, Company, UserProfile, InternshipApplication, InternshipCompletion, WeeklyLog,
+                     PasswordResetOTP, ProgressProof, ReportJob, normalize_key)
+
+
+class ChartRenderingTests(SimpleTestCase):
+    def test_empty_data_returns_none(self):
+        self.assertIsNone(generate_bar_chart([], 'company_name', 'Top 10 Companies'))
+
+    def test_svg_mode_escapes_labels(self):
+        data = [{'company_name': 'L&T Infotech', 'count': 3}, {'company_name': 'Zoho', 'count': 1}]
+        chart = build_chart(data, 'company_name', 'Top 10 Companies', mode='svg')
+        self.assertEqual(chart['mode'], 'svg')
+        self.assertTrue(chart['content'].startswith('<svg'))
+        self.assertIn('L&amp;T Infotech', chart['content'])
+
+    def test_json_mode_returns_series(self):
+        data = [{'internship_domain': 'Data Analyst', 'count': 4}]
+        chart = build_chart(data, 'internship_domain', 'Domain-wise Internships', mode='json')
+        self.assertEqual(chart['content']['labels'], ['Data Analyst'])
+        self.assertEqual(chart['content']['counts'], [4])
+
+    def test_render_failure_is_logged(self):
+        data = [{'company_name': 'Zoho', 'count': 1}]
+        with patch('internship.charts.render_bar_chart_svg', side_effect=ValueError('bad font')), \
+                self.assertLogs('internship.charts', 'ERROR') as logs:
+            self.assertIsNone(build_chart(data, 'company_name', 'Top 10 Companies', mode='svg'))
+        self.assertIn('ValueError: bad font', logs.output[0])
+
+    def test_concurrent_rendering_from_many_threads(self):
+        def render(i):
+            labels = [f'Company {i}-{n}' for n in range(8)]
+            counts = [i + n for n in range(8)]
+            return render_bar_chart_png(labels, counts, f'Chart {i}', 'Company')
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            images = list(pool.map(render, range(24)))
+
+        self.assertEqual(len(images), 24)
+        for image in images:
+            self.assertTrue(image.startswith(b'\x89PNG\r\n\x1a\n'))
+        # Each chart carries its own title and data, so no two should collide
+        self.assertEqual(len(set(images)), 24)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.profiles = {}
+        for key, role, department in [('cse', 'student', 'CSE'), ('it', 'student', 'IT'),
+                                      ('cse-fac', 'faculty', 'CSE'), ('admin', 'admin', 'CSE')]:
+            user = User.objects.create_user(username=f'export-{key}', password='x')
+            self.profiles[key] = UserProfile.objects.create(
+                user=user, employee_id=f'EX-{key}', full_name=f'Export {key}', role=role, department=department,
+                register_number=f'REG-{key}' if role == 'student' else None, email_id=f'{key}@example.com',
+                mobile_number='0',
+            )
+        # (student, company, status, log review statuses, proof statuses, completion score)
+        for key, company, status, logs, proofs, score in [
+            ('cse', 'TCS', 'approved', ['reviewed', 'reviewed', 'pending'], ['verified', 'pending'], '87.50'),
+            ('cse', 'Zoho', 'pending_faculty', [], [], None),
+            ('it', 'Infosys', 'approved', ['reviewed'], ['verified'], None),
+        ]:
+            student = self.profiles[key]
+            application = InternshipApplication.objects.create(
+                student=student, company_name=company, internship_domain='Testing', internship_mode='online',
+                application_status=status, assigned_faculty=self.profiles['cse-fac'],
+                start_date=date(2024, 6, 1), end_date=date(2024, 7, 1),
+            )
+            for week, review_status in enumerate(logs, start=1):
+                WeeklyLog.objects.create(student=student, application=application, week_number=week,
+                                         review_status=review_status)
+            for verification_status in proofs:
+                ProgressProof.objects.create(student=student, application=application, proof_type='report',
+                                             title='Proof', description='d', verification_status=verification_status)
+            if score:
+                InternshipCompletion.objects.create(student=student, application=application, total_duration=30,
+                                                    completion_score=score)
+
+    def test_detail_workbook_has_a_sheet_per_department(self):
+        output = BytesIO()
+        summary = ('Summary', ['Department', 'Applications'], [['CSE', 2], ['IT', 1]])
+        self.assertEqual(write_detail_workbook(output, iter_application_rows(), [summary]), 3)
+
+        workbook = load_workbook(output)
+        self.assertEqual(workbook.sheetnames, ['Summary', 'CSE', 'IT'])
+        headers = [header for _, header in APPLICATION_DETAIL_COLUMNS]
+        keys = [key for key, _ in APPLICATION_DETAIL_COLUMNS]
+        for department in ['CSE', 'IT']:
+            header, *rows = workbook[department].iter_rows(values_only=True)
+            self.assertEqual(list(header), headers)
+            self.assertEqual(len(rows), InternshipApplication.objects.filter(student__department=department).count())
+            for values in rows:
+                row = dict(zip(keys, values))
+                application = InternshipApplication.objects.get(application_id=row['application_id'])
+                self.assertEqual(row['department'], application.student.get_department_display())
+                self.assertEqual(row['weeks_submitted'], application.logs.count())
+                self.assertEqual(row['weeks_reviewed'], application.logs.filter(review_status='reviewed').count())
+                self.assertEqual(row['proofs_total'], application.progress_proofs.count())
+                self.assertEqual(row['proofs_verified'],
+                                 application.progress_proofs.filter(verification_status='verified').count())
+                completion = InternshipCompletion.objects.filter(application=application).first()
+                self.assertEqual(row['completion_score'], completion and float(completion.completion_score))
+
+    def test_faculty_workbook_is_limited_to_their_department(self):
+        cube.build()
+        for profile, sheets in [('cse-fac', ['Domain Wise', 'Company Wise', 'CSE']),
+                                ('admin', ['Domain Wise', 'Company Wise', 'CSE', 'IT'])]:
+            self.client.force_login(self.profiles[profile].user)
+            response = self.client.get(reverse('download_excel'))
+            workbook = load_workbook(BytesIO(b''.join(response.streaming_content)))
+            self.assertEqual(workbook.sheetnames, sheets)
+            companies = {company for company, _ in workbook['Company Wise'].iter_rows(min_row=2, values_only=True)}
+            self.assertEqual(companies, {'TCS', 'Zoho'} if profile == 'cse-fac' else {'TCS', 'Zoho', 'Infosys'})
+
+    def export(self, profile, dataset='applications', fmt='csv', **params):
+        self.client.force_login(self.profiles[profile].user)
+        response = self.client.get(reverse('export_data', args=[dataset, fmt]), params)
+        if response.status_code != 200 or not response.streaming:
+            return response, None
+        body = b''.join(response.streaming_content).decode('utf-8')
+        if fmt == 'csv':
+            return response, list(csv.reader(StringIO(body)))
+        return response, [json.loads(line) for line in body.splitlines()]
+
+    def test_export_selected_columns_and_filters(self):
+        _, rows = self.export('admin', columns='company_name,application_status')
+        self.assertEqual(rows, [['company_name', 'application_status'], ['TCS', 'approved'],
+                                ['Zoho', 'pending_faculty'], ['Infosys', 'approved']])
+        _, rows = self.export('admin', columns='company_name', status='approved', department='IT')
+        self.assertEqual(rows, [['company_name'], ['Infosys']])
+
+        response, records = self.export('admin', 'weekly-logs', 'ndjson', columns='week_number,review_status',
+                                        status='reviewed')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(len(records), 3)
+        self.assertEqual(set(records[0]), {'week_number', 'review_status'})
+        _, rows = self.export('admin', 'proofs')
+        self.assertNotIn('proof_file_data', rows[0])
+
+    def test_export_rejects_unknown_columns_and_datasets(self):
+        response, _ = self.export('admin', columns='company_name,password')
+        self.assertEqual((response.status_code, response.content), (400, b'Unknown columns: password'))
+        self.assertEqual(self.export('admin', 'users')[0].status_code, 404)
+        self.assertEqual(self.export('admin', fmt='xlsx')[0].status_code, 404)
+        self.assertEqual(self.export('admin', date_from='June')[0].status_code, 400)
+
+    def test_faculty_export_is_limited_to_their_department(self):
+        _, rows = self.export('cse-fac', columns='company_name,department', department='IT')
+        self.assertEqual(rows, [['company_name', 'department'], ['TCS', 'CSE'], ['Zoho', 'CSE']])
+        response, _ = self.export('cse')
+        self.assertEqual(response.status_code, 302)  # students can't export
+
+
+class ReportJobQueueTests(TestCase):
+    def build(self, output, **params):
+        output.write(b'report')
+
+    def test_identical_requests_share_a_job(self):
+        job, created = request_report(None, 'pdf', {'department': 'CSE'})
+        self.assertTrue(created)
+        self.assertEqual(request_report(None, 'pdf', {'department': 'CSE'}), (job, False))
+        self.assertTrue(request_report(None, 'pdf', {'department': 'IT'})[1])
+
+        ReportJob.objects.filter(pk=job.pk).update(status='done', expires_at=timezone.now() + timedelta(hours=1))
+        self.assertEqual(request_report(None, 'pdf', {'department': 'CSE'}), (job, False))
+        ReportJob.objects.filter(pk=job.pk).update(expires_at=timezone.now() - timedelta(hours=1))
+        self.assertTrue(request_report(None, 'pdf', {'department': 'CSE'})[1])
+
+    def test_competing_job_finishing_during_insert(self):
+        competitor, _ = request_report(None, 'pdf')
+        lookups = []
+
+        def find_report_job(dedup_key):
+            lookups.append(dedup_key)
+            if len(lookups) == 1:
+                return None  # the competitor isn't visible yet, so the insert collides with it
+            ReportJob.objects.filter(pk=competitor.pk).update(status='failed')  # ...and fails before the retry
+            return real_find_report_job(dedup_key)
+
+        real_find_report_job = report_jobs.find_report_job
+        with patch.object(report_jobs, 'find_report_job', find_report_job):
+            job, created = request_report(None, 'pdf')
+        self.assertTrue(created)
+        self.assertNotEqual(job.pk, competitor.pk)
+
+    def test_claim_takes_the_oldest_queued_job(self):
+        newer = ReportJob.objects.create(report_type='pdf', dedup_key='a')
+        older = ReportJob.objects.create(report_type='pdf', dedup_key='b')
+        ReportJob.objects.filter(pk=older.pk).update(created_at=timezone.now() - timedelta(minutes=5))
+
+        self.assertEqual(claim_next_job('w1').pk, older.pk)
+        self.assertEqual(claim_next_job('w2').pk, newer.pk)
+        self.assertIsNone(claim_next_job('w3'))
+        older.refresh_from_db()
+        self.assertEqual((older.status, older.worker), ('running', 'w1'))
+        self.assertIsNotNone(older.heartbeat_at)
+
+    def test_stale_job_is_requeued_and_its_old_worker_result_discarded(self):
+        ReportJob.objects.create(report_type='pdf', dedup_key='a')
+        ReportJob.objects.create(report_type='pdf', dedup_key='b')
+        stalled, alive = claim_next_job('w1'), claim_next_job('w2')
+        ReportJob.objects.filter(pk=stalled.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(requeue_stale_jobs(), 1)
+        self.assertEqual(ReportJob.objects.get(pk=alive.pk).status, 'running')
+        takeover = claim_next_job('w3')
+        self.assertEqual(takeover.pk, stalled.pk)
+
+        with patch.dict(report_jobs.REPORT_TYPES, {'pdf': (self.build, 'report.pdf', 'application/pdf')}):
+            self.assertIsNone(run_job(stalled))  # w1 comes back after losing the job
+            self.assertEqual(ReportJob.objects.get(pk=stalled.pk).worker, 'w3')
+            self.assertEqual(run_job(takeover).status, 'done')
+        job = ReportJob.objects.get(pk=stalled.pk)
+        self.assertEqual((job.status, bytes(job.result_data)), ('done', b'report'))
+
+    def test_faculty_only_reach_their_department_jobs(self):
+        profiles = {}
+        for key, role, department in [('cse', 'faculty', 'CSE'), ('it', 'faculty', 'IT'), ('admin', 'admin', 'CSE')]:
+            user = User.objects.create_user(username=f'jobs-{key}', password='x')
+            profiles[key] = UserProfile.objects.create(
+                user=user, employee_id=f'JB-{key}', full_name=key, role=role, department=department,
+                email_id=f'{key}@example.com', mobile_number='0',
+            )
+
+        self.client.force_login(profiles['cse'].user)
+        for report_type in ['pdf', 'full_pdf', 'transcripts', 'excel']:
+            self.client.post(reverse('request_report_job'), {'report_type': report_type})
+        self.assertEqual(list(ReportJob.objects.values_list('params', flat=True)), [{'department': 'CSE'}] * 4)
+        cse_job = ReportJob.objects.get(report_type='transcripts')
+        admin_job, _ = request_report(profiles['admin'], 'transcripts')
+        ReportJob.objects.update(status='done', result_data=b'report', result_name='report.zip',
+                                 result_type='application/zip', expires_at=timezone.now() + timedelta(hours=1))
+
+        for profile, job, visible in [('cse', cse_job, True), ('cse', admin_job, False), ('it', cse_job, False),
+                                      ('admin', cse_job, True), ('admin', admin_job, True)]:
+            self.client.force_login(profiles[profile].user)
+            for view in ['report_job_status', 'download_report_job']:
+                response = self.client.get(reverse(view, args=[job.job_id]))
+                self.assertEqual(response.status_code, 200 if visible else 404, (profile, job.params, view))
+
+    def test_purge_deletes_only_expired_finished_jobs(self):
+        past, future = timezone.now() - timedelta(hours=1), timezone.now() + timedelta(hours=1)
+        for key, status, expires_at in [('a', 'done', past), ('b', 'failed', past), ('c', 'done', future),
+                                        ('d', 'queued', None)]:
+            ReportJob.objects.create(report_type='pdf', dedup_key=key, status=status, expires_at=expires_at)
+        self.assertEqual(purge_expired_jobs(), 2)
+        self.assertEqual(sorted(ReportJob.objects.values_list('dedup_key', flat=True)), ['c', 'd'])
+
+
+class FullReportTests(TestCase):
+    def build(self, rows, lazy):
+        output = BytesIO()
+        with patch.object(rl_config, 'invariant', 1), \
+                patch('internship.reports.timezone.localtime', return_value=datetime(2024, 7, 1, 9, 30)):
+            if lazy:
+                build_full_report(output, rows=iter(rows))
+            else:
+                with patch('internship.reports.LazyFlowables', list):
+                    build_full_report(output, rows=iter(rows))
+        return output.getvalue()
+
+    def test_lazy_build_matches_eager_build(self):
+        rows = [
+            {'department': department, 'register_number': f'{department}{i:03d}', 'student_name': f'Student {i}',
+             'faculty_name': 'Dr. Rao', 'company_name': 'TCS', 'application_status': 'approved',
+             'weeks_submitted': i % 8, 'weeks_reviewed': i % 5, 'proofs_total': i % 3,
+             'completion_score': None if i % 4 else 80.0 + i % 10}
+            for department in ['CSE', 'IT'] for i in range(90)
+        ]
+        with patch('internship.reports.STUDENT_TABLE_CHUNK', 10):
+            lazy, eager = self.build(rows, lazy=True), self.build(rows, lazy=False)
+        self.assertGreater(lazy.count(b'/Type /Page\n'), 4)
+        self.assertEqual(lazy, eager)
+
+
+class TranscriptTests(TestCase):
+    def setUp(self):
+        self.students = {}
+        for key, department, year, reg_no in [('a', 'CSE', 1, '21CS01'), ('b', 'CSE', 2, '21CS01'),
+                                              ('c', 'IT', 1, '21IT01')]:
+            user = User.objects.create_user(username=f'transcript-{key}', password='x')
+            self.students[key] = UserProfile.objects.create(
+                user=user, employee_id=f'TR{key}', full_name=f'Student {key}', role='student', department=department,
+                year_of_study=year, register_number=reg_no, email_id=f'{key}@example.com', mobile_number='0',
+            )
+
+    def names(self, *keys):
+        return {f'{self.students[key].register_number}-{self.students[key].pk}.pdf' for key in keys}
+
+    def test_filters_and_shared_register_numbers(self):
+        a, b, c = self.students['a'], self.students['b'], self.students['c']
+        self.assertEqual(list(student_filter()), [a, b, c])
+        self.assertEqual(list(student_filter(department='CSE')), [a, b])
+        self.assertEqual(list(student_filter(year=1)), [a, c])
+        self.assertEqual(list(student_filter(department='CSE', year=2, student_ids=[b.pk, c.pk])), [b])
+
+        output = BytesIO()
+        sink = ZipSink(output)
+        self.assertEqual(generate_transcripts(student_filter(department='CSE'), sink, workers=1)[0], 2)
+        sink.close()
+        # a and b share a register number and still get a transcript each
+        self.assertEqual(set(zipfile.ZipFile(output).namelist()), self.names('a', 'b'))
+
+    def test_resume_after_run_killed_before_close(self):
+        with tempfile.TemporaryDirectory() as directory:
+            target = os.path.join(directory, 'transcripts.zip')
+            sink = ZipSink(target)
+            generate_transcripts(student_filter(student_ids=[self.students['a'].pk]), sink, workers=1)
+            sink.close()
+            # The next run dies after one transcript, without closing the archive
+            sink = ZipSink(target, resume=True)
+            generate_transcripts(student_filter(student_ids=[self.students['b'].pk]), sink, workers=1, resume=True)
+            with zipfile.ZipFile(target) as archive:
+                self.assertEqual(set(archive.namelist()), self.names('a'))
+
+            sink = ZipSink(target, resume=True)
+            self.assertEqual(sink.existing(), self.names('a', 'b'))
+            self.assertEqual(generate_transcripts(student_filter(), sink, workers=1, resume=True)[0], 1)
+            sink.close()
+            with zipfile.ZipFile(target) as archive:
+                self.assertEqual(set(archive.namelist()), self.names('a', 'b', 'c'))
+                self.assertIsNone(archive.testzip())
+            self.assertEqual(os.listdir(directory), ['transcripts.zip'])
+
+    def test_faculty_transcript_job_covers_only_their_department(self):
+        user = User.objects.create_user(username='transcript-faculty', password='x')
+        UserProfile.objects.create(user=user, employee_id='TRF', full_name='Faculty', role='faculty', department='CSE',
+                                   email_id='f@example.com', mobile_number='0')
+        self.client.force_login(user)
+        self.client.post(reverse('request_report_job'), {'report_type': 'transcripts'})
+
+        job = run_job(claim_next_job('w1'))
+        self.assertEqual(job.params, {'department': 'CSE'})
+        self.assertEqual(set(zipfile.ZipFile(BytesIO(bytes(job.result_data))).namelist()), self.names('a', 'b'))
+
+    def test_admin_action_follows_the_job_in_the_admin(self):
+        superuser = User.objects.create_superuser(username='transcript-root', password='x')
+        self.client.force_login(superuser)
+        response = self.client.post(reverse('admin:internship_userprofile_changelist'), {
+            'action': 'generate_transcripts', '_selected_action': [self.students['a'].pk],
+        })
+        job = ReportJob.objects.get()
+        self.assertEqual((job.requested_by, job.params), (None, {'student_ids': [self.students['a'].pk]}))
+        self.assertRedirects(response, reverse('admin:internship_reportjob_change', args=[job.pk]))
+
+
+class AnalyticsCubeTests(TestCase):
+    def setUp(self):
+        students = []
+        for n, department in enumerate(['CSE', 'CSE', 'IT']):
+            user = User.objects.create_user(username=f'cube{n}', password='x')
+            students.append(UserProfile.objects.create(
+                user=user, employee_id=f'CUBE{n}', full_name=f'Student {n}', role='student',
+                department=department, email_id=f'cube{n}@example.com', mobile_number='0',
+            ))
+        rows = [
+            (0, 'TCS', 'Web Development', 'approved', date(2024, 1, 10)),
+            (1, 'TCS', 'Data Analyst', 'pending_faculty', date(2024, 2, 5)),
+            (2, 'Infosys', 'Web Development', 'approved', date(2024, 2, 20)),
+            (2, 'Wipro', 'Testing', 'rejected_faculty', date(2024, 3, 1)),
+        ]
+        for student, company, domain, status, start in rows:
+            InternshipApplication.objects.create(
+                student=students[student], company_name=company, internship_domain=domain,
+                internship_mode='online', application_status=status, start_date=start, end_date=start,
+            )
+        self.students = students
+        cube.build()
+
+    def test_rollup_matches_group_by(self):
+        expected = {
+            row['company_name']: row['count']
+            for row in InternshipApplication.objects.values('company_name').annotate(count=Count('pk'))
+        }
+        result = cube.rollup('company_name')
+        self.assertEqual({row['company_name']: row['count'] for row in result}, expected)
+        self.assertEqual(result[0], {'company_name': 'TCS', 'count': 2})
+
+    def test_filters_and_multi_dimension_rollup(self):
+        self.assertEqual(cube.count(department='IT'), 2)
+        self.assertEqual(cube.count(status='approved', date_from=date(2024, 2, 1)), 1)
+        self.assertEqual(cube.count(department='NOPE'), 0)
+        self.assertEqual(
+            cube.rollup('department', 'month', status='approved'),
+            [{'department': 'CSE', 'month': '2024-01', 'count': 1},
+             {'department': 'IT', 'month': '2024-02', 'count': 1}],
+        )
+
+    def test_incremental_updates_on_save_and_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            application = InternshipApplication.objects.create(
+                student=self.students[0], company_name='Zoho', internship_domain='Testing',
+                internship_mode='online', application_status='approved',
+                start_date=date(2024, 4, 1), end_date=date(2024, 5, 1),
+            )
+        self.assertEqual(cube.count(), 5)
+        self.assertIn({'company_name': 'Zoho', 'count': 1}, cube.rollup('company_name'))
+
+        application.application_status = 'rejected_faculty'
+        with self.captureOnCommitCallbacks(execute=True):
+            application.save()
+        self.assertEqual(cube.count(status='approved'), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            application.delete()
+        self.assertEqual(cube.count(), 4)
+
+
+class DimensionTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='dim', password='x')
+        self.student = UserProfile.objects.create(
+            user=user, employee_id='DIM', full_name='Student', role='student',
+            department='CSE', email_id='dim@example.com', mobile_number='0',
+        )
+
+    def apply(self, company, domain='Web Development'):
+        return InternshipApplication.objects.create(
+            student=self.student, company_name=company, internship_domain=domain, internship_mode='online',
+            start_date=date(2024, 1, 1), end_date=date(2024, 2, 1),
+        )
+
+    def test_normalize_key(self):
+        for name in ['TCS', 'tcs.', 'TCS (Tata Consultancy Services)', 'TCS Pvt. Ltd.']:
+            self.assertEqual(normalize_key(name, COMPANY_SUFFIXES), 'tcs')
+        self.assertEqual(normalize_key('L&T Infotech', COMPANY_SUFFIXES), 'l and t infotech')
+        self.assertEqual(normalize_key('Limited', COMPANY_SUFFIXES), 'limited')
+
+    def test_variants_share_a_company_on_save(self):
+        first = self.apply('TCS')
+        second = self.apply('TCS (Tata Consultancy Services)', domain='web  development')
+        self.assertEqual(first.company_id, second.company_id)
+        self.assertEqual(first.domain_id, second.domain_id)
+        self.assertEqual(Company.objects.get().name, 'TCS')
+
+    def test_names_resolved_only_when_new_or_changed(self):
+        application = InternshipApplication.objects.get(pk=self.apply('TCS').pk)
+        with patch('internship.signals.resolve', wraps=resolve) as resolve_mock:
+            application.application_status = 'approved'
+            application.save()
+            resolve_mock.assert_not_called()
+
+            application.company_name = 'Infosys'
+            application.save()
+            resolve_mock.assert_called_once_with('company', 'Infosys')
+            application.save(update_fields=['application_status'])
+            self.assertEqual(resolve_mock.call_count, 1)
+        application.refresh_from_db()
+        self.assertEqual((application.company.name, application.domain.name), ('Infosys', 'Web Development'))
+
+    def test_unlinked_row_saved_with_update_fields(self):
+        application = InternshipApplication.objects.get(pk=self.apply('TCS').pk)
+        InternshipApplication.objects.filter(pk=application.pk).update(company=None, domain=None)
+        application = InternshipApplication.objects.get(pk=application.pk)
+        cube.build()
+        application.application_status = 'approved'
+        with self.captureOnCommitCallbacks(execute=True):
+            application.save(update_fields=['application_status'])
+        self.assertEqual(cube.rollup('company_name', status='approved'), [{'company_name': 'TCS', 'count': 1}])
+
+    def test_backfill_links_rows_and_applies_aliases(self):
+        self.apply('TCS')
+        self.apply('Tata Consultancy Services')
+        InternshipApplication.objects.update(company=None)
+        Company.objects.all().delete()
+
+        add_alias('company', 'Tata Consultancy Services', 'TCS')
+        created, updated = backfill('company')
+        self.assertEqual((created, updated), (0, 2))
+        self.assertEqual(
+            list(InternshipApplication.objects.values_list('company__name', flat=True).distinct()), ['TCS']
+        )
+
+
+class FunnelTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='funnel', password='x')
+        self.student = UserProfile.objects.create(
+            user=user, employee_id='FUN', full_name='Student', role='student',
+            department='CSE', email_id='funnel@example.com', mobile_number='0',
+        )
+        self.applications = [
+            InternshipApplication.objects.create(
+                student=self.student, company_name='TCS', internship_domain='Testing', internship_mode='online',
+                application_status=status, start_date=date(2024, 6, 1), end_date=date(2024, 7, 1),
+            )
+            for status in ['approved', 'approved', 'pending_faculty']
+        ]
+        approved = self.applications[0]
+        for week, review_status in [(1, 'reviewed'), (2, 'pending')]:
+            WeeklyLog.objects.create(student=self.student, application=approved, week_number=week,
+                                     review_status=review_status)
+        InternshipCompletion.objects.create(student=self.student, application=approved, total_duration=30,
+                                            faculty_verification_status='verified')
+
+    def test_stage_counts_in_one_query(self):
+        with self.assertNumQueries(1):
+            funnel = cohort_funnel('intake')
+        row = funnel['rows'][0]
+        self.assertEqual(row['cohort'], '2024-06')
+        self.assertEqual([stage['count'] for stage in row['stages']], [3, 2, 1, 1, 1, 1])
+        self.assertEqual((row['total_weeks_submitted'], row['total_weeks_reviewed']), (2, 1))
+        self.assertEqual(funnel['total']['stages'][1]['percent'], 66.7)
+
+    def test_cache_invalidated_on_save(self):
+        cohort_funnel('department')
+        with self.assertNumQueries(0):
+            cohort_funnel('department')
+        with self.captureOnCommitCallbacks(execute=True):
+            WeeklyLog.objects.create(student=self.student, application=self.applications[1], week_number=1)
+        self.assertEqual(cohort_funnel('department')['total']['weeks_submitted'], 2)
+
+
+class ReviewLatencyTests(TestCase):
+    def test_percentiles_and_backlog_per_faculty(self):
+        faculty_user = User.objects.create_user(username='lat-fac', password='x')
+        faculty = UserProfile.objects.create(
+            user=faculty_user, employee_id='LATF', full_name='Dr. Latency', role='faculty',
+            department='IT', email_id='latf@example.com', mobile_number='0',
+        )
+        student_user = User.objects.create_user(username='lat-stu', password='x')
+        student = UserProfile.objects.create(
+            user=student_user, employee_id='LATS', full_name='Student', role='student',
+            department='CSE', email_id='lats@example.com', mobile_number='0',
+        )
+        application = InternshipApplication.objects.create(
+            student=student, assigned_faculty=faculty, company_name='TCS', internship_domain='Testing',
+            internship_mode='online', start_date=date(2024, 1, 1), end_date=date(2024, 3, 1),
+        )
+        submitted = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+        # Reviewed after 10, 20, ..., 100 hours; week 11 is still waiting
+        for week in range(1, 12):
+            log = WeeklyLog.objects.create(student=student, application=application, week_number=week)
+            reviewed = submitted + timedelta(hours=10 * week) if week <= 10 else None
+            WeeklyLog.objects.filter(pk=log.pk).update(
+                submission_date=submitted, review_date=reviewed, reviewed_by=faculty if reviewed else None,
+            )
+
+        metrics = compute_review_latency(now=submitted + timedelta(hours=48))['logs']
+        row = metrics['faculty'][0]
+        self.assertEqual((row['name'], row['department']), ('Dr. Latency', 'B.Sc Information Technology'))
+        self.assertEqual((row['reviewed'], row['pending']), (10, 1))
+        self.assertEqual((row['p50'], row['p90'], row['p99']), (55.0, 91.0, 99.1))
+        self.assertEqual(row['backlog_oldest'], 48.0)
+        self.assertEqual(metrics['departments'][0]['name'], 'B.Sc Computer Science')
+
+
+class HeatmapTests(TestCase):
+    def test_pivot_into_department_week_matrix(self):
+        for n, (department, weeks) in enumerate([('CSE', [1, 2, 3]), ('IT', [2])]):
+            user = User.objects.create_user(username=f'heat{n}', password='x')
+            student = UserProfile.objects.create(
+                user=user, employee_id=f'HEAT{n}', full_name='Student', role='student',
+                department=department, email_id=f'heat{n}@example.com', mobile_number='0',
+            )
+            application = InternshipApplication.objects.create(
+                student=student, company_name='TCS', internship_domain='Testing', internship_mode='online',
+                start_date=date(2024, 1, 1), end_date=date(2024, 3, 1),
+            )
+            for week in weeks:
+                WeeklyLog.objects.create(student=student, application=application, week_number=week,
+                                         review_status='reviewed' if week == 1 else 'pending')
+
+        with self.assertNumQueries(1):
+            departments, weeks, matrix = submission_matrix()
+        self.assertEqual((departments, weeks), (['CSE', 'IT'], [1, 2, 3]))
+        self.assertEqual(matrix.sum(axis=2).tolist(), [[1, 1, 1], [0, 1, 0]])
+        self.assertEqual(matrix[:, :, 1].tolist(), [[1, 0, 0], [0, 0, 0]])
+
+        heatmap = compute_heatmap('svg', status='pending')
+        self.assertEqual(heatmap['total'], 3)
+        self.assertTrue(heatmap['content'].startswith('<svg'))
+
+
+class CsvLoaderTests(TestCase):
+    def write_csvs(self, directory):
+        with open(os.path.join(directory, 'hicas_faculty_data.csv'), 'w', encoding='utf-8', newline='') as file:
+            file.write('Department,Faculty Name,Designation,Source URL\n'
+                       'B.Sc Computer Science,Dr.A.Kumar,Professor,u\n'
+                       'B.Sc Computer Science,Dr.B.Rani,Professor,u\n'
+                       'B.Sc Information Technology,Dr.C.Devi,Professor,u\n')
+        with open(os.path.join(directory, 'hicas_students_simulated.csv'), 'w', encoding='utf-8',
+                  newline='') as file:
+            file.write('RegisterNumber,Student Name,Department,Year\n')
+            for i in range(60):
+                department = 'B.Sc Computer Science' if i % 2 else 'B.Sc Information Technology'
+                file.write(f'{1000 + i},Student {i},{department},{1 + i % 4}\n')
+
+    def test_generated_applications_logs_and_proofs_are_consistent(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.write_csvs(directory)
+            random.seed(3)
+            with override_settings(INGEST_CHECKPOINT_DIR=directory), \
+                    patch('internship.management.commands.load_csv_to_db.GENERATION_CHUNK_SIZE', 7):
+                output = StringIO()
+                call_command('load_csv_to_db', data_dir=directory, stdout=output)
+
+        applications = InternshipApplication.objects.select_related('student', 'assigned_faculty')
+        self.assertGreater(len(applications), 5)
+        for application in applications:
+            self.assertGreaterEqual(application.student.year_of_study, 3)
+            self.assertEqual(application.assigned_faculty.department, application.student.department)
+            self.assertEqual((application.company.name, application.domain.name),
+                             (application.company_name, application.internship_domain))
+            weeks = list(application.logs.order_by('week_number').values_list('week_number', flat=True))
+            proofs = application.progress_proofs.count()
+            if application.application_status == 'approved':
+                self.assertEqual(weeks, list(range(1, len(weeks) + 1)))
+                self.assertTrue(4 <= len(weeks) <= 12 and 2 <= proofs <= 4)
+            else:
+                self.assertEqual((weeks, proofs), ([], 0))
+        for log in WeeklyLog.objects.select_related('application', 'student'):
+            self.assertEqual(log.student, log.application.student)
+            if log.review_status == 'reviewed':
+                self.assertEqual(log.reviewed_by_id, log.application.assigned_faculty_id)
+        for model, label in [(InternshipApplication, 'internship applications'), (WeeklyLog, 'weekly logs'),
+                             (ProgressProof, 'progress proofs')]:
+            self.assertIn(f'Created {model.objects.count()} {label}', output.getvalue())
+
+    def test_resume_after_crash_before_checkpoint_adds_no_duplicates(self):
+        real_save = Checkpoint.save
+
+        def save(checkpoint, stage, **values):
+            if stage == 'generate' and values['chunk'] == 5:
+                raise RuntimeError('killed')  # chunk 5 has committed, its checkpoint is never written
+            real_save(checkpoint, stage, **values)
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.write_csvs(directory)
+            random.seed(3)
+            with override_settings(INGEST_CHECKPOINT_DIR=directory), \
+                    patch('internship.management.commands.load_csv_to_db.GENERATION_CHUNK_SIZE', 7):
+                with patch.object(Checkpoint, 'save', save), self.assertRaisesMessage(RuntimeError, 'killed'):
+                    call_command('load_csv_to_db', data_dir=directory, stdout=StringIO())
+                chunk_students = list(UserProfile.objects.filter(role='student').order_by('pk')[28:35])
+                interrupted = set(InternshipApplication.objects.filter(student__in=chunk_students))
+                self.assertTrue(interrupted)
+                call_command('load_csv_to_db', data_dir=directory, resume=True, stdout=StringIO())
+
+        self.assertFalse(InternshipApplication.objects.values('student').annotate(n=Count('pk')).filter(n__gt=1))
+        self.assertEqual(
+            set(InternshipApplication.objects.filter(student__in={application.student for application in interrupted})),
+            interrupted,
+        )
+
+
+class CopyStreamTests(SimpleTestCase):
+    def test_rows_encoded_in_copy_text_format(self):
+        rows = [
+            [1, 'tab\there', None, True, date(2024, 1, 2)],
+            [2, 'back\\slash\nnewline', '', False, b'\x00\xff'],
+        ]
+        stream = RowStream(iter(rows))
+        data = b''
+        while True:
+            chunk = stream.read(7)
+            if not chunk:
+                break
+            data += chunk
+        self.assertEqual(data.decode(), (
+            '1\ttab\\there\t\\N\tt\t2024-01-02\n'
+            '2\tback\\\\slash\\nnewline\t\tf\t\\\\x00ff\n'
+        ))
+
+
+class RosterSyncTests(TestCase):
+    def record(self, reg_no, name, year=1):
+        return reg_no, {
+            'username': reg_no, 'email': f'{reg_no}@student.hicas.ac.in', 'full_name': name, 'department': 'CSE',
+            'register_number': reg_no, 'year_of_study': year, 'email_id': f'{reg_no}@student.hicas.ac.in',
+        }
+
+    def test_only_changed_rows_are_written(self):
+        counts = sync_roster('student', [self.record('1001', 'A'), self.record('1002', 'B')])
+        self.assertEqual((counts['inserted'], counts['unchanged']), (2, 0))
+        self.assertEqual(UserProfile.objects.get(register_number='1002').employee_id, 'ST00002')
+
+        with self.assertNumQueries(3):  # savepoint, one read of the stored entries, release
+            counts = sync_roster('student', [self.record('1001', 'A'), self.record('1002', 'B')])
+        self.assertEqual(counts['unchanged'], 2)
+
+        counts = sync_roster('student', [self.record('1001', 'A', year=2), self.record('1003', 'C')])
+        self.assertEqual((counts['updated'], counts['inserted'], counts['deactivated']), (1, 1, 1))
+        self.assertEqual(UserProfile.objects.get(register_number='1001').year_of_study, 2)
+        self.assertFalse(User.objects.get(username='1002').is_active)
+
+        counts = sync_roster('student', [self.record('1001', 'A', year=2), self.record('1002', 'B')])
+        self.assertEqual((counts['updated'], counts['unchanged'], counts['deactivated']), (1, 1, 1))
+        self.assertTrue(User.objects.get(username='1002').is_active)
+
+    def test_faculty_delta_keeps_usernames_and_leaves_others_alone(self):
+        with tempfile.TemporaryDirectory() as directory:
+            faculty_csv = os.path.join(directory, 'faculty.csv')
+            with open(faculty_csv, 'w', encoding='utf-8', newline='') as file:
+                file.write('Department,Faculty Name,Designation,Source URL\n'
+                           'B.Sc Computer Science,Dr.A.Kumar,Professor,u\n'
+                           'B.Sc Computer Science,Dr.B.Rani,Professor,u\n'
+                           'B.Sc Computer Science,Dr.C.Devi,Professor,u\n')
+            sync_roster('faculty', faculty_records(faculty_csv))
+            delta_csv = os.path.join(directory, 'delta.csv')
+            with open(delta_csv, 'w', encoding='utf-8', newline='') as file:
+                file.write('Change,Department,Faculty Name,Designation,Source URL\n'
+                           'added,B.Sc Computer Science,Dr.D.Kumar,Professor,u\n'
+                           'removed,B.Sc Computer Science,Dr.B.Rani,Professor,u\n'
+                           'changed,B.Sc Computer Science,Dr. A. Kumar,Professor & Head,u\n')
+            counts = apply_faculty_delta(delta_csv)
+
+        self.assertEqual((counts['inserted'], counts['updated'], counts['deactivated']), (1, 1, 1))
+        self.assertEqual(UserProfile.objects.get(user__username='kumar').full_name, 'Dr. A. Kumar')
+        self.assertTrue(User.objects.filter(username='kumar1').exists())
+        self.assertFalse(User.objects.get(username='rani').is_active)
+        self.assertTrue(User.objects.get(username='devi').is_active)
+
+    def test_namesakes_keep_their_accounts_when_rows_move(self):
+        def sync(rows):
+            with tempfile.TemporaryDirectory() as directory:
+                faculty_csv = os.path.join(directory, 'faculty.csv')
+                with open(faculty_csv, 'w', encoding='utf-8', newline='') as file:
+                    file.write('Department,Faculty Name,Designation,Source URL\n' + ''.join(rows))
+                return sync_roster('faculty', faculty_records(faculty_csv))
+
+        cse = 'B.Sc Computer Science,Dr.A.Kumar,Professor,u\n'
+        it = 'B.Sc Information Technology,Dr.A.Kumar,Lecturer,u\n'
+        sync([cse, it])
+        self.assertEqual(UserProfile.objects.get(user__username='kumar').department, 'CSE')
+        self.assertEqual(UserProfile.objects.get(user__username='kumar1').department, 'IT')
+
+        counts = sync([it, cse])
+        self.assertEqual((counts['unchanged'], counts['updated']), (2, 0))
+
+        counts = sync([it])
+        self.assertEqual(counts['deactivated'], 1)
+        self.assertFalse(User.objects.get(username='kumar').is_active)
+        self.assertTrue(User.objects.get(username='kumar1').is_active)
+        self.assertEqual(UserProfile.objects.get(user__username='kumar1').department, 'IT')
+
+    def test_sync_with_unique_passwords(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'hicas_faculty_data.csv'), 'w', encoding='utf-8', newline='') as file:
+                file.write('Department,Faculty Name,Designation,Source URL\n'
+                           'B.Sc Computer Science,Dr.A.Kumar,Professor,u\n')
+            with open(os.path.join(directory, 'hicas_students_simulated.csv'), 'w', encoding='utf-8',
+                      newline='') as file:
+                file.write('RegisterNumber,Student Name,Department,Year\n'
+                           '1001,A,B.Sc Computer Science,1\n'
+                           '1002,B,B.Sc Computer Science,2\n')
+            credentials_csv = os.path.join(directory, 'credentials.csv')
+            call_command('load_csv_to_db', sync=True, data_dir=directory, unique_passwords=credentials_csv,
+                         hash_workers=1, stdout=StringIO())
+            with open(credentials_csv, encoding='utf-8') as file:
+                rows = list(csv.DictReader(file))
+
+        self.assertEqual([(row['username'], row['role']) for row in rows],
+                         [('kumar', 'faculty'), ('1001', 'student'), ('1002', 'student')])
+        for row in rows:
+            password = User.objects.get(username=row['username']).password
+            self.assertTrue(check_password(row['password'], password))
+            self.assertFalse(check_password('student123', password) or check_password('faculty123', password))
+
+
+class ProfileBackendTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='faculty1', password='secret')
+        UserProfile.objects.create(
+            user=self.user, employee_id='FC1', full_name='Faculty', role='faculty',
+            department='CSE', email_id='faculty1@example.com', mobile_number='0',
+        )
+
+    def test_user_and_profile_in_one_query(self):
+        self.client.login(username='faculty1', password='secret')
+        self.assertEqual(self.client.session[BACKEND_SESSION_KEY], 'internship.backends.ProfileBackend')
+        with self.assertNumQueries(1):
+            user = ProfileBackend().get_user(self.user.pk)
+            self.assertEqual(user.profile.role, 'faculty')
+
+    def test_wrong_password_is_rejected_once(self):
+        with patch('django.contrib.auth.backends.ModelBackend.authenticate', autospec=True,
+                   side_effect=lambda backend, request, **credentials: None) as model_authenticate:
+            self.assertIsNone(authenticate(username='faculty1', password='wrong'))
+        self.assertEqual(model_authenticate.call_count, 1)
+
+
+class OTPStoreTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='reset', password='old-password')
+        cache.clear()
+
+    def test_database_otp_is_used_once(self):
+        store = DatabaseOTPStore()
+        store.issue(self.user, '123456')
+        self.assertEqual(store.use(self.user, '654321'), INVALID)
+        self.assertEqual(store.use(self.user, '123456'), VALID)
+        self.assertEqual(store.use(self.user, '123456'), INVALID)
+
+        store.issue(self.user, '111111')
+        PasswordResetOTP.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(store.use(self.user, '111111'), EXPIRED)
+
+    def test_purge_deletes_used_and_expired_in_batches(self):
+        other = User.objects.create_user(username='other', password='x')
+        past, future = timezone.now() - timedelta(minutes=1), timezone.now() + timedelta(minutes=5)
+        PasswordResetOTP.objects.bulk_create(
+            [PasswordResetOTP(user=self.user, otp=f'{n:06d}', expires_at=past) for n in range(4)]
+            + [PasswordResetOTP(user=self.user, otp='999999', expires_at=future, is_used=True),
+               PasswordResetOTP(user=other, otp='888888', expires_at=future)]
+        )
+        self.assertEqual(DatabaseOTPStore().purge(batch_size=2), 5)
+        self.assertEqual(list(PasswordResetOTP.objects.values_list('otp', flat=True)), ['888888'])
+
+    def test_cache_otp_is_used_once(self):
+        store = CacheOTPStore()
+        store.issue(self.user, '123456')
+        store.issue(self.user, '222222')  # replaces the first
+        self.assertEqual(store.use(self.user, '123456'), INVALID)
+        self.assertEqual(store.use(self.user, '222222'), VALID)
+        self.assertEqual(store.use(self.user, '222222'), INVALID)
+
+    @override_settings(OTP_STORE='cache')
+    def test_reset_password_with_cached_otp(self):
+        CacheOTPStore().issue(self.user, '123456')
+        response = self.client.post(reverse('verify_otp'), {
+            'username': 'reset', 'otp': '123456', 'new_password': 'new-password', 'confirm_password': 'new-password',
+        })
+        self.assertRedirects(response, reverse('login'), fetch_redirect_response=False)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('new-password'))
+        self.assertFalse(PasswordResetOTP.objects.exists())
+
+
+class PasswordProvisioningTests(SimpleTestCase):
+    def test_hashes_come_back_in_input_order(self):
+        passwords = [generate_password() for _ in range(4)]
+        self.assertEqual(len(set(passwords)), 4)
+        hashes, stats = hash_passwords(passwords, workers=2, chunk_size=1)
+        self.assertEqual(stats['workers'], 2)
+        for password, hashed in zip(passwords, hashes):
+            self.assertTrue(check_password(password, hashed))
+
+
+class ChunkedIngestTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.csv_path = os.path.join(directory.name, 'rows.csv')
+        self.checkpoint_path = os.path.join(directory.name, 'checkpoint.json')
+        with open(self.csv_path, 'w', encoding='utf-8', newline='') as file:
+            file.write('id,note\n1,a\n2,"two\nlines"\n3,c\n4,d\n5,e\n')
+
+    def ingest(self, resume, process):
+        checkpoint = Checkpoint(self.checkpoint_path, resume=resume)
+        return ChunkedCSVIngest(self.csv_path, 'rows', checkpoint, chunk_size=2, report=lambda message: None).run(process)
+
+    def test_resume_continues_after_last_committed_chunk(self):
+        seen = []
+
+        def fail_on_third_chunk(rows, first_row):
+            if first_row == 4:
+                raise RuntimeError('interrupted')
+            seen.extend((first_row, row['id'], row['note']) for row in rows)
+
+        with self.assertRaises(RuntimeError):
+            self.ingest(False, fail_on_third_chunk)
+        self.assertEqual(seen, [(0, '1', 'a'), (0, '2', 'two\nlines'), (2, '3', 'c'), (2, '4', 'd')])
+
+        seen.clear()
+        self.assertEqual(self.ingest(True, lambda rows, first_row: seen.extend((first_row, row['id']) for row in rows)), 1)
+        self.assertEqual(seen, [(4, '5')])
+        self.assertEqual(self.ingest(True, lambda rows, first_row: seen.append('again')), 0)
+
+
+class SimulatedDataGeneratorTests(SimpleTestCase):
+    def generate(self, directory, *args):
+        with redirect_stdout(StringIO()), patch.object(generator, 'PBKDF2_ITERATIONS', 1000):
+            generator.main(['--output-dir', directory, *args])
+        tables = {}
+        for name in os.listdir(directory):
+            if name.endswith('.csv'):
+                with open(os.path.join(directory, name), newline='', encoding='utf-8') as file:
+                    tables[name[:-len('.csv')]] = list(csv.DictReader(file))
+        return tables
+
+    def test_same_seed_same_output_and_exact_student_count(self):
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            tables = self.generate(first, '--students', '997', '--seed', '7', '--activity')
+            self.assertEqual(tables, self.generate(second, '--students', '997', '--seed', '7', '--activity'))
+            self.assertNotEqual(tables['hicas_students_simulated'],
+                                self.generate(second, '--students', '997', '--seed', '8')['hicas_students_simulated'])
+
+        students = tables['hicas_students_simulated']
+        self.assertEqual(len(students), 997)
+        self.assertEqual(len({row['RegisterNumber'] for row in students}), 997)
+        self.assertEqual(sum(row['role'] == 'student' for row in tables['internship_userprofile']), 997)
+
+    def test_table_columns_match_the_models(self):
+        rng = np.random.default_rng(1)
+        students = generator.build_students(rng, 200)
+        with patch.object(generator, 'PBKDF2_ITERATIONS', 1000):
+            tables = generator.build_tables(rng, students, generator.build_faculty(rng),
+                                            generator.build_activity(rng, students))
+        models = {model._meta.db_table: model for model in apps.get_models()}
+        for table, (columns, _, _) in tables.items():
+            fields = {field.column: field for field in models[table]._meta.concrete_fields}
+            self.assertLessEqual(set(columns), set(fields), table)
+            # COPY leaves out columns the generator doesn't write; they must accept NULL
+            missing = [column for column in fields if column not in columns and not fields[column].null]
+            self.assertEqual(missing, [], table)
+
+    def test_foreign_keys_point_at_generated_rows(self):
+        with tempfile.TemporaryDirectory() as directory:
+            tables = self.generate(directory, '--students', '600', '--activity', '--id-start', '100')
+        users = {row['id'] for row in tables['auth_user']}
+        profiles = {row['id']: row for row in tables['internship_userprofile']}
+        applications = {row['application_id']: row for row in tables['internship_internshipapplication']}
+        self.assertTrue(applications and tables['internship_weeklylog'] and tables['internship_progressproof'])
+        self.assertEqual({row['user_id'] for row in profiles.values()}, users)
+        for application in applications.values():
+            self.assertEqual(profiles[application['student_id']]['role'], 'student')
+            faculty = profiles[application['assigned_faculty_id']]
+            self.assertEqual((faculty['role'], faculty['department']),
+                             ('faculty', profiles[application['student_id']]['department']))
+        for table, reviewer in [('internship_weeklylog', 'reviewed_by_id'),
+                                ('internship_progressproof', 'verified_by_id')]:
+            for row in tables[table]:
+                application = applications[row['application_id']]
+                self.assertEqual(row['student_id'], application['student_id'])
+                self.assertIn(row[reviewer], (generator.NULL, application['assigned_faculty_id']))
+
+
+class LoaderBenchmarkTests(TestCase):
+    def test_recorder_splits_stages_on_signal(self):
+        with StageRecorder({'users': User.objects.all()}) as recorder:
+            User.objects.create(username='bench1')
+            stage_finished.send(sender=None, stage='first')
+            User.objects.create(username='bench2')
+            User.objects.create(username='bench3')
+        self.assertEqual([stage['stage'] for stage in recorder.stages], ['first', 'rest'])
+        self.assertEqual([stage['rows'] for stage in recorder.stages], [1, 2])
+        self.assertEqual(recorder.summary()['rows'], 3)
+        self.assertGreaterEqual(recorder.stages[1]['queries'], 2)  # the row counts are not included
+
+    def test_migrate_files_to_db_reads_files_into_the_database(self):
+        user = User.objects.create_user(username='migrate', password='x')
+        student = UserProfile.objects.create(
+            user=user, employee_id='MIG1', full_name='Student', role='student',
+            department='CSE', email_id='migrate@example.com', mobile_number='0',
+        )
+        application = InternshipApplication.objects.create(
+            student=student, company_name='TCS', internship_domain='Testing', internship_mode='online',
+            start_date=date(2024, 1, 1), end_date=date(2024, 3, 1),
+        )
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            os.makedirs(os.path.join(media_root, 'offer_letters'))
+            with open(os.path.join(media_root, 'offer_letters', 'letter.pdf'), 'wb') as file:
+                file.write(b'%PDF offer')
+            InternshipApplication.objects.filter(pk=application.pk).update(offer_letter_file='offer_letters/letter.pdf')
+            call_command('migrate_files_to_db', stdout=StringIO())
+        application.refresh_from_db()
+        self.assertEqual(bytes(application.offer_letter_data), b'%PDF offer')
+        self.assertEqual(application.offer_letter_name, 'letter.pdf')
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves sample_page.html with an ETag; /flaky answers 503 the first time and /missing 404"""
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append((self.path, time.monotonic()))
+        if self.path == '/missing':
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.path == '/flaky' and [path for path, _ in self.requests_seen].count('/flaky') == 1:
+            self.send_response(503)
+            self.end_headers()
+            return
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        with open(os.path.join(settings.BASE_DIR, 'sample_page.html'), 'rb') as file:
+            body = file.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ScraperTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        FixtureHandler.requests_seen = []
+        scraper.faculty_data.clear()
+        scraper.faculty_index.clear()
+        scraper.visited_urls.clear()
+
+    def scrape(self, pages, **fetcher_options):
+        fetcher = scraper.Fetcher(**fetcher_options)
+        with redirect_stdout(StringIO()):
+            return scraper.scrape_departments(
+                {dept: [self.base_url + path] for dept, path in pages}, fetcher, concurrency=3
+            )
+
+    def test_pages_are_merged_in_department_order(self):
+        self.scrape([('CS', '/cs'), ('IT', '/it'), ('CS', '/cs?again')], delay=0)
+        self.assertEqual(len(FixtureHandler.requests_seen), 2)  # /cs?again replaces /cs in the mapping
+        departments = [record['Department'] for record in scraper.faculty_data]
+        self.assertEqual(departments, sorted(departments))
+        self.assertIn({'Department': 'IT', 'Faculty Name': 'Dr.R.Rangaraj', 'Designation': 'Professor & Head',
+                       'Source URL': self.base_url + '/it'}, scraper.faculty_data)
+
+    def test_retries_and_per_host_rate_limit(self):
+        self.scrape([('CS', '/flaky'), ('IT', '/it')], delay=0.2, backoff=0)
+        paths = [path for path, _ in FixtureHandler.requests_seen]
+        self.assertEqual(sorted(paths), ['/flaky', '/flaky', '/it'])  # one retry after the 503
+        self.assertEqual({record['Department'] for record in scraper.faculty_data}, {'CS', 'IT'})
+        times = [seen for _, seen in FixtureHandler.requests_seen]
+        # Three requests to one host within the bucket's budget: at least two gaps of 0.2s
+        self.assertGreaterEqual(times[-1] - times[0], 0.35)
+
+    def test_cache_revalidates_and_replays_offline(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = scraper.ResponseCache(cache_dir)
+            self.scrape([('CS', '/cs')], delay=0, cache=cache)
+            first_run = list(scraper.faculty_data)
+            self.assertEqual(cache.get(self.base_url + '/cs')['etag'], '"v1"')
+
+            self.setUp()
+            with patch.object(scraper, 'parse_department_page') as parse:
+                self.scrape([('CS', '/cs')], delay=0, cache=cache)
+            parse.assert_not_called()  # 304: the records parsed last time are reused
+            self.assertEqual(len(FixtureHandler.requests_seen), 1)
+            self.assertEqual(scraper.faculty_data, first_run)
+
+            self.setUp()
+            self.scrape([('CS', '/cs'), ('IT', '/not-cached')], cache=cache, offline=True)
+            self.assertEqual(FixtureHandler.requests_seen, [])
+            self.assertEqual(scraper.faculty_data, first_run)
+
+    def test_delta_against_previous_run(self):
+        scraper.add_faculty([
+            {'Department': 'CS', 'Faculty Name': 'Dr.A.Kumar', 'Designation': 'Professor', 'Source URL': 'u'},
+            {'Department': 'CS', 'Faculty Name': 'Dr. A. Kumar', 'Designation': 'Professor', 'Source URL': 'u'},
+            {'Department': 'CS', 'Faculty Name': 'Dr.C.Devi', 'Designation': 'Professor & Head', 'Source URL': 'u'},
+        ])
+        self.assertEqual(len(scraper.faculty_data), 2)  # the respaced name is the same person
+        previous = [
+            {'Department': 'CS', 'Faculty Name': 'Dr.B.Rani', 'Designation': 'Professor', 'Source URL': 'u'},
+            {'Department': 'CS', 'Faculty Name': 'Dr.C.Devi', 'Designation': 'Professor', 'Source URL': 'u'},
+        ]
+        delta = scraper.diff_faculty(previous, scraper.faculty_data)
+        self.assertEqual({change: [r['Faculty Name'] for r in records] for change, records in delta.items()},
+                         {'added': ['Dr.A.Kumar'], 'removed': ['Dr.B.Rani'], 'changed': ['Dr.C.Devi']})
+
+    def test_failed_page_removes_nobody_from_its_department(self):
+        failed = self.scrape([('CS', '/cs'), ('IT', '/missing')], delay=0)
+        self.assertEqual(failed, [('IT', self.base_url + '/missing')])
+        self.assertEqual({record['Department'] for record in scraper.faculty_data}, {'CS'})
+        previous = [
+            {'Department': 'CS', 'Faculty Name': 'Dr.B.Rani', 'Designation': 'Professor', 'Source URL': 'u'},
+            {'Department': 'IT', 'Faculty Name': 'Dr.R.Rangaraj', 'Designation': 'Professor', 'Source URL': 'u'},
+        ]
+        delta = scraper.diff_faculty(previous, scraper.faculty_data, {dept for dept, _ in failed})
+        self.assertEqual([record['Faculty Name'] for record in delta['removed']], ['Dr.B.Rani'])
+
+    def test_parser_backends_agree(self):
+        with open(os.path.join(settings.BASE_DIR, 'sample_page.html'), encoding='utf-8') as file:
+            pages = [file.read(), '<h2>Dr.<b> A</b> Rao &amp; Co</h2><p>x</p><h3><i>Professor</i> &amp; Head</h3><h2>Ms.B']
+        for page in pages:
+            expected = scraper.parse_department_page(page, 'u', 'CS', parser='soup')
+            self.assertTrue(expected)
+            for backend in scraper.HEADING_PARSERS:
+                self.assertEqual(scraper.parse_department_page(page, 'u', 'CS', parser=backend), expected, backend)
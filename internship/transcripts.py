@@ -0,0 +1,314 @@
+"""Per-student internship transcripts, rendered in bulk across a process pool.
+
+The parent process reads everything from the database and hands each worker a
+plain dict, so workers only run reportlab and never need a DB connection.
+Models are imported inside the functions that query them so that
+``render_transcript`` can be unpickled in a freshly spawned worker without
+setting up Django.
+"""
+
+import io
+import os
+import shutil
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+PAYLOAD_CHUNK_SIZE = 200
+# Transcripts queued per worker process before waiting for results
+IN_FLIGHT_PER_WORKER = 4
+
+TRANSCRIPT_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+])
+
+
+def transcript_filename(profile_id, register_number, employee_id):
+    # The profile id keeps students who share a register number apart
+    return f'{register_number or employee_id}-{profile_id}.pdf'
+
+
+def _fmt(value, pattern='%d %b %Y'):
+    return value.strftime(pattern) if value else ''
+
+
+def student_filter(department=None, year=None, student_ids=None):
+    from .models import UserProfile
+
+    students = UserProfile.objects.filter(role='student')
+    if department:
+        students = students.filter(department=department)
+    if year:
+        students = students.filter(year_of_study=year)
+    if student_ids:
+        students = students.filter(pk__in=student_ids)
+    return students.order_by('department', 'register_number', 'pk')
+
+
+def iter_transcript_payloads(students, skip=(), chunk_size=PAYLOAD_CHUNK_SIZE):
+    """Yield one picklable dict per student, prefetching a chunk of students at a time.
+
+    ``skip`` holds transcript filenames that already exist (for --resume).
+    """
+    from django.db.models import Prefetch
+    from .models import UserProfile, InternshipApplication, WeeklyLog, ProgressProof
+
+    department_names = dict(UserProfile.DEPARTMENT_CHOICES)
+    status_names = dict(InternshipApplication.STATUS_CHOICES)
+    ids = [
+        pk for pk, register_number, employee_id in students.values_list('pk', 'register_number', 'employee_id')
+        if transcript_filename(pk, register_number, employee_id) not in skip
+    ]
+
+    applications = InternshipApplication.objects.select_related('assigned_faculty', 'completion').defer(
+        'offer_letter_data', 'noc_file_data', 'completion__completion_certificate_data'
+    ).order_by('start_date')
+    logs = WeeklyLog.objects.select_related('reviewed_by').order_by('week_number')
+    proofs = ProgressProof.objects.defer('proof_file_data').order_by('submission_date')
+
+    for start in range(0, len(ids), chunk_size):
+        chunk = UserProfile.objects.filter(pk__in=ids[start:start + chunk_size]).order_by(
+            'department', 'register_number', 'pk'
+        ).prefetch_related(
+            Prefetch('internship_applications', queryset=applications),
+            Prefetch('internship_applications__logs', queryset=logs),
+            Prefetch('internship_applications__progress_proofs', queryset=proofs),
+        )
+        for student in chunk:
+            payload = {
+                'filename': transcript_filename(student.pk, student.register_number, student.employee_id),
+                'name': student.full_name,
+                'register_number': student.register_number or '',
+                'department': department_names.get(student.department, student.department),
+                'year': student.get_year_of_study_display() if student.year_of_study else '',
+                'applications': [],
+            }
+            for app in student.internship_applications.all():
+                completion = getattr(app, 'completion', None)
+                payload['applications'].append({
+                    'company': app.company_name,
+                    'domain': app.internship_domain,
+                    'mode': app.get_internship_mode_display(),
+                    'start': _fmt(app.start_date),
+                    'end': _fmt(app.end_date),
+                    'status': status_names.get(app.application_status, app.application_status),
+                    'faculty': app.assigned_faculty.full_name if app.assigned_faculty else '',
+                    'logs': [
+                        {
+                            'week': log.week_number,
+                            'submitted': _fmt(log.submission_date),
+                            'status': log.get_review_status_display(),
+                            'reviewer': log.reviewed_by.full_name if log.reviewed_by else '',
+                            'reviewed': _fmt(log.review_date),
+                            'feedback': log.faculty_feedback or '',
+                        }
+                        for log in app.logs.all()
+                    ],
+                    'proofs': [
+                        {
+                            'title': proof.title,
+                            'type': proof.get_proof_type_display(),
+                            'submitted': _fmt(proof.submission_date),
+                            'status': proof.get_verification_status_display(),
+                        }
+                        for proof in app.progress_proofs.all()
+                    ],
+                    'completion': {
+                        'score': f'{completion.completion_score:.2f}' if completion.completion_score is not None else '',
+                        'status': completion.get_faculty_verification_status_display(),
+                        'duration': completion.total_duration,
+                    } if completion else None,
+                })
+            yield payload
+
+
+def render_transcript(payload):
+    """Render one transcript. Returns (filename, pdf bytes, page count)."""
+    styles = getSampleStyleSheet()
+    cell = styles['Normal'].clone('TranscriptCell', fontSize=8, leading=9)
+    output = io.BytesIO()
+    doc = SimpleDocTemplate(output, pagesize=A4, title=f"Internship Transcript - {payload['name']}",
+                            leftMargin=1.5 * cm, rightMargin=1.5 * cm, topMargin=1.5 * cm, bottomMargin=1.5 * cm)
+
+    elements = [
+        Paragraph("SmartIntern Internship Transcript", styles['Title']),
+        Paragraph(
+            f"<b>{escape(payload['name'])}</b> &middot; {escape(payload['register_number'])}<br/>"
+            f"{escape(payload['department'])} {('&middot; ' + payload['year']) if payload['year'] else ''}",
+            styles['Normal'],
+        ),
+        Spacer(1, 12),
+    ]
+
+    if not payload['applications']:
+        elements.append(Paragraph("No internship applications on record.", styles['Normal']))
+
+    for app in payload['applications']:
+        elements.append(Paragraph(f"{escape(app['company'])} &mdash; {escape(app['domain'])}", styles['Heading2']))
+        elements.append(Paragraph(
+            f"{app['start']} to {app['end']} &middot; {app['mode']} &middot; {escape(app['status'])}"
+            f"{(' &middot; Faculty: ' + escape(app['faculty'])) if app['faculty'] else ''}",
+            styles['Normal'],
+        ))
+        elements.append(Spacer(1, 6))
+
+        if app['logs']:
+            rows = [['Week', 'Submitted', 'Status', 'Reviewed By', 'Reviewed', 'Feedback']]
+            rows.extend(
+                [log['week'], log['submitted'], log['status'], Paragraph(escape(log['reviewer']), cell),
+                 log['reviewed'], Paragraph(escape(log['feedback']), cell)]
+                for log in app['logs']
+            )
+            table = Table(rows, colWidths=[1.2 * cm, 2.3 * cm, 2.8 * cm, 3.2 * cm, 2.3 * cm, 6.2 * cm], repeatRows=1)
+            table.setStyle(TRANSCRIPT_TABLE_STYLE)
+            elements.extend([Paragraph("Weekly Log Review History", styles['Heading4']), table, Spacer(1, 6)])
+
+        if app['proofs']:
+            rows = [['Proof', 'Type', 'Submitted', 'Status']]
+            rows.extend(
+                [Paragraph(escape(proof['title']), cell), proof['type'], proof['submitted'], proof['status']]
+                for proof in app['proofs']
+            )
+            table = Table(rows, colWidths=[7 * cm, 4 * cm, 3 * cm, 4 * cm], repeatRows=1)
+            table.setStyle(TRANSCRIPT_TABLE_STYLE)
+            elements.extend([Paragraph("Progress Proofs", styles['Heading4']), table, Spacer(1, 6)])
+
+        completion = app['completion']
+        if completion:
+            elements.append(Paragraph(
+                f"<b>Completion:</b> {completion['duration']} days &middot; score {completion['score'] or 'n/a'}"
+                f" &middot; {completion['status']}",
+                styles['Normal'],
+            ))
+        elements.append(Spacer(1, 12))
+
+    doc.build(elements)
+    return payload['filename'], output.getvalue(), doc.page
+
+
+class ZipSink:
+    """Collects transcripts into a single ZIP archive.
+
+    A ZIP's central directory is only written when it is closed, so a run
+    killed before then would leave an archive nothing can be read back from.
+    When the target is a path, transcripts are staged one file each in
+    ``<target>.parts`` instead, and ``close`` packs them (after the entries
+    of the existing archive, when resuming) into ``<target>.part`` and
+    renames that over the target. A killed run leaves the previous archive
+    intact and its staged transcripts in place for ``--resume``.
+    """
+
+    def __init__(self, target, resume=False):
+        self.target = target
+        self.archive = self.staging = None
+        if isinstance(target, (str, os.PathLike)):
+            self.resume = resume and os.path.exists(target)
+            if not resume:
+                shutil.rmtree(f'{target}.parts', ignore_errors=True)
+            self.staging = DirectorySink(f'{target}.parts')
+        else:
+            self.archive = zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED)
+
+    def existing(self):
+        if self.staging is None:
+            return set()
+        names = self.staging.existing()
+        if self.resume:
+            with zipfile.ZipFile(self.target) as archive:
+                names.update(archive.namelist())
+        return names
+
+    def write(self, filename, data):
+        if self.staging is None:
+            self.archive.writestr(filename, data)
+        else:
+            self.staging.write(filename, data)
+
+    def close(self):
+        if self.staging is None:
+            self.archive.close()
+            return
+        part = f'{self.target}.part'
+        if self.resume:
+            shutil.copyfile(self.target, part)
+        with zipfile.ZipFile(part, 'a' if self.resume else 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for filename in sorted(self.staging.existing()):
+                archive.write(os.path.join(self.staging.path, filename), filename)
+        os.replace(part, self.target)
+        shutil.rmtree(self.staging.path)
+
+
+class DirectorySink:
+    """Writes each transcript to its own file."""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def existing(self):
+        return {name for name in os.listdir(self.path) if name.endswith('.pdf')}
+
+    def write(self, filename, data):
+        # Write then rename so an interrupted run never leaves a truncated PDF behind
+        final = os.path.join(self.path, filename)
+        with open(final + '.part', 'wb') as f:
+            f.write(data)
+        os.replace(final + '.part', final)
+
+    def close(self):
+        pass
+
+
+def generate_transcripts(students, sink, workers=None, resume=False, progress=None):
+    """Render transcripts for ``students`` into ``sink`` across a process pool.
+
+    Returns (transcripts written, pages rendered). ``progress`` is called with
+    (written, pages) after each transcript.
+    """
+    skip = sink.existing() if resume else set()
+    payloads = iter_transcript_payloads(students, skip=skip)
+    workers = workers or os.cpu_count() or 1
+    written = pages = 0
+
+    # Executor.map would submit every payload up front; keep a bounded window instead
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for payload in payloads:
+            pending.add(pool.submit(render_transcript, payload))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    written, pages = _store(future, sink, written, pages, progress)
+        for future in as_completed(pending):
+            written, pages = _store(future, sink, written, pages, progress)
+    return written, pages
+
+
+def _store(future, sink, written, pages, progress):
+    filename, data, page_count = future.result()
+    sink.write(filename, data)
+    written += 1
+    pages += page_count
+    if progress:
+        progress(written, pages)
+    return written, pages
+
+
+def build_transcripts_zip(output, student_ids=None, department=None, year=None):
+    """Report-job builder: a ZIP of transcripts for the selected students."""
+    sink = ZipSink(output)
+    try:
+        generate_transcripts(student_filter(department, year, student_ids), sink)
+    finally:
+        sink.close()
@@ -20,8 +20,14 @@ urlpatterns = [
     path('review-log/<int:log_id>/', views.review_log, name='review_log'),
     path('completion/<int:application_id>/', views.submit_completion, name='submit_completion'),
     path('analytics/', views.analytics_view, name='analytics'),
+    path('analytics/funnel/', views.funnel_data, name='funnel_data'),
+    path('analytics/heatmap/', views.submission_heatmap_view, name='submission_heatmap'),
     path('download/pdf/', views.download_report_pdf, name='download_pdf'),
     path('download/excel/', views.download_report_excel, name='download_excel'),
+    path('reports/request/', views.request_report_job, name='request_report_job'),
+    path('reports/<int:job_id>/', views.report_job_status, name='report_job_status'),
+    path('reports/<int:job_id>/download/', views.download_report_job, name='download_report_job'),
+    path('export/<slug:dataset>/<slug:fmt>/', views.export_data, name='export_data'),
     
     # Progress Proof URLs
     path('progress-proof/submit/<int:application_id>/', views.submit_progress_proof, name='submit_progress_proof'),
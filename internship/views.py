@@ -19,28 +19,34 @@ def application_details(request, application_id):
         messages.error(request, 'Access denied.')
         return redirect('dashboard')
     return render(request, 'application_details.html', {'application': application})
-from django.http import HttpResponse
+from django.http import HttpResponse, FileResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.core.mail import send_mail
 from django.conf import settings
 from django.utils import timezone
-from datetime import datetime, timedelta
-import pandas as pd
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import io
-import base64
+from django.utils.dateparse import parse_date
+from datetime import datetime
+import logging
 import random
 import string
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from .models import UserProfile, InternshipApplication, WeeklyLog, InternshipCompletion, ProgressProof, PasswordResetOTP
+import tempfile
+from .models import (UserProfile, InternshipApplication, WeeklyLog, InternshipCompletion, ProgressProof,
+                     ReportJob)
 from .forms import (UserRegistrationForm, InternshipApplicationForm, 
                     WeeklyLogForm, CompletionForm, FacultyReviewForm,
                     ProgressProofForm, ProgressProofVerificationForm, FacultyLogReviewForm)
 from .decorators import role_required
+from .charts import build_chart
+from .cube import cube
+from .funnel import COHORTS, cohort_funnel
+from .heatmap import HEATMAP_FORMATS, REVIEW_STATUSES, submission_heatmap
+from .otp import EXPIRED, INVALID, get_otp_store
+from .exports import EXPORT_DATASETS, export_queryset, stream_csv, stream_ndjson
+from .reports import REPORT_TYPES, build_pdf_report, build_excel_report
+from .report_jobs import request_report
+from .review_latency import review_latency
+
+logger = logging.getLogger(__name__)
 
 
 def home_view(request):
@@ -59,9 +65,6 @@ def forgot_password_view(request):
         username = request.POST.get('username', '').strip()
         phone = request.POST.get('phone', '').strip()
         
-        # Debug logging
-        print(f"DEBUG forgot_password: username='{username}', phone='{phone}'")
-        
         # Validation
         if not username:
             messages.error(request, 'Please enter your username.')
@@ -84,26 +87,13 @@ def forgot_password_view(request):
             stored_phone = ''.join(filter(str.isdigit, str(profile.mobile_number)))[-10:]
             input_phone = ''.join(filter(str.isdigit, str(phone)))[-10:]
             
-            # Debug info
-            print(f"DEBUG: Stored='{stored_phone}', Input='{input_phone}', Match={stored_phone == input_phone}")
-            
             if stored_phone != input_phone:
                 messages.error(request, f'Phone number does not match. Expected last 4 digits: ...{stored_phone[-4:]}')
                 return render(request, 'forgot_password.html')
             
-            # Generate OTP
+            # Generate OTP, replacing any earlier one for this user
             otp = generate_otp()
-            expires_at = timezone.now() + timedelta(minutes=5)
-            
-            # Delete any existing OTPs for this user
-            PasswordResetOTP.objects.filter(user=user).delete()
-            
-            # Create new OTP
-            PasswordResetOTP.objects.create(
-                user=user,
-                otp=otp,
-                expires_at=expires_at
-            )
+            get_otp_store().issue(user, otp)
             
             # In production, you would send SMS here using Twilio/MSG91 etc.
             # For demo, we'll display the OTP
@@ -111,14 +101,14 @@ def forgot_password_view(request):
             # Mask phone number for display
             masked_phone = f'XXXXXX{phone[-4:]}' if len(phone) >= 4 else phone
             
-            print(f"DEBUG: OTP generated: {otp} for user {username}")
+            logger.info('Password reset OTP issued for %s', username)
             messages.success(request, f'OTP sent to {masked_phone}. (Demo OTP: {otp})')
             return render(request, 'verify_otp.html', {'username': username})
             
         except User.DoesNotExist:
             messages.error(request, 'User not found. Please check your username.')
         except Exception as e:
-            print(f"DEBUG: Error in forgot_password: {e}")
+            logger.exception('Error in forgot_password for %s', username)
             messages.error(request, f'An error occurred: {str(e)}')
     
     return render(request, 'forgot_password.html')
@@ -132,9 +122,6 @@ def verify_otp_view(request):
         new_password = request.POST.get('new_password', '')
         confirm_password = request.POST.get('confirm_password', '')
         
-        # Debug logging
-        print(f"DEBUG verify_otp: username={username}, otp={otp}, pwd_len={len(new_password) if new_password else 0}")
-        
         # Basic validation
         if not username:
             messages.error(request, 'Username is required.')
@@ -159,19 +146,14 @@ def verify_otp_view(request):
         
         try:
             user = User.objects.get(username=username)
-            otp_record = PasswordResetOTP.objects.filter(
-                user=user,
-                otp=otp,
-                is_used=False
-            ).order_by('-created_at').first()
-            
-            print(f"DEBUG: OTP record found: {otp_record is not None}")
+            # Marks the OTP used in the same step, so it can't be replayed
+            result = get_otp_store().use(user, otp)
             
-            if not otp_record:
+            if result == INVALID:
                 messages.error(request, 'Invalid OTP. Please check and try again.')
                 return render(request, 'verify_otp.html', {'username': username})
             
-            if not otp_record.is_valid():
+            if result == EXPIRED:
                 messages.error(request, 'OTP has expired. Please request a new one.')
                 return render(request, 'verify_otp.html', {'username': username})
             
@@ -179,18 +161,14 @@ def verify_otp_view(request):
             user.set_password(new_password)
             user.save()
             
-            # Mark OTP as used
-            otp_record.is_used = True
-            otp_record.save()
-            
-            print(f"DEBUG: Password reset successful for {username}")
+            logger.info('Password reset for %s', username)
             messages.success(request, 'Password reset successful! Please login with your new password.')
             return redirect('login')
             
         except User.DoesNotExist:
             messages.error(request, 'User not found.')
         except Exception as e:
-            print(f"DEBUG: Error in verify_otp: {e}")
+            logger.exception('Error in verify_otp for %s', username)
             messages.error(request, f'An error occurred: {str(e)}')
     
     # For GET requests, redirect to forgot password
@@ -405,6 +383,7 @@ def dashboard(request):
             'total_completions': total_completions,
             'dept_progress': dept_progress,
             'faculty_load': faculty_load,
+            'review_latency': review_latency(),
         }
         return render(request, 'admin_dashboard.html', context)
 
@@ -778,26 +757,55 @@ def submit_completion(request, application_id):
     return render(request, 'completion_form.html', {'form': form, 'application': application})
 
 
+def _date_filters(request):
+    """date_from/date_to query parameters as dates, or None if either is malformed"""
+    dates = {}
+    for key in ('date_from', 'date_to'):
+        raw = request.GET.get(key)
+        try:
+            dates[key] = parse_date(raw) if raw else None
+        except ValueError:
+            dates[key] = None
+        if raw and dates[key] is None:
+            return None
+    return dates
+
+
 @role_required(['faculty', 'admin'])
 def analytics_view(request):
-    # Domain-wise count
-    domain_data = InternshipApplication.objects.values('internship_domain').annotate(
-        count=Count('application_id')
-    ).order_by('-count')
-    
-    # Company-wise count
-    company_data = InternshipApplication.objects.values('company_name').annotate(
-        count=Count('application_id')
-    ).order_by('-count')[:10]
-    
+    dates = _date_filters(request)
+    if dates is None:
+        return HttpResponse('Dates must be YYYY-MM-DD', status=400)
+    filters = {
+        'department': request.GET.get('department') or None,
+        'status': request.GET.get('status') or None,
+        **dates,
+    }
+
+    # Roll-ups come from the in-memory cube rather than fresh GROUP BYs
+    domain_data = cube.rollup('internship_domain', **filters)
+    company_data = cube.rollup('company_name', limit=10, **filters)
+
     # Completion percentage
-    total_apps = InternshipApplication.objects.filter(application_status='approved').count()
-    completed = InternshipCompletion.objects.filter(completion_status=True).count()
+    total_apps = cube.count(**dict(filters, status='approved'))
+    completions = InternshipCompletion.objects.filter(completion_status=True)
+    if filters['department']:
+        completions = completions.filter(student__department=filters['department'])
+    if dates['date_from']:
+        completions = completions.filter(application__start_date__gte=dates['date_from'])
+    if dates['date_to']:
+        completions = completions.filter(application__start_date__lte=dates['date_to'])
+    completed = completions.count()
     completion_pct = (completed / total_apps * 100) if total_apps > 0 else 0
+
+    funnel_by = request.GET.get('funnel_by', 'department')
+    if funnel_by not in COHORTS:
+        funnel_by = 'department'
+    funnel = cohort_funnel(funnel_by, filters['department'], dates['date_from'], dates['date_to'])
     
     # Generate charts
-    domain_chart = generate_bar_chart(domain_data, 'internship_domain', 'Domain-wise Internships')
-    company_chart = generate_bar_chart(company_data, 'company_name', 'Top 10 Companies')
+    domain_chart = build_chart(domain_data, 'internship_domain', 'Domain-wise Internships')
+    company_chart = build_chart(company_data, 'company_name', 'Top 10 Companies')
     
     context = {
         'domain_data': domain_data,
@@ -806,119 +814,188 @@ def analytics_view(request):
         'domain_chart': domain_chart,
         'company_chart': company_chart,
         'total_students': UserProfile.objects.filter(role='student').count(),
-        'total_internships': InternshipApplication.objects.count(),
+        'total_internships': cube.count(**filters),
+        'filters': filters,
+        'funnel': funnel,
+        'funnel_cohorts': [('department', 'By Department'), ('intake', 'By Intake')],
+        'department_choices': UserProfile.DEPARTMENT_CHOICES,
+        'status_choices': InternshipApplication.STATUS_CHOICES,
+        'export_datasets': [
+            ('applications', 'Applications'),
+            ('weekly-logs', 'Weekly Logs'),
+            ('proofs', 'Progress Proofs (metadata only)'),
+            ('completions', 'Completions'),
+        ],
     }
     
     return render(request, 'analytics.html', context)
 
 
-def generate_bar_chart(data, label_field, title):
-    if not data:
-        return None
-    
-    try:
-        df = pd.DataFrame(list(data))
-        
-        if df.empty or label_field not in df.columns:
-            return None
-        
-        # Limit to top 10 and truncate long labels
-        df = df.head(10)
-        df[label_field] = df[label_field].astype(str).str[:20]
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        bars = ax.bar(range(len(df)), df['count'], color='#4CAF50')
-        
-        ax.set_xlabel(label_field.replace('_', ' ').title())
-        ax.set_ylabel('Count')
-        ax.set_title(title)
-        ax.set_xticks(range(len(df)))
-        ax.set_xticklabels(df[label_field], rotation=45, ha='right')
-        
-        # Add value labels on bars
-        for bar, val in zip(bars, df['count']):
-            ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5, 
-                   str(int(val)), ha='center', va='bottom', fontsize=9)
-        
-        plt.tight_layout()
-        
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
-        buffer.seek(0)
-        image_png = buffer.getvalue()
-        buffer.close()
-        plt.close(fig)
-        
-        graphic = base64.b64encode(image_png).decode('utf-8')
-        return graphic
-    except Exception as e:
-        print(f"Chart generation error: {e}")
-        plt.close('all')
-        return None
+@role_required(['faculty', 'admin'])
+def funnel_data(request):
+    """Cohort funnel as JSON, grouped by department or intake month"""
+    by = request.GET.get('by', 'department')
+    if by not in COHORTS:
+        return HttpResponse(f'Unknown cohort: {by}', status=400)
+    dates = _date_filters(request)
+    if dates is None:
+        return HttpResponse('Dates must be YYYY-MM-DD', status=400)
+    return JsonResponse(cohort_funnel(by, request.GET.get('department') or None, **dates))
+
+
+@role_required(['admin'])
+def submission_heatmap_view(request):
+    """Department x week heatmap of weekly log submissions; ?format=svg|png returns the bare image"""
+    status = request.GET.get('status') or None
+    if status and status not in REVIEW_STATUSES:
+        return HttpResponse(f'Unknown status: {status}', status=400)
+
+    fmt = request.GET.get('format')
+    if fmt:
+        if fmt not in HEATMAP_FORMATS:
+            return HttpResponse(f'Unknown format: {fmt}', status=400)
+        heatmap = submission_heatmap(fmt, status)
+        if heatmap['content'] is None:
+            return HttpResponse('No weekly logs submitted yet', status=404)
+        content_type = 'image/png' if fmt == 'png' else 'image/svg+xml'
+        return HttpResponse(heatmap['content'], content_type=content_type)
+
+    return render(request, 'heatmap.html', {
+        'heatmap': submission_heatmap('svg', status),
+        'status': status,
+        'status_choices': WeeklyLog.REVIEW_STATUS_CHOICES,
+    })
 
 
 @role_required(['faculty', 'admin'])
 def download_report_pdf(request):
+    profile = request.user.profile
     response = HttpResponse(content_type='application/pdf')
     response['Content-Disposition'] = 'attachment; filename="internship_report.pdf"'
-    
-    doc = SimpleDocTemplate(response, pagesize=A4)
-    elements = []
-    styles = getSampleStyleSheet()
-    
-    # Title
-    title = Paragraph("SmartIntern Analytics Report", styles['Title'])
-    elements.append(title)
-    elements.append(Spacer(1, 20))
-    
-    # Domain-wise data
-    domain_data = InternshipApplication.objects.values('internship_domain').annotate(
-        count=Count('application_id')
-    )
-    
-    domain_table_data = [['Domain', 'Count']]
-    for item in domain_data:
-        domain_table_data.append([item['internship_domain'], str(item['count'])])
-    
-    domain_table = Table(domain_table_data)
-    domain_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    
-    elements.append(Paragraph("Domain-wise Internships", styles['Heading2']))
-    elements.append(domain_table)
-    
-    doc.build(elements)
+    build_pdf_report(response, department=profile.department if profile.role == 'faculty' else None)
     return response
 
 
 @role_required(['faculty', 'admin'])
 def download_report_excel(request):
-    # Domain-wise data
-    domain_data = InternshipApplication.objects.values('internship_domain').annotate(
-        count=Count('application_id')
+    # Workbook is spooled to a temp file and streamed back, one sheet per department;
+    # faculty only ever see their own department
+    profile = request.user.profile
+    output = tempfile.TemporaryFile()
+    build_excel_report(output, department=profile.department if profile.role == 'faculty' else None)
+    output.seek(0)
+
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename='internship_report.xlsx',
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
     )
-    df_domain = pd.DataFrame(list(domain_data))
-    
-    # Company-wise data
-    company_data = InternshipApplication.objects.values('company_name').annotate(
-        count=Count('application_id')
+
+
+@role_required(['faculty', 'admin'])
+def request_report_job(request):
+    """Queue a report for the background worker, or reuse an identical pending one"""
+    if request.method != 'POST':
+        return redirect('analytics')
+
+    report_type = request.POST.get('report_type')
+    if report_type not in REPORT_TYPES:
+        messages.error(request, 'Unknown report type.')
+        return redirect('analytics')
+
+    # Every report a faculty member queues is scoped to their own department
+    params = {}
+    profile = request.user.profile
+    if profile.role == 'faculty':
+        params['department'] = profile.department
+
+    job, created = request_report(profile, report_type, params)
+    if created:
+        messages.success(request, f'Report #{job.job_id} queued. This page will update when it is ready.')
+    else:
+        messages.info(request, f'An identical report (#{job.job_id}) is already {job.get_status_display().lower()}.')
+    return redirect('report_job_status', job_id=job.job_id)
+
+
+def _visible_report_jobs(profile):
+    """Admins see every report job, faculty only those scoped to their department"""
+    jobs = ReportJob.objects.all()
+    if profile.role == 'faculty':
+        jobs = jobs.filter(params__department=profile.department)
+    return jobs
+
+
+@role_required(['faculty', 'admin'])
+def report_job_status(request, job_id):
+    """Status page for a report job; add ?format=json for polling clients"""
+    job = get_object_or_404(_visible_report_jobs(request.user.profile).defer('result_data'), job_id=job_id)
+
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'job_id': job.job_id,
+            'report_type': job.report_type,
+            'status': job.status,
+            'error': job.error,
+            'created_at': job.created_at,
+            'finished_at': job.finished_at,
+            'expires_at': job.expires_at,
+            'download_url': reverse('download_report_job', args=[job.job_id]) if job.status == 'done' else None,
+        })
+
+    return render(request, 'report_job.html', {'job': job})
+
+
+@role_required(['faculty', 'admin'])
+def download_report_job(request, job_id):
+    job = get_object_or_404(_visible_report_jobs(request.user.profile), job_id=job_id)
+    if job.status != 'done' or not job.result_data:
+        messages.error(request, 'This report is not ready yet.')
+        return redirect('report_job_status', job_id=job.job_id)
+    if job.expires_at and job.expires_at < timezone.now():
+        messages.error(request, 'This report has expired. Please request it again.')
+        return redirect('analytics')
+
+    response = HttpResponse(bytes(job.result_data), content_type=job.result_type)
+    response['Content-Disposition'] = f'attachment; filename="{job.result_name}"'
+    return response
+
+
+@role_required(['faculty', 'admin'])
+def export_data(request, dataset, fmt):
+    """Stream raw rows as CSV or NDJSON, optionally filtered and narrowed to chosen columns"""
+    spec = EXPORT_DATASETS.get(dataset)
+    if not spec or fmt not in ('csv', 'ndjson'):
+        return HttpResponse('Unknown export', status=404)
+
+    columns = [c.strip() for c in request.GET.get('columns', '').split(',') if c.strip()]
+    columns = columns or list(spec['columns'])
+    unknown = [c for c in columns if c not in spec['columns']]
+    if unknown:
+        return HttpResponse(f'Unknown columns: {", ".join(unknown)}', status=400)
+
+    dates = _date_filters(request)
+    if dates is None:
+        return HttpResponse('Dates must be YYYY-MM-DD', status=400)
+
+    # Faculty only ever see their own department
+    department = request.GET.get('department')
+    profile = request.user.profile
+    if profile.role == 'faculty':
+        department = profile.department
+
+    rows = export_queryset(
+        dataset, columns,
+        department=department,
+        status=request.GET.get('status'),
+        **dates,
     )
-    df_company = pd.DataFrame(list(company_data))
-    
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="internship_report.xlsx"'
-    
-    with pd.ExcelWriter(response, engine='openpyxl') as writer:
-        df_domain.to_excel(writer, sheet_name='Domain Wise', index=False)
-        df_company.to_excel(writer, sheet_name='Company Wise', index=False)
-    
+
+    if fmt == 'csv':
+        response = StreamingHttpResponse(stream_csv(rows, columns), content_type='text/csv')
+    else:
+        response = StreamingHttpResponse(stream_ndjson(rows, columns), content_type='application/x-ndjson')
+    response['Content-Disposition'] = f'attachment; filename="{dataset}.{fmt}"'
     return response
 
 
@@ -3,41 +3,250 @@
 HICAS Faculty Web Scraper
 Scrapes department-wise faculty information from https://www.hicas.ac.in/
 Following robots.txt rules and ethical scraping practices
+
+Pages are fetched by a small thread pool sharing one requests.Session, so
+connections are reused. Politeness is enforced per host by a token bucket
+rather than a sleep before every request: by default each host still sees
+at most one request every DELAY seconds, but the waits no longer add up with
+the response times. Connection errors, timeouts, 429 and 5xx responses are
+retried with exponential backoff, each attempt taking its own token.
+Results are merged in department order, so the output does not depend on
+which page finishes first.
+
+Responses are kept in an on-disk cache (CACHE_DIR, one JSON file per URL
+with the body, ETag, Last-Modified and fetch time) and revalidated with
+If-None-Match/If-Modified-Since. A 304 reuses the cached body and the
+faculty parsed from it last time. --offline replays the cache without
+touching the network, for parser work and CI against recorded pages.
+
+Department pages are parsed by a pluggable backend (HEADING_PARSERS) that
+only has to produce the h2/h3 headings. The default streams HTMLParser
+events without building a tree; the BeautifulSoup backends remain for
+comparison (python manage.py benchmark_scraper_parsers).
 """
 
+import argparse
+import csv
+import hashlib
+import os
+import random
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 import pandas as pd
 import time
 import json
 from urllib.parse import urljoin, urlparse
 import re
 
+from internship.catalog import faculty_key
+
 # Configuration
 BASE_URL = "https://www.hicas.ac.in/"
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
-DELAY = 2  # Polite delay between requests (seconds)
+DELAY = 2  # Polite delay between requests to the same host (seconds)
+BURST = 1  # Requests a host may receive back to back before DELAY applies
+CONCURRENCY = 4  # Pages fetched at once
+TIMEOUT = 10
+RETRIES = 3
+BACKOFF = 1  # First retry waits this long (seconds), doubling after each failure
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+CACHE_DIR = '.scrape_cache'
+FACULTY_CSV = 'hicas_faculty_data.csv'
+DELTA_CSV = 'hicas_faculty_delta.csv'
+FACULTY_COLUMNS = ['Department', 'Faculty Name', 'Designation', 'Source URL']
+HEADING_TAGS = ['h2', 'h3']
+DEFAULT_PARSER = 'stream'  # see HEADING_PARSERS
 
 # Storage for scraped data
 faculty_data = []
+faculty_index = {}  # faculty_key(name, department) -> record in faculty_data
 visited_urls = set()
+visited_lock = threading.Lock()
 
-def fetch_page(url):
-    """Fetch a web page with error handling"""
-    if url in visited_urls:
-        return None
+class TokenBucket:
+    """Thread-safe limiter allowing ``rate`` requests per second in bursts of up to ``capacity``"""
+    
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available and take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+# unchanged: the body came from the cache (304 or offline), so its parsed faculty can be reused
+Page = namedtuple('Page', ['body', 'unchanged'])
+
+class ResponseCache:
+    """Cached responses on disk, one JSON file per URL"""
+    
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+    
+    def path(self, url):
+        return os.path.join(self.directory, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+    
+    def get(self, url):
+        try:
+            with open(self.path(url), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+    
+    def save(self, entry):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(entry['url'])
+        # Write then rename so an interrupted run never leaves a truncated entry
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    
+    def store(self, url, response):
+        """Cache a 200 response; faculty parsed from an older body no longer apply"""
+        self.save({
+            'url': url,
+            'body': response.text,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'records': {},
+        })
+    
+    def revalidated(self, entry, response):
+        """Record a 304 for ``entry``, picking up any new validators"""
+        entry['etag'] = response.headers.get('ETag', entry['etag'])
+        entry['last_modified'] = response.headers.get('Last-Modified', entry['last_modified'])
+        entry['fetched_at'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        self.save(entry)
+    
+    def records(self, url, dept_name):
+        entry = self.get(url)
+        return entry['records'].get(dept_name) if entry else None
+    
+    def store_records(self, url, dept_name, records):
+        entry = self.get(url)
+        if entry:
+            entry['records'][dept_name] = records
+            self.save(entry)
+
+class Fetcher:
+    """Shared session with a token bucket per host and retries with exponential backoff"""
+    
+    def __init__(self, delay=DELAY, burst=BURST, concurrency=CONCURRENCY, retries=RETRIES, backoff=BACKOFF,
+                 timeout=TIMEOUT, cache=None, offline=False):
+        if offline and cache is None:
+            raise ValueError('offline mode replays the response cache, so it needs one')
+        self.cache = cache
+        self.offline = offline
+        self.rate = 1 / delay if delay else float('inf')
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.buckets = {}
+        self.lock = threading.Lock()
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        # One pooled connection per worker so concurrent requests don't open and drop extra ones
+        adapter = HTTPAdapter(pool_maxsize=concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    def bucket(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate, self.burst)
+            return self.buckets[host]
+    
+    def retry_delay(self, attempt, response=None):
+        delay = self.backoff * 2 ** attempt
+        retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+        if retry_after.isdigit():
+            delay = max(delay, int(retry_after))
+        return delay * random.uniform(1, 1.25)  # jitter so workers don't retry in lockstep
+    
+    def get(self, url):
+        """Return a Page for ``url``, retrying transient failures; raises after the last attempt"""
+        entry = self.cache.get(url) if self.cache else None
+        if self.offline:
+            if entry is None:
+                raise LookupError(f"{url} is not in the response cache")
+            return Page(entry['body'], True)
+        
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        for attempt in range(self.retries + 1):
+            self.bucket(url).acquire()
+            response = None
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+                if response.status_code == 304 and entry:
+                    self.cache.revalidated(entry, response)
+                    return Page(entry['body'], True)
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    if self.cache:
+                        self.cache.store(url, response)
+                    return Page(response.text, False)
+                error = requests.HTTPError(f"{response.status_code} for url: {url}", response=response)
+                response.close()  # hand the connection back to the pool
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            if attempt == self.retries:
+                raise error
+            delay = self.retry_delay(attempt, response)
+            print(f"Retrying {url} in {delay:.1f}s ({error})")
+            time.sleep(delay)
+
+_default_fetcher = None
+
+def get_fetcher():
+    global _default_fetcher
+    if _default_fetcher is None:
+        _default_fetcher = Fetcher()
+    return _default_fetcher
+
+def fetch_page(url, fetcher=None):
+    """Fetch a web page with error handling; returns a Page or None"""
+    # Claim the URL up front so two workers never fetch the same page
+    with visited_lock:
+        if url in visited_urls:
+            return None
+        visited_urls.add(url)
     
     try:
         print(f"Fetching: {url}")
-        time.sleep(DELAY)  # Polite delay
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-        visited_urls.add(url)
-        return response.text
+        return (fetcher or get_fetcher()).get(url)
     except Exception as e:
         print(f"Error fetching {url}: {e}")
+        with visited_lock:
+            visited_urls.discard(url)
         return None
 
 def is_valid_url(url):
@@ -125,27 +334,96 @@ def discover_department_links(html):
     
     return department_links
 
-def scrape_department_page(url, dept_name):
+def scrape_department_page(url, dept_name, fetcher=None, parser=DEFAULT_PARSER):
     """Scrape a department page for faculty information"""
-    html = fetch_page(url)
-    if not html:
-        return
+    fetcher = fetcher or get_fetcher()
+    page = fetch_page(url, fetcher)
+    if page:
+        add_faculty(page_faculty(page, url, dept_name, fetcher.cache, parser))
+
+def page_faculty(page, url, dept_name, cache=None, parser=DEFAULT_PARSER):
+    """Faculty on a fetched page, reusing the cached parse when the page hasn't changed"""
+    records = cache.records(url, dept_name) if cache and page.unchanged else None
+    if records is None:
+        records = parse_department_page(page.body, url, dept_name, parser)
+        if cache:
+            cache.store_records(url, dept_name, records)
+    return records
+
+class HeadingParser(HTMLParser):
+    """Streaming parser that keeps only the text of h2/h3 elements, in document order"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.headings = []
+        self.tag = None
+        self.parts = []
+    
+    def close_heading(self):
+        # Same text as BeautifulSoup's get_text(strip=True)
+        self.headings.append((self.tag, ''.join(part.strip() for part in self.parts)))
+        self.tag = None
     
+    def handle_starttag(self, tag, attrs):
+        if tag in HEADING_TAGS:
+            if self.tag:
+                self.close_heading()  # unclosed heading
+            self.tag, self.parts = tag, []
+    
+    def handle_endtag(self, tag):
+        if tag == self.tag:
+            self.close_heading()
+    
+    def handle_data(self, data):
+        if self.tag:
+            self.parts.append(data)
+
+def soup_headings(html):
+    """Full BeautifulSoup tree, then its h2/h3 elements"""
     soup = BeautifulSoup(html, 'html.parser')
+    return [(tag.name, tag.get_text(strip=True)) for tag in soup.find_all(HEADING_TAGS)]
+
+def strainer_headings(html):
+    """BeautifulSoup building only the h2/h3 elements"""
+    soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer(HEADING_TAGS))
+    return [(tag.name, tag.get_text(strip=True)) for tag in soup.find_all(HEADING_TAGS)]
+
+def stream_headings(html):
+    """HTMLParser events only, no tree at all"""
+    parser = HeadingParser()
+    parser.feed(html)
+    parser.close()
+    if parser.tag:
+        parser.close_heading()
+    return parser.headings
+
+# Backends for parse_department_page: html -> [(tag, text)] for every h2/h3, all giving the same result
+HEADING_PARSERS = {
+    'soup': soup_headings,
+    'strainer': strainer_headings,
+    'stream': stream_headings,
+}
+
+def parse_department_page(html, url, dept_name, parser=DEFAULT_PARSER):
+    """Faculty records on a department page, in page order"""
+    records = []
+    headings = HEADING_PARSERS[parser](html)
     
-    # Find all h2 tags (faculty names) followed by h3 tags (designations)
-    h2_tags = soup.find_all('h2')
+    # Faculty names are h2 tags, each followed by an h3 with the designation
+    next_h3 = None
+    designations = [None] * len(headings)
+    for i in range(len(headings) - 1, -1, -1):
+        designations[i] = next_h3
+        if headings[i][0] == 'h3':
+            next_h3 = headings[i][1]
     
-    for h2 in h2_tags:
-        name_text = h2.get_text(strip=True)
+    for (tag, name_text), designation_text in zip(headings, designations):
+        if tag != 'h2':
+            continue
         
         # Check if it's a faculty name (starts with Dr., Mr., Mrs., Ms.)
         if re.match(r'^(Dr\.|Mr\.|Mrs\.|Ms\.)', name_text, re.IGNORECASE):
-            # Find the next h3 tag for designation
-            h3 = h2.find_next('h3')
-            if h3:
-                designation_text = h3.get_text(strip=True)
-                
+            if designation_text is not None:
                 # Check if it's a valid designation
                 if any(keyword in designation_text for keyword in ['Professor', 'Asst Prof']):
                     # Normalize designation
@@ -164,15 +442,73 @@ def scrape_department_page(url, dept_name):
                     # Clean up the name
                     name = name_text.strip()
                     
-                    # Check if already added
-                    existing = any(f['Faculty Name'] == name and f['Department'] == dept_name for f in faculty_data)
-                    if not existing:
-                        faculty_data.append({
-                            'Department': dept_name,
-                            'Faculty Name': name,
-                            'Designation': designation,
-                            'Source URL': url
-                        })
+                    records.append({
+                        'Department': dept_name,
+                        'Faculty Name': name,
+                        'Designation': designation,
+                        'Source URL': url
+                    })
+    return records
+
+def add_faculty(records):
+    """Append records to faculty_data, skipping names already listed for their department"""
+    for record in records:
+        key = faculty_key(record['Faculty Name'], record['Department'])
+        if key not in faculty_index:
+            faculty_index[key] = record
+            faculty_data.append(record)
+
+def read_faculty_csv(path):
+    """Records from a previous run's CSV, or [] if there is none"""
+    try:
+        with open(path, newline='', encoding='utf-8') as f:
+            return list(csv.DictReader(f))
+    except FileNotFoundError:
+        return []
+
+def diff_faculty(previous, current, incomplete_departments=()):
+    """Compare two lists of records by faculty_key; returns added, removed and changed (new values) lists.
+    
+    Nobody is reported removed from ``incomplete_departments`` (those with a
+    page that failed to load): missing from this run doesn't mean gone.
+    """
+    before = {faculty_key(r['Faculty Name'], r['Department']): r for r in previous}
+    after = {faculty_key(r['Faculty Name'], r['Department']): r for r in current}
+    return {
+        'added': [r for key, r in after.items() if key not in before],
+        'removed': [r for key, r in before.items()
+                    if key not in after and r['Department'] not in incomplete_departments],
+        'changed': [r for key, r in after.items()
+                    if key in before and any(str(r[c]) != str(before[key][c]) for c in FACULTY_COLUMNS)],
+    }
+
+def write_delta(path, delta):
+    """CSV of the faculty columns with a leading Change column (added, removed or changed)"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['Change'] + FACULTY_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        for change, records in delta.items():
+            writer.writerows({'Change': change, **record} for record in records)
+
+def scrape_departments(department_urls, fetcher=None, concurrency=CONCURRENCY, parser=DEFAULT_PARSER):
+    """Fetch every department page concurrently and add their faculty in department order.
+    
+    Returns the (department, url) pages that could not be fetched.
+    """
+    fetcher = fetcher or get_fetcher()
+    jobs = [(dept_name, url) for dept_name, urls in department_urls.items() for url in urls]
+    failed = []
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # map() yields in submission order, so pages are parsed as soon as the earlier ones are done
+        pages = executor.map(lambda job: fetch_page(job[1], fetcher), jobs)
+        for (dept_name, url), page in zip(jobs, pages):
+            print(f"Scraping: {dept_name}")
+            if page:
+                add_faculty(page_faculty(page, url, dept_name, fetcher.cache, parser))
+            elif url not in visited_urls:
+                # fetch_page gives the URL back on errors; None for a URL still claimed is a repeat
+                failed.append((dept_name, url))
+    return failed
 
 def get_all_department_urls():
     """Get comprehensive list of department URLs to scrape"""
@@ -255,10 +591,42 @@ def get_all_department_urls():
     
     return department_urls
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Scrape HICAS department pages for faculty')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY,
+                        help=f'Pages fetched at once (default: {CONCURRENCY})')
+    parser.add_argument('--delay', type=float, default=DELAY,
+                        help=f'Seconds between requests to the same host (default: {DELAY})')
+    parser.add_argument('--burst', type=int, default=BURST,
+                        help=f'Requests a host may receive back to back (default: {BURST})')
+    parser.add_argument('--retries', type=int, default=RETRIES,
+                        help=f'Retries for connection errors, 429 and 5xx responses (default: {RETRIES})')
+    parser.add_argument('--cache-dir', default=CACHE_DIR,
+                        help=f'Response cache used for revalidation and --offline (default: {CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true', help='Download every page in full and cache nothing')
+    parser.add_argument('--offline', action='store_true',
+                        help='Replay pages from the response cache without any network access')
+    parser.add_argument('--parser', choices=sorted(HEADING_PARSERS), default=DEFAULT_PARSER,
+                        help=f'Department page parser backend (default: {DEFAULT_PARSER})')
+    parser.add_argument('--delta', action='store_true',
+                        help=f'Also write {DELTA_CSV} with the faculty added, removed or changed since the previous '
+                             f'{FACULTY_CSV} (apply it with load_csv_to_db --sync --faculty-delta)')
+    args = parser.parse_args(argv)
+    if args.offline and args.no_cache:
+        parser.error('--offline replays the cache and cannot be combined with --no-cache')
+    return args
+
+def main(argv=None):
     """Main scraping function"""
+    args = parse_args(argv)
     print("HICAS Faculty Scraper")
     print("=" * 50)
+    start = time.perf_counter()
+    cache = None if args.no_cache else ResponseCache(args.cache_dir)
+    fetcher = Fetcher(delay=args.delay, burst=args.burst, concurrency=args.concurrency, retries=args.retries,
+                      cache=cache, offline=args.offline)
+    if args.offline:
+        print(f"Offline: replaying pages from {args.cache_dir}")
     
     # Step 1: Get all known department URLs
     print("\n=== Step 1: Loading Department URLs ===")
@@ -267,10 +635,11 @@ def main():
     
     # Step 2: Scrape each department page
     print("\n=== Step 2: Scraping Department Pages ===")
-    for dept_name, urls in department_urls.items():
-        for url in urls:
-            print(f"Scraping: {dept_name}")
-            scrape_department_page(url, dept_name)
+    failed = scrape_departments(department_urls, fetcher, args.concurrency, args.parser)
+    if failed:
+        print(f"⚠ {len(failed)} page(s) could not be fetched:")
+        for dept_name, url in failed:
+            print(f"  - {dept_name}: {url}")
     
     # Step 3: Process and clean data
     print("\n=== Step 3: Processing Data ===")
@@ -287,8 +656,20 @@ def main():
     # Step 4: Save results
     print("\n=== Step 4: Saving Results ===")
     
+    csv_file = FACULTY_CSV
+    if args.delta and df.empty:
+        print("⚠ Nothing scraped, not writing a delta that would remove every faculty member")
+    elif args.delta:
+        # Before the CSV is overwritten: it is the previous run to compare against
+        incomplete = {dept_name for dept_name, _ in failed}
+        delta = diff_faculty(read_faculty_csv(csv_file), df.to_dict('records'), incomplete)
+        write_delta(DELTA_CSV, delta)
+        print(f"✓ Saved delta: {DELTA_CSV} ({len(delta['added'])} added, {len(delta['removed'])} removed, "
+              f"{len(delta['changed'])} changed)")
+        if incomplete:
+            print(f"  No removals recorded for {', '.join(sorted(incomplete))} (pages failed)")
+    
     # Save as CSV
-    csv_file = 'hicas_faculty_data.csv'
     df.to_csv(csv_file, index=False, encoding='utf-8')
     print(f"✓ Saved CSV: {csv_file}")
     
@@ -303,6 +684,7 @@ def main():
     print(f"Total records scraped: {len(faculty_data)}")
     print(f"Unique faculty members: {len(df)}")
     print(f"Pages visited: {len(visited_urls)}")
+    print(f"Time taken: {time.perf_counter() - start:.1f}s")
     
     if not df.empty:
         print(f"\nDepartments found:")
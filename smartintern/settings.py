@@ -82,3 +82,42 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
+
+# Analytics chart output: 'png' (matplotlib), 'svg' (inline, no matplotlib) or 'json' (client-side)
+ANALYTICS_CHART_MODE = os.environ.get('ANALYTICS_CHART_MODE', 'png')
+
+# Background report jobs: how long finished results are kept for download
+REPORT_JOB_RESULT_TTL_HOURS = 24
+# Running jobs whose worker hasn't sent a heartbeat for this long are assumed abandoned and re-queued
+REPORT_JOB_STALE_MINUTES = 30
+# How often a worker touches the heartbeat of the job it is building
+REPORT_JOB_HEARTBEAT_SECONDS = 60
+
+# Seconds before the in-memory analytics cube is rebuilt from the database (changes made by other
+# processes show up after at most this long)
+ANALYTICS_CUBE_TTL_SECONDS = 300
+
+# Seconds a computed cohort funnel stays cached. Saves invalidate it sooner, but only in their own
+# process: like the caches below it lives in the default per-process LocMemCache
+FUNNEL_CACHE_SECONDS = 600
+
+# Seconds the review-latency SLA metrics on the admin dashboard stay cached
+REVIEW_LATENCY_CACHE_SECONDS = 900
+
+# Seconds a rendered submission heatmap stays cached
+HEATMAP_CACHE_SECONDS = 300
+
+# Where load_csv_to_db / load_sample_data keep checkpoints for --resume
+INGEST_CHECKPOINT_DIR = BASE_DIR / '.ingest'
+
+# Load each request's user and profile in one query; ModelBackend keeps sessions from before valid
+AUTHENTICATION_BACKENDS = [
+    'internship.backends.ProfileBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# Password-reset OTPs: 'db' (PasswordResetOTP rows, purge with purge_otps) or 'cache' (needs a cache
+# shared by all server processes, e.g. Redis or Memcached)
+OTP_STORE = os.environ.get('OTP_STORE', 'db')
+# Seconds an OTP stays valid
+OTP_TTL_SECONDS = 300